@@ -0,0 +1,96 @@
+"""
+Önceden derlenmiş model artefaktlarının konumu.
+
+python -m backend.app.build her derlemeyi ARTIFACTS_DIR altında ayrı bir
+sürüm dizinine yazar ve CURRENT dosyasını atomik olarak yeni sürüme çevirir:
+
+    artifacts/
+      CURRENT                        ← "20260101T120000Z-1a2b3c4d"
+      20260101T120000Z-1a2b3c4d/
+        build.json                   ← sürüm, özet değerleri, süreler
+        knowledge/                   ← CURRENT + bilgi tabanı sürümü (diziler + manifest)
+        nlp/                         ← classifier.pkl
+
+CURRENT yoksa paket içindeki önbellek dizinleri kullanılır; yalnızca
+yükleme kipinde (ARTIFACTS_LOAD_ONLY) ise uygulama başlamaz.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+
+from backend.app.config import ARTIFACTS_DIR
+
+logger = logging.getLogger("ogrenci_destek.artifacts")
+
+CURRENT_FILE = "CURRENT"
+BUILD_INFO_FILE = "build.json"
+KNOWLEDGE_SUBDIR = "knowledge"
+CLASSIFIER_SUBDIR = "nlp"
+
+
+def current_artifact_dir(root: Path = ARTIFACTS_DIR) -> Path | None:
+    """CURRENT dosyasının gösterdiği sürüm dizini (yoksa None)."""
+    try:
+        name = (root / CURRENT_FILE).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+    return root / name if name else None
+
+
+def require_current_artifact(root: Path = ARTIFACTS_DIR) -> Path:
+    """
+    Yayınlanmış sürüm dizinini döndürür.
+
+    Raises:
+        RuntimeError: CURRENT yoksa (paket içi önbelleklere geri dönülmez).
+    """
+    current = current_artifact_dir(root)
+    if current is None:
+        raise RuntimeError(
+            f"Yayınlanmış artefakt yok: {root / CURRENT_FILE} "
+            "(python -m backend.app.build ile derleyin)"
+        )
+    return current
+
+
+def knowledge_cache_dir() -> Path | None:
+    current = current_artifact_dir()
+    return current / KNOWLEDGE_SUBDIR if current else None
+
+
+def classifier_cache_dir() -> Path | None:
+    current = current_artifact_dir()
+    return current / CLASSIFIER_SUBDIR if current else None
+
+
+def read_build_info(directory: Path) -> dict | None:
+    try:
+        return json.loads((directory / BUILD_INFO_FILE).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def publish(root: Path, version: str) -> None:
+    """CURRENT dosyasını atomik olarak yeni sürüme çevirir."""
+    tmp = root / f"{CURRENT_FILE}.{os.getpid()}.tmp"
+    tmp.write_text(version + "\n", encoding="utf-8")
+    os.replace(tmp, root / CURRENT_FILE)
+
+
+def prune(root: Path, keep: int) -> None:
+    """En yeni `keep` sürüm dışındakileri siler (yayınlanan sürüm korunur)."""
+    current = current_artifact_dir(root)
+    versions = sorted(
+        (p for p in root.iterdir() if p.is_dir() and (p / BUILD_INFO_FILE).exists()),
+        key=lambda p: p.name,
+        reverse=True,
+    )
+    for old in versions[max(keep, 1):]:
+        if old != current:
+            shutil.rmtree(old, ignore_errors=True)
+            logger.info("Eski sürüm silindi: %s", old.name)
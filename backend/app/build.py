@@ -0,0 +1,176 @@
+"""
+Çevrimdışı artefakt derleme komutu.
+
+Sınıflandırıcıyı eğitir, PPTX + DOCX kaynaklarından bilgi tabanını
+çıkarır/parçalar/vektörleştirir ve sonuçları ARTIFACTS_DIR altında yeni
+bir sürüm dizinine yazar. Derleme bitince CURRENT dosyası atomik olarak
+yeni sürüme çevrilir; yarım kalan derleme hiçbir zaman yayınlanmaz.
+
+Kullanım:
+    python -m backend.app.build
+    python -m backend.app.build --out artifacts --keep 3
+    python -m backend.app.build --knowledge-dir belgeler/
+
+Sunucu ARTIFACTS_LOAD_ONLY=true ile başlatıldığında yalnızca bu
+artefaktları yükler; başlangıçta eğitim veya PPTX ayrıştırma yapılmaz.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from backend.app.artifacts import (
+    BUILD_INFO_FILE,
+    CLASSIFIER_SUBDIR,
+    KNOWLEDGE_SUBDIR,
+    prune,
+    publish,
+)
+from backend.app.config import (
+    ARTIFACTS_DIR,
+    BM25_B,
+    BM25_DELTA,
+    BM25_K1,
+    HASHING_N_FEATURES,
+    KNOWLEDGE_DENSE_DIMS,
+    KNOWLEDGE_DIR,
+    KNOWLEDGE_FUZZY,
+    KNOWLEDGE_INGEST_WORKERS,
+    KNOWLEDGE_SCORER,
+    VECTORIZER_HASHING,
+)
+from backend.app.knowledge.benchmark import off_topic_answers
+from backend.app.knowledge.retriever import KnowledgeRetriever
+from backend.app.nlp.classifier import QuestionClassifier
+
+logger = logging.getLogger("ogrenci_destek.build")
+
+
+def build_artifacts(
+    out: Path,
+    pptx_path: Path | None = None,
+    docx_path: Path | None = None,
+    keep: int = 3,
+    knowledge_dir: Path | None = KNOWLEDGE_DIR,
+) -> Path:
+    """
+    Tüm artefaktları derler, yayınlar ve sürüm dizinini döndürür.
+
+    Args:
+        out:       Artefakt kök dizini.
+        pptx_path: PPTX dosyası (None ise varsayılan).
+        docx_path: DOCX dosyası (None ise varsayılan).
+        keep:      Saklanacak en fazla sürüm sayısı (yayınlanan dahil).
+        knowledge_dir: Belge klasörü (pptx/docx verilmediyse kullanılır).
+
+    Raises:
+        RuntimeError: Bilgi tabanı hiçbir kaynaktan oluşturulamazsa.
+    """
+    out.mkdir(parents=True, exist_ok=True)
+    staging = out / f".staging-{int(time.time())}"
+    shutil.rmtree(staging, ignore_errors=True)
+
+    try:
+        # ── Sınıflandırıcı ────────────────────────────────────────
+        started = time.perf_counter()
+        classifier = QuestionClassifier(cache_dir=staging / CLASSIFIER_SUBDIR)
+        classifier.load_or_train(force=True)
+        classifier_seconds = time.perf_counter() - started
+
+        # ── Bilgi tabanı ──────────────────────────────────────────
+        started = time.perf_counter()
+        retriever = KnowledgeRetriever(
+            scorer=KNOWLEDGE_SCORER,
+            k1=BM25_K1,
+            b=BM25_B,
+            delta=BM25_DELTA,
+            cache_dir=staging / KNOWLEDGE_SUBDIR,
+            knowledge_dir=knowledge_dir,
+            ingest_workers=KNOWLEDGE_INGEST_WORKERS,
+            hashing_features=HASHING_N_FEATURES if VECTORIZER_HASHING else 0,
+            fuzzy=KNOWLEDGE_FUZZY,
+            dense_dims=KNOWLEDGE_DENSE_DIMS,
+        )
+        retriever.build(pptx_path=pptx_path, docx_path=docx_path, force=True)
+        if not retriever.is_ready:
+            raise RuntimeError("Bilgi tabanı oluşturulamadı – kaynak dosyaları kontrol edin.")
+        knowledge_seconds = time.perf_counter() - started
+        # Yeni belgeler eşikleri kaydırabilir: konu dışı sorular cevaplanmamalı
+        for question, score in off_topic_answers(retriever):
+            logger.warning(
+                "Konu dışı seed sorusu cevap eşiğini geçiyor (skor=%.4f): %s", score, question,
+            )
+
+        # ── Sürüm bilgisi ─────────────────────────────────────────
+        created_at = datetime.now(timezone.utc)
+        digest = hashlib.sha256(
+            f"{classifier.version}:{retriever.version}".encode()
+        ).hexdigest()[:8]
+        version = f"{created_at:%Y%m%dT%H%M%SZ}-{digest}"
+        info = {
+            "version": version,
+            "created_at": created_at.isoformat(),
+            "classifier_version": classifier.version,
+            "knowledge_version": retriever.version,
+            "scorer": retriever.scorer,
+            "chunks": retriever.chunk_count,
+            "durations": {
+                "classifier_seconds": round(classifier_seconds, 3),
+                "knowledge_seconds": round(knowledge_seconds, 3),
+            },
+        }
+        (staging / BUILD_INFO_FILE).write_text(
+            json.dumps(info, ensure_ascii=False, indent=2), encoding="utf-8",
+        )
+
+        target = out / version
+        staging.rename(target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    publish(out, version)
+    logger.info(
+        "Artefaktlar yayınlandı: %s (sınıflandırıcı %.2f s, bilgi tabanı %.2f s, %d parça)",
+        target, classifier_seconds, knowledge_seconds, retriever.chunk_count,
+    )
+    prune(out, keep)
+    return target
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.app.build",
+        description="Sınıflandırıcı ve bilgi tabanı artefaktlarını derler.",
+    )
+    parser.add_argument("--out", type=Path, default=ARTIFACTS_DIR, help="Artefakt kök dizini")
+    parser.add_argument("--pptx", type=Path, default=None, help="PPTX kaynak dosyası")
+    parser.add_argument("--docx", type=Path, default=None, help="DOCX SSS dosyası")
+    parser.add_argument(
+        "--knowledge-dir", type=Path, default=KNOWLEDGE_DIR,
+        help="Tüm .pptx / .docx belgelerinin bulunduğu klasör",
+    )
+    parser.add_argument("--keep", type=int, default=3, help="Saklanacak sürüm sayısı")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    try:
+        build_artifacts(
+            args.out, args.pptx, args.docx,
+            keep=args.keep, knowledge_dir=args.knowledge_dir,
+        )
+    except RuntimeError as exc:
+        logger.error("%s", exc)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
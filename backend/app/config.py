@@ -15,10 +15,107 @@ load_dotenv(_env_path)
 ADMIN_PASSWORD: str = os.getenv("ADMIN_PASSWORD", "degistir123")
 APP_SECRET: str = os.getenv("APP_SECRET", secrets.token_hex(32))
 
-# Veritabanı dosyası backend/ klasörü altında oluşturulur
-DATABASE_URL: str = "sqlite:///" + str(
-    Path(__file__).resolve().parents[1] / "ogrenci_destek.db"
+# Veritabanı dosyası varsayılan olarak backend/ klasörü altında oluşturulur.
+# DATABASE_PATH yalnızca dosya konumunu, DATABASE_URL tüm bağlantıyı değiştirir.
+DATABASE_PATH: Path = Path(
+    os.getenv(
+        "DATABASE_PATH",
+        str(Path(__file__).resolve().parents[1] / "ogrenci_destek.db"),
+    )
 )
+DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///" + str(DATABASE_PATH))
+
+# Bağlantı havuzu
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# SQLite ayarları – her bağlantıda PRAGMA olarak uygulanır
+SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL").upper()
+SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
 
 # NLP eşik değeri – bu değerin üstündeyse FAQ cevabı verilir
 CONFIDENCE_THRESHOLD: float = float(os.getenv("CONFIDENCE_THRESHOLD", "0.65"))
+
+# Özel konu tablosu (anahtar kelimeler + cevaplar) – JSON veri dosyası
+SPECIFIC_TOPICS_PATH: Path = Path(
+    os.getenv(
+        "SPECIFIC_TOPICS_PATH",
+        str(Path(__file__).resolve().parent / "nlp" / "specific_topics.json"),
+    )
+)
+
+# Cevap önbelleği – 0 verilirse devre dışı kalır
+RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "2048"))
+RESPONSE_CACHE_TTL: float = float(os.getenv("RESPONSE_CACHE_TTL", "600"))
+
+# Çıkarım süreç havuzu – 0 ise tahmin/arama istek iş parçacığında çalışır
+INFERENCE_WORKERS: int = int(os.getenv("INFERENCE_WORKERS", "0"))
+
+# Admin istatistikleri için sayaç tablosu (true ise O(1) okuma)
+STATS_COUNTERS: bool = os.getenv("STATS_COUNTERS", "false").lower() in ("1", "true", "yes")
+
+# Çözülen ticket'lardan (admin onaylı kategori) sınıflandırıcıyı yeniden eğitme
+FEEDBACK_TRAINING: bool = os.getenv("FEEDBACK_TRAINING", "false").lower() in ("1", "true", "yes")
+# Bu kadar yeni etiket birikince beklemeden eğit
+FEEDBACK_MIN_LABELS: int = int(os.getenv("FEEDBACK_MIN_LABELS", "50"))
+# En az bir yeni etiket varsa bu aralıkla (saniye) eğit
+FEEDBACK_RETRAIN_INTERVAL: float = float(os.getenv("FEEDBACK_RETRAIN_INTERVAL", "3600"))
+# Son tam eğitimden beri eklenen etiketler bu oranı aşarsa TF-IDF sözlüğü dahil baştan eğitilir
+FEEDBACK_REFIT_RATIO: float = float(os.getenv("FEEDBACK_REFIT_RATIO", "0.5"))
+
+# Geciktirmeli (write-behind) mesaj yazımı – true ise mesajlar toplu yazılır
+MESSAGE_WRITE_BEHIND: bool = os.getenv("MESSAGE_WRITE_BEHIND", "false").lower() in ("1", "true", "yes")
+MESSAGE_BATCH_SIZE: int = int(os.getenv("MESSAGE_BATCH_SIZE", "200"))
+MESSAGE_FLUSH_INTERVAL_MS: int = int(os.getenv("MESSAGE_FLUSH_INTERVAL_MS", "50"))
+MESSAGE_QUEUE_SIZE: int = int(os.getenv("MESSAGE_QUEUE_SIZE", "10000"))
+
+# Türkçe normalleştirme: kelime → kök dönüşüm önbelleği (LRU, süreç başına)
+STEM_CACHE_SIZE: int = int(os.getenv("STEM_CACHE_SIZE", "50000"))
+
+# Sözlüksüz vektörleştirme (HashingVectorizer): sınıflandırıcı ve bilgi tabanı
+# sabit boyutlu özellik uzayı kullanır, IDF yoğun float32 dizi olarak saklanır
+VECTORIZER_HASHING: bool = os.getenv("VECTORIZER_HASHING", "false").lower() in ("1", "true", "yes")
+HASHING_N_FEATURES: int = int(os.getenv("HASHING_N_FEATURES", str(2 ** 18)))
+
+# Yazım hatası toleransı: kelime araması eşik altında kalırsa bilinmeyen
+# kelimeler karakter 3-gram benzerliğiyle düzeltilip yeniden aranır
+KNOWLEDGE_FUZZY: bool = os.getenv("KNOWLEDGE_FUZZY", "true").lower() in ("1", "true", "yes")
+
+# Anlamsal (LSA) arama: TF-IDF matrisinin TruncatedSVD boyutu (0 = kapalı).
+# Açıksa sonuçlar kelime dizini sıralamasıyla RRF ile birleştirilir
+KNOWLEDGE_DENSE_DIMS: int = int(os.getenv("KNOWLEDGE_DENSE_DIMS", "0"))
+
+# Bilgi tabanı skorlayıcısı: tfidf | bm25 | bm25+
+KNOWLEDGE_SCORER: str = os.getenv("KNOWLEDGE_SCORER", "tfidf").lower()
+BM25_K1: float = float(os.getenv("BM25_K1", "1.2"))
+BM25_B: float = float(os.getenv("BM25_B", "0.75"))
+BM25_DELTA: float = float(os.getenv("BM25_DELTA", "1.0"))
+# Bilgi tabanı klasörü: altındaki tüm .pptx / .docx dosyaları işlenir
+# (tanımlı değilse proje kökündeki varsayılan sunum + SSS belgesi kullanılır)
+KNOWLEDGE_DIR: Path | None = (
+    Path(os.environ["KNOWLEDGE_DIR"]) if os.getenv("KNOWLEDGE_DIR") else None
+)
+# Belgeleri paralel ayrıştıran süreç sayısı (0/1 = sıralı)
+KNOWLEDGE_INGEST_WORKERS: int = int(
+    os.getenv("KNOWLEDGE_INGEST_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+# Artımlı güncellemede bu orandan fazla satır değişirse vektörleştirici yeniden eğitilir
+KNOWLEDGE_REFIT_RATIO: float = float(os.getenv("KNOWLEDGE_REFIT_RATIO", "0.2"))
+# Kaynak belgeleri (veya artifacts/CURRENT) kontrol etme aralığı, saniye (0 = kapalı);
+# değişiklik görülürse bilgi tabanı kesintisiz yeniden yüklenir
+KNOWLEDGE_WATCH_INTERVAL: float = float(os.getenv("KNOWLEDGE_WATCH_INTERVAL", "0"))
+
+# Çevrimdışı derlenmiş artefaktlar (python -m backend.app.build). Dizinde
+# CURRENT dosyası varsa modeller oradan okunur; ARTIFACTS_LOAD_ONLY=true ise
+# başlangıçta hiçbir şey eğitilmez/derlenmez, artefakt yoksa uygulama başlamaz.
+ARTIFACTS_DIR: Path = Path(
+    os.getenv("ARTIFACTS_DIR", str(Path(__file__).resolve().parents[2] / "artifacts"))
+)
+ARTIFACTS_LOAD_ONLY: bool = os.getenv("ARTIFACTS_LOAD_ONLY", "false").lower() in ("1", "true", "yes")
+
+# Bilinen oturum id'leri için bellek içi LRU – veritabanı kontrolünü atlar
+SESSION_CACHE_SIZE: int = int(os.getenv("SESSION_CACHE_SIZE", "10000"))
@@ -2,16 +2,140 @@
 
 from __future__ import annotations
 
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.pool import StaticPool
 from sqlmodel import Session, SQLModel, create_engine
 
-from backend.app.config import DATABASE_URL
+from backend.app.config import (
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_SYNCHRONOUS,
+)
 
-engine = create_engine(DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
+_IS_SQLITE = DATABASE_URL.startswith("sqlite")
+_IS_SQLITE_MEMORY = _IS_SQLITE and (
+    DATABASE_URL in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in DATABASE_URL
+)
+
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+def _engine_kwargs() -> dict:
+    kwargs: dict = {"echo": False, "pool_pre_ping": not _IS_SQLITE}
+    if _IS_SQLITE:
+        kwargs["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000,
+        }
+    if _IS_SQLITE_MEMORY:
+        # Bellek içi veritabanı tek bağlantıda yaşar; tüm thread'ler paylaşır
+        kwargs["poolclass"] = StaticPool
+    else:
+        kwargs.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+        )
+    return kwargs
+
+
+engine = create_engine(DATABASE_URL, **_engine_kwargs())
+
+
+if _IS_SQLITE:
+    if SQLITE_JOURNAL_MODE not in _JOURNAL_MODES:
+        raise ValueError(f"Geçersiz SQLITE_JOURNAL_MODE: {SQLITE_JOURNAL_MODE}")
+    if SQLITE_SYNCHRONOUS not in _SYNCHRONOUS_MODES:
+        raise ValueError(f"Geçersiz SQLITE_SYNCHRONOUS: {SQLITE_SYNCHRONOUS}")
+
+    @event.listens_for(engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+        """
+        Her yeni bağlantıda SQLite ayarlarını uygular.
+
+        WAL modunda okuyucular yazıcıyı beklemez; synchronous=NORMAL ile
+        her commit'te fsync yerine yalnızca checkpoint'te fsync yapılır.
+        """
+        cursor = dbapi_connection.cursor()
+        try:
+            if not _IS_SQLITE_MEMORY:
+                cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+                cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE:d}")
+            cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+            cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS:d}")
+            # Negatif değer: sayfa sayısı yerine KiB cinsinden önbellek
+            cursor.execute(f"PRAGMA cache_size={-SQLITE_CACHE_SIZE_KB:d}")
+        finally:
+            cursor.close()
 
 
 def create_db_and_tables() -> None:
-    """Tüm SQLModel tablolarını oluşturur."""
+    """Tüm SQLModel tablolarını, eksik sütunları ve indeksleri oluşturur."""
     SQLModel.metadata.create_all(engine)
+    _add_missing_columns()
+    _create_missing_indexes()
+
+
+def _add_missing_columns() -> None:
+    """
+    Var olan tablolara sonradan eklenen boş bırakılabilir sütunları ekler.
+
+    create_all() mevcut tabloları değiştirmez; eski veritabanı dosyalarında
+    yeni (NULL varsayılanlı) sütunlar ALTER TABLE ... ADD COLUMN ile açılır.
+    """
+    inspector = inspect(engine)
+    quote = engine.dialect.identifier_preparer.quote
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                conn.exec_driver_sql(
+                    f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} "
+                    f"{column.type.compile(dialect=engine.dialect)}"
+                )
+
+
+# Yerine bileşik indeks gelen eski indeksler: her insert'te boşuna güncellenmesinler
+# (ix_messages_session_id → ix_messages_session_id_id)
+_OBSOLETE_INDEXES: tuple[str, ...] = ("ix_messages_session_id",)
+
+
+def _create_missing_indexes() -> None:
+    """
+    Var olan tablolara sonradan eklenen indeksleri oluşturur, eskileri siler.
+
+    create_all() mevcut tablolara yeni indeks eklemez; eski veritabanı
+    dosyaları da güncel indekslere sahip olsun diye tek tek kontrol edilir.
+    """
+    quote = engine.dialect.identifier_preparer.quote
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+        for name in _OBSOLETE_INDEXES:
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {quote(name)}")
+
+
+def dialect_insert(session: Session):
+    """
+    Veritabanı lehçesine uygun insert() döndürür.
+
+    on_conflict_do_nothing / on_conflict_do_update (upsert) için kullanılır;
+    SQLite ve PostgreSQL desteklenir.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
 
 
 def get_session():
@@ -0,0 +1,90 @@
+"""
+Oturum bazlı sohbet olayları için süreç içi yayın/abone (pub/sub) aracısı.
+
+Senkron endpoint'ler (thread pool) commit sonrası publish() çağırır;
+SSE bağlantıları asyncio kuyrukları üzerinden mesajları anında alır.
+
+Not: Aracı süreç içidir. Birden fazla uvicorn worker'ı varsa diğer
+worker'larda oluşan mesajlar, SSE akışının periyodik veritabanı
+senkronizasyonuyla yakalanır.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from backend.app.models import Message
+
+_QUEUE_SIZE = 100
+
+
+def message_payload(m: Message) -> dict:
+    """Mesajı istemciye gönderilecek sözlüğe çevirir."""
+    return {
+        "id": m.id,
+        "role": m.role,
+        "text": m.text,
+        "category": m.category,
+        "confidence": m.confidence,
+        "created_at": m.created_at.isoformat() if m.created_at else None,
+    }
+
+
+class ChatEventBroker:
+    """session_id → abone kuyrukları eşlemesi (iş parçacığı güvenli)."""
+
+    def __init__(self) -> None:
+        self._subscribers: dict[
+            str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]
+        ] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, session_id: str) -> tuple[asyncio.AbstractEventLoop, asyncio.Queue]:
+        """Çalışan event loop üzerinde yeni bir abonelik açar."""
+        entry = (asyncio.get_running_loop(), asyncio.Queue(maxsize=_QUEUE_SIZE))
+        with self._lock:
+            self._subscribers.setdefault(session_id, set()).add(entry)
+        return entry
+
+    def unsubscribe(
+        self, session_id: str, entry: tuple[asyncio.AbstractEventLoop, asyncio.Queue],
+    ) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(session_id)
+            if subscribers is None:
+                return
+            subscribers.discard(entry)
+            if not subscribers:
+                del self._subscribers[session_id]
+
+    def publish(self, session_id: str, payloads: list[dict]) -> None:
+        """Mesajları oturumun tüm abonelerine iletir (herhangi bir thread'den)."""
+        if not payloads:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers.get(session_id, ()))
+        for loop, queue in subscribers:
+            for payload in payloads:
+                try:
+                    loop.call_soon_threadsafe(_offer, queue, payload)
+                except RuntimeError:
+                    # Event loop kapanmış – abone zaten gidiyor
+                    break
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._subscribers.values())
+
+
+def _offer(queue: asyncio.Queue, payload: dict) -> None:
+    """Kuyruk doluysa olayı düşür; istemci periyodik senkronizasyonla yakalar."""
+    try:
+        queue.put_nowait(payload)
+    except asyncio.QueueFull:
+        pass
+
+
+# ── Modül düzeyinde tekil örnek ───────────────────────────────────────
+chat_events = ChatEventBroker()
@@ -0,0 +1,355 @@
+"""
+Çözülen ticket'lardan sınıflandırıcıyı arka planda yeniden eğitme.
+
+Admin bir ticket'ı "Çözüldü" yapıp kategorisini onayladığında
+(confirmed_category) ticket metni etiketli örnek olur. Eğitici iş
+parçacığı FEEDBACK_MIN_LABELS yeni etiket birikince veya en az bir yeni
+etiket varken FEEDBACK_RETRAIN_INTERVAL dolunca çalışır:
+
+  - Son tam eğitimden beri eklenen etiketler toplamın FEEDBACK_REFIT_RATIO
+    oranını aşmadıkça yalnızca yeni etiketler partial_fit ile öğrenilir.
+  - Aşarsa (veya ilk eğitimde) seed + tüm etiketlerle baştan eğitilir.
+
+Yeni model tahminleri durdurmadan tek atamayla devreye girer ve diske
+yazılır; çıkarım havuzu varsa worker'lar yeni modeli yükleyerek
+kesintisiz yenilenir. Cevap önbelleği model sürümüyle anahtarlandığından
+eski cevaplar kendiliğinden geçersiz olur. ARTIFACTS_LOAD_ONLY modunda
+yayınlanmış artefakt değiştirilmez: model, bilgi tabanı dizileri sabit
+bağlantıyla paylaşılan yeni bir artefakt sürümüne yazılıp yayınlanır.
+
+Birden fazla worker süreciyle zamanlanmış eğitimi yalnızca lider süreç
+(.feedback-leader.lock kilidini alan) çalıştırır; her eğitim ayrıca
+.feedback.lock ile sıraya girer ve diskteki en yeni modelden başlar.
+Diğer süreçler liderin kaydettiği modeli yoklayıp açar. Başka bir
+worker'a düşen etiketler liderin bir sonraki zamanlanmış turunda
+öğrenilir.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlmodel import Session, and_, distinct, func, or_, select
+
+from backend.app.artifacts import (
+    BUILD_INFO_FILE,
+    CLASSIFIER_SUBDIR,
+    KNOWLEDGE_SUBDIR,
+    classifier_cache_dir,
+    current_artifact_dir,
+    prune,
+    publish,
+    read_build_info,
+)
+from backend.app.config import (
+    ARTIFACTS_DIR,
+    ARTIFACTS_LOAD_ONLY,
+    FEEDBACK_MIN_LABELS,
+    FEEDBACK_REFIT_RATIO,
+    FEEDBACK_RETRAIN_INTERVAL,
+    FEEDBACK_TRAINING,
+)
+from backend.app.db import engine
+from backend.app.inference import inference_executor
+from backend.app.locks import FileLock
+from backend.app.models import Ticket
+from backend.app.nlp.classifier import classifier
+
+logger = logging.getLogger("ogrenci_destek.feedback")
+
+RESOLVED_STATUS = "Çözüldü"
+
+_LEADER_LOCK_FILE = ".feedback-leader.lock"
+_TRAIN_LOCK_FILE = ".feedback.lock"
+# Lider olmayan süreçlerin yeni modeli yoklama aralığı (saniye)
+_FOLLOW_SECONDS = 30.0
+# Geri bildirimle yayınlanan artefaktlar dahil saklanacak sürüm sayısı
+_ARTIFACT_KEEP = 3
+
+_LABELLED = (
+    Ticket.status == RESOLVED_STATUS,
+    Ticket.confirmed_category.is_not(None),  # type: ignore[union-attr]
+)
+
+
+def _labelled_tickets(session: Session, watermark: list | None) -> list[Ticket]:
+    """Onaylı kategorisi olan çözülmüş ticket'lar (watermark'tan sonrakiler)."""
+    query = select(Ticket).where(*_LABELLED)
+    if watermark is not None:
+        updated_at, ticket_id = datetime.fromisoformat(watermark[0]), watermark[1]
+        query = query.where(or_(
+            Ticket.updated_at > updated_at,
+            and_(Ticket.updated_at == updated_at, Ticket.id > ticket_id),
+        ))
+    return list(session.exec(query.order_by(Ticket.updated_at, Ticket.id)).all())
+
+
+def _count_labelled(session: Session) -> int:
+    """Etiketli ticket sayısı; yeniden onaylanan ticket bir kez sayılır."""
+    return session.exec(select(func.count(distinct(Ticket.id))).where(*_LABELLED)).one()
+
+
+def _lock_dir() -> Path:
+    """Kilit dosyalarının dizini: artefakt kökü veya model önbelleği."""
+    return ARTIFACTS_DIR if ARTIFACTS_LOAD_ONLY else classifier.cache_dir
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Değişmeyen dosyayı sabit bağlantıyla paylaşır (olmazsa kopyalar)."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _publish_artifact() -> Path:
+    """
+    Yüklü modeli yeni bir artefakt sürümü olarak yayınlar.
+
+    Bilgi tabanı dizileri yayınlanan sürümden aynen alınır; build.json
+    yeni sınıflandırıcı sürümü ve geri bildirim durumuyla güncellenir.
+
+    Returns:
+        Yayınlanan sürüm dizini.
+
+    Raises:
+        RuntimeError: Yayınlanmış bir artefakt yoksa.
+    """
+    current = current_artifact_dir(ARTIFACTS_DIR)
+    if current is None:
+        raise RuntimeError("Yayınlanmış artefakt yok (artifacts/CURRENT).")
+    created_at = datetime.now(timezone.utc)
+    version = f"{created_at:%Y%m%dT%H%M%SZ}-{classifier.version[:8]}"  # type: ignore[index]
+    staging = ARTIFACTS_DIR / f".staging-{version}-{os.getpid()}"
+    try:
+        shutil.copytree(
+            current / KNOWLEDGE_SUBDIR, staging / KNOWLEDGE_SUBDIR,
+            copy_function=_link_or_copy,
+        )
+        classifier.save(staging / CLASSIFIER_SUBDIR)
+        info = read_build_info(current) or {}
+        info.update(
+            version=version,
+            created_at=created_at.isoformat(),
+            classifier_version=classifier.version,
+            feedback=classifier.feedback_state,
+            based_on=current.name,
+        )
+        (staging / BUILD_INFO_FILE).write_text(
+            json.dumps(info, ensure_ascii=False, indent=2), encoding="utf-8",
+        )
+        target = ARTIFACTS_DIR / version
+        staging.rename(target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    publish(ARTIFACTS_DIR, version)
+    logger.info("Geri bildirim modeli yeni artefakt sürümünde yayınlandı: %s", target)
+    prune(ARTIFACTS_DIR, _ARTIFACT_KEEP)
+    return target
+
+
+class FeedbackTrainer:
+    """Etiketli ticket'larla sınıflandırıcıyı arka planda güncelleyen eğitici."""
+
+    def __init__(
+        self,
+        enabled: bool,
+        min_labels: int,
+        interval: float,
+        refit_ratio: float,
+    ) -> None:
+        self._enabled = enabled
+        self._min_labels = max(1, min_labels)
+        self._interval = interval
+        self._refit_ratio = refit_ratio
+        # Aynı anda tek eğitim (süreçler arası: .feedback.lock)
+        self._lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Zamanlanmış eğitimi çalıştıran süreç (yalnızca eğitici iş parçacığı kullanır)
+        self._leader = FileLock(_lock_dir() / _LEADER_LOCK_FILE)
+        self._pending = 0
+        self._last: dict | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._thread is not None
+
+    # ── Yaşam döngüsü ─────────────────────────────────────────────
+    def start(self) -> None:
+        if not self._enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="feedback-trainer", daemon=True,
+        )
+        self._thread.start()
+        logger.info(
+            "Geri bildirim eğiticisi başlatıldı (%d etiket veya %.0f s).",
+            self._min_labels, self._interval,
+        )
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        thread, self._thread = self._thread, None
+        self._stop.set()
+        self._wake.set()
+        thread.join()
+        self._leader.release()
+
+    def notify(self, count: int = 1) -> None:
+        """Yeni etiket(ler) eklendi; eşik dolduysa eğiticiyi uyandırır."""
+        with self._pending_lock:
+            self._pending += count
+            pending = self._pending
+        if pending >= self._min_labels:
+            self._wake.set()
+
+    # ── Eğitim ────────────────────────────────────────────────────
+    def retrain(self, full: bool = False, trigger: str = "admin") -> dict:
+        """
+        Yeni etiketleri modele ekler ve sonucu döndürür (senkron).
+
+        Args:
+            full: True ise oran beklenmeden seed + tüm etiketlerle eğitilir.
+        """
+        with self._lock, FileLock(_lock_dir() / _TRAIN_LOCK_FILE):
+            started = time.perf_counter()
+            result: dict = {
+                "trigger": trigger,
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "previous_version": classifier.version,
+            }
+            try:
+                # Başka bir süreç daha yeni bir model kaydettiyse ondan devam et
+                self._follow()
+                result.update(self._train(classifier.feedback_state, full))
+            except Exception as exc:
+                logger.exception("Sınıflandırıcı yeniden eğitilemedi – eski model kullanılıyor.")
+                result.update(mode=None, new_labels=0, error=str(exc))
+            result.update(
+                version=classifier.version,
+                duration_seconds=round(time.perf_counter() - started, 3),
+            )
+            self._last = result
+            return result
+
+    def _train(self, previous: dict | None, full: bool) -> dict:
+        with self._pending_lock:
+            consumed = self._pending
+        with Session(engine) as session:
+            new = _labelled_tickets(session, previous["watermark"] if previous else None)
+            if not new and not full:
+                return {"mode": None, "new_labels": 0, "error": None}
+            with self._pending_lock:
+                self._pending = max(0, self._pending - consumed)
+
+            # Yeniden onaylanan ticket watermark'ı geçer ama yeni etiket değildir
+            labels = _count_labelled(session)
+            stale = labels - previous["full_fit_labels"] if previous else labels
+            full = full or previous is None or stale > self._refit_ratio * labels
+            if full:
+                # Sözlük dahil baştan: tüm etiketler (yeniden onaylananlar tek kez)
+                rows = _labelled_tickets(session, None)
+            else:
+                rows = new
+        if not rows:
+            return {"mode": None, "new_labels": 0, "error": None}
+
+        last = rows[-1]
+        state = {
+            "labels": len(rows) if full else labels,
+            "full_fit_labels": len(rows) if full else previous["full_fit_labels"],  # type: ignore[index]
+            "watermark": [last.updated_at.isoformat(), last.id],
+        }
+        texts = [t.original_text for t in rows]
+        categories = [t.confirmed_category for t in rows]
+        if full:
+            classifier.fit_feedback(texts, categories, state)  # type: ignore[arg-type]
+        else:
+            classifier.update_feedback(texts, categories, state)  # type: ignore[arg-type]
+        if ARTIFACTS_LOAD_ONLY:
+            # Yayınlanmış sürüm değişmez; diğer süreçler CURRENT'tan açar
+            target = _publish_artifact()
+            classifier.load(target / CLASSIFIER_SUBDIR)
+        else:
+            classifier.save()
+        inference_executor.restart()
+
+        logger.info(
+            "Sınıflandırıcı güncellendi (%s) – %d yeni, toplam %d etiket.",
+            "tam" if full else "artımlı", len(new), state["labels"],
+        )
+        return {"mode": "full" if full else "incremental", "new_labels": len(new), "error": None}
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "running": self._lock.locked(),
+            "leader": self._leader.held,
+            "pending_labels": self._pending,
+            "version": classifier.version,
+            "feedback": classifier.feedback_state,
+            "last_run": self._last,
+        }
+
+    # ── Eğitici döngüsü ───────────────────────────────────────────
+    def _is_leader(self) -> bool:
+        """Zamanlanmış eğitimi bu süreç mi çalıştırıyor? Kilit boştaysa devralınır."""
+        if self._leader.held:
+            return True
+        try:
+            acquired = self._leader.acquire(blocking=False)
+        except OSError:
+            logger.exception("Eğitici kilidi alınamadı: %s", self._leader.path)
+            return False
+        if acquired:
+            logger.info("Geri bildirim eğitimini bu süreç çalıştırıyor (pid=%d).", os.getpid())
+        return acquired
+
+    def _follow(self) -> bool:
+        """Başka bir sürecin kaydettiği / yayınladığı daha yeni modeli açar."""
+        directory = classifier_cache_dir() if ARTIFACTS_LOAD_ONLY else None
+        if not classifier.has_newer_cache(directory):
+            return False
+        classifier.load(directory)
+        inference_executor.restart()
+        return True
+
+    def _run(self) -> None:
+        due = time.monotonic() + self._interval
+        while not self._stop.is_set():
+            woken = self._wake.wait(timeout=min(self._interval, _FOLLOW_SECONDS))
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            if not self._is_leader():
+                try:
+                    self._follow()
+                except Exception:
+                    logger.exception("Yeni sınıflandırıcı modeli açılamadı.")
+                continue
+            if woken or time.monotonic() >= due:
+                self.retrain(trigger="labels" if woken else "schedule")
+                due = time.monotonic() + self._interval
+
+
+# ── Modül düzeyinde tekil örnek ───────────────────────────────────────
+feedback_trainer = FeedbackTrainer(
+    enabled=FEEDBACK_TRAINING,
+    min_labels=FEEDBACK_MIN_LABELS,
+    interval=FEEDBACK_RETRAIN_INTERVAL,
+    refit_ratio=FEEDBACK_REFIT_RATIO,
+)
@@ -0,0 +1,161 @@
+"""
+CPU-yoğun çıkarım (inference) için isteğe bağlı süreç havuzu.
+
+Sınıflandırıcı tahmini ve bilgi tabanı araması GIL'i tutan NumPy /
+scikit-learn çağrılarıdır. INFERENCE_WORKERS > 0 olduğunda bu çağrılar,
+modelleri önceden yüklenmiş ayrı süreçlerde çalıştırılır; istek iş
+parçacıkları yalnızca sonucu bekler ve veritabanı işleri engellenmez.
+
+INFERENCE_WORKERS = 0 (varsayılan) ise çağrılar aynı süreçte çalışır.
+
+Kullanım:
+    from backend.app.inference import inference_executor
+    category, confidence = inference_executor.predict("staj mı?")
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from backend.app.artifacts import (
+    CLASSIFIER_SUBDIR,
+    KNOWLEDGE_SUBDIR,
+    require_current_artifact,
+)
+from backend.app.config import ARTIFACTS_LOAD_ONLY, INFERENCE_WORKERS
+from backend.app.knowledge.retriever import RetrievalResult, knowledge_retriever
+from backend.app.nlp.classifier import classifier
+
+logger = logging.getLogger("ogrenci_destek.inference")
+
+
+# ── Worker süreç fonksiyonları ────────────────────────────────────────
+def _init_worker() -> None:
+    """Her worker süreci başlarken modelleri diskteki önbellekten yükler."""
+    if ARTIFACTS_LOAD_ONLY:
+        current = require_current_artifact()
+        classifier.load(current / CLASSIFIER_SUBDIR)
+        knowledge_retriever.load(current / KNOWLEDGE_SUBDIR)
+    else:
+        classifier.load_or_train()
+        knowledge_retriever.build()
+
+
+def _worker_ping() -> bool:
+    return True
+
+
+def _worker_predict_many(texts: list[str], normalized: bool) -> list[tuple[str, float]]:
+    return classifier.predict_many(texts, normalized)
+
+
+def _worker_retrieve(
+    query: str, top_k: int, normalized: bool, fallback_below: float | None,
+) -> list[RetrievalResult]:
+    return knowledge_retriever.retrieve(
+        query, top_k=top_k, normalized=normalized, fallback_below=fallback_below,
+    )
+
+
+# ── Yürütücü ──────────────────────────────────────────────────────────
+class InferenceExecutor:
+    """Çıkarım çağrılarını süreç havuzuna veya yerel modele yönlendirir."""
+
+    def __init__(self, workers: int) -> None:
+        self._workers = max(0, workers)
+        self._pool: ProcessPoolExecutor | None = None
+        # Bilgi tabanı ve sınıflandırıcı yenilemeleri aynı anda havuz değiştirmesin
+        self._restart_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._pool is not None
+
+    def start(self) -> None:
+        """Havuzu başlatır ve tüm worker'ların modelleri yüklemesini bekler."""
+        if self._workers == 0 or self._pool is not None:
+            return
+        self._pool = self._spawn_pool()
+        logger.info("Çıkarım havuzu hazır – %d süreç.", self._workers)
+
+    def _spawn_pool(self) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        try:
+            futures = [pool.submit(_worker_ping) for _ in range(self._workers)]
+            for future in futures:
+                future.result()
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        return pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+            logger.info("Çıkarım havuzu kapatıldı.")
+
+    def restart(self) -> None:
+        """
+        Model veya bilgi tabanı değiştiğinde worker'ları yeniden yükler.
+
+        Yeni havuz modelleri yükleyene kadar istekler eski havuzda çalışır;
+        ardından havuzlar yer değiştirir ve eski havuz elindeki işleri
+        bitirip kapanır. Yeni havuz başlatılamazsa eski havuz kalır.
+        """
+        with self._restart_lock:
+            old = self._pool
+            if old is None:
+                return
+            self._pool = self._spawn_pool()
+            old.shutdown(wait=True)
+            logger.info("Çıkarım havuzu yenilendi – %d süreç.", self._workers)
+
+    def _run(self, fn, *args):
+        """Havuz varsa orada, yoksa (veya havuz bozulduysa) yerelde çalıştırır."""
+        pool = self._pool
+        while pool is not None:
+            try:
+                return pool.submit(fn, *args).result()
+            except BrokenProcessPool:
+                logger.exception("Çıkarım havuzu bozuldu – yerel modele geçiliyor.")
+                if self._pool is pool:
+                    self._pool = None
+                break
+            except RuntimeError:
+                # Havuz restart() sırasında kapatıldıysa yenisine gönder
+                if self._pool is pool:
+                    raise
+                pool = self._pool
+        return fn(*args)
+
+    # ── Çıkarım çağrıları ─────────────────────────────────────────
+    # normalized=True: metin zaten nlp.turkish.normalize() çıktısıdır
+    def predict(self, text: str, normalized: bool = False) -> tuple[str, float]:
+        return self.predict_many([text], normalized)[0]
+
+    def predict_many(
+        self, texts: list[str], normalized: bool = False,
+    ) -> list[tuple[str, float]]:
+        return self._run(_worker_predict_many, texts, normalized)
+
+    def retrieve(
+        self,
+        query: str,
+        top_k: int = 3,
+        normalized: bool = False,
+        fallback_below: float | None = None,
+    ) -> list[RetrievalResult]:
+        return self._run(_worker_retrieve, query, top_k, normalized, fallback_below)
+
+
+# ── Modül düzeyinde tekil örnek ───────────────────────────────────────
+inference_executor = InferenceExecutor(workers=INFERENCE_WORKERS)
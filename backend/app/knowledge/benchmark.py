@@ -0,0 +1,277 @@
+"""
+Bilgi tabanı arama kıyaslaması: kelime dizini ve kelime dizini + LSA (RRF).
+
+Aynı kaynaklardan iki retriever geçici önbellek dizinlerine derlenir
+(KNOWLEDGE_DENSE_DIMS = 0 ve --dims) ve iki soru kümesiyle ölçülür:
+  - sss:     SSS belgesindeki soruların kendisi (kelime eşleşmesi kolay;
+             füzyonun bunları bozmadığını gösterir).
+  - yeniden: aynı soruların farklı kelimelerle sorulmuş halleri.
+Bir sonuç, chunk metni beklenen soru metinlerinden birini içeriyorsa
+doğrudur. Kalite için MRR@10, isabet@1 ve isabet@3; hız için sorgu
+başına ortalama ve p95 süre; ayrıca derleme süresi ve önbellek boyutu
+raporlanır. Her şey çevrimdışı, CPU üzerinde çalışır.
+
+Ayrıca bilgi tabanının konusu dışındaki seed kategorilerinin (Teknik,
+Ödeme) soruları cevap eşiğiyle aranır; eşiği geçen olursa sorular
+listelenir ve komut 1 ile çıkar (eşikler yeniden kalibre edilmeli).
+
+Kullanım:
+    python -m backend.app.knowledge.benchmark
+    python -m backend.app.knowledge.benchmark --dims 64 --scorer bm25 --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from backend.app.config import (
+    BM25_B,
+    BM25_DELTA,
+    BM25_K1,
+    HASHING_N_FEATURES,
+    KNOWLEDGE_DENSE_DIMS,
+    KNOWLEDGE_SCORER,
+    VECTORIZER_HASHING,
+)
+from backend.app.knowledge.retriever import (
+    KNOWLEDGE_SCORE_THRESHOLDS,
+    SCORERS,
+    KnowledgeRetriever,
+)
+from backend.app.nlp.seed_data import CATEGORY_EXAMPLES
+from backend.app.nlp.turkish import normalize_word
+
+logger = logging.getLogger("ogrenci_destek.knowledge.benchmark")
+
+_QUESTION_PREFIX = "Soru: "
+
+# (yeniden ifade edilmiş soru, doğru sayılan SSS soruları) – varsayılan SSS belgesi
+PARAPHRASES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("İşyerinde kaza geçirirsem ne olur?", (
+        "iş kazası veya meslek hastalığı olursa",
+        "İş kazası veya meslek hastalığı durumunda",
+        "İş kazası olması durumunda",
+    )),
+    ("Staj boyunca bana maaş verilecek mi?", (
+        "ücret alacak mıyım", "Öğrenciye ücret ödemek zorunlu mudur",
+    )),
+    ("Kaç gün okula gelmezsem kalırım?", (
+        "devam zorunluluğu nedir", "Mazeretsiz devamsızlık sınırı", "Devamsızlık hakkım ne kadar",
+    )),
+    ("Hastalandığımda doktor raporu devamsızlıktan sayılır mı?", (
+        "sağlık raporları devamsızlığa", "Devamsızlık hakkım ne kadar",
+    )),
+    ("Ortalamam kaç olmalı ki başlayabileyim?", (
+        "genel akademik şartlar", "GANO şartı",
+    )),
+    ("Sigortamı kim yatırıyor?", (
+        "sigorta primlerimi kim ödüyor", "SGK primlerimi kim ödüyor", "hangi sigorta türleri zorunludur",
+    )),
+    ("Yazacağım raporun uzunluğu ne olmalı?", (
+        "Ara rapor kaç sayfa", "raporu kaç sayfa olmalıdır",
+    )),
+    ("Dersten kalırsam yine de gidebilir miyim?", ("başarısız derslerim varsa",)),
+    ("Şirketi kendim mi bulmalıyım?", ("İşletme bulmayı ben mi yapacağım",)),
+    ("Bitirince beni işe alırlar mı?", ("mezuniyetten sonra işe alabilir",)),
+    ("Yurt dışında yaptığım staj geçerli mi?", ("Erasmus stajı",)),
+    ("Notum nasıl hesaplanıyor?", ("Notlandırma nasıl yapılıyor",)),
+    ("Başarısız olursam ne yapmam gerekiyor?", ("başarısız olursam ne olur",)),
+    ("Hangi belgeleri doldurup teslim etmem lazım?", ("Hangi formları doldurmam gerekiyor",)),
+    ("Sisteme giriş yapamıyorum", ("sistemine girişte sorun yaşıyorum",)),
+    ("Haftanın kaç günü çalışacağım?", (
+        "Haftada kaç gün işletmeye", "çalışma saatleri nasıl düzenlenmelidir",
+    )),
+    ("Zorunlu mu yoksa seçmeli mi?", ("zorunlu mu, isteğe bağlı mı",)),
+    ("Rapora fotoğraf eklemek yeterli olur mu?", (
+        "sadece resim koymak yeterli", "resimlerin boyutu",
+    )),
+    ("Sorumlu hocamdan izin almadan işten çıkabilir miyim?", ("izni olmadan işyerinden ayrılabilir",)),
+    ("Klasik stajdan farkı ne?", ("bir staj programı mıdır", "klasik staj arasında ne fark")),
+    ("Toplam kaç hafta sürüyor?", ("Eğitimi süresi ne kadardır",)),
+    ("Hangi bölümler katılabiliyor?", (
+        "mesleki eğitime kimler katılabilir", "Hangi bölüm ve programlar",
+    )),
+    ("İşletme ile üniversite arasındaki sözleşme nasıl yapılıyor?", ("protokol nasıl imzalanıyor",)),
+    ("Başvurular hangi platformdan yapılıyor?", ("Başvuruyu hangi sistem üzerinden",)),
+)
+
+_TOP_K = 10
+
+# Bilgi tabanında cevabı olmayan seed kategorileri: soruları eşiği geçmemeli
+OFF_TOPIC_CATEGORIES: tuple[str, ...] = ("Teknik", "Ödeme")
+
+
+def _faq_questions(retriever: KnowledgeRetriever) -> list[tuple[str, tuple[str, ...]]]:
+    """SSS chunk'larının soru satırları (her soru kendi chunk'ını bulmalı)."""
+    state = retriever._state
+    assert state is not None
+    queries = []
+    for i in range(len(state.chunks)):
+        first_line = state.chunks[i]["text"].split("\n", 1)[0]
+        if first_line.startswith(_QUESTION_PREFIX):
+            question = first_line[len(_QUESTION_PREFIX):]
+            queries.append((question, (question,)))
+    return queries
+
+
+def _quality(
+    retriever: KnowledgeRetriever, queries: list[tuple[str, tuple[str, ...]]],
+) -> dict[str, float]:
+    """MRR@10, isabet@1 ve isabet@3 (oran)."""
+    reciprocal, hit1, hit3 = [], 0, 0
+    for query, expected in queries:
+        results = retriever.retrieve(query, top_k=_TOP_K)
+        rank = next(
+            (n for n, r in enumerate(results, start=1)
+             if any(e in r["chunk"] for e in expected)),
+            None,
+        )
+        reciprocal.append(1 / rank if rank else 0.0)
+        hit1 += rank == 1
+        hit3 += rank is not None and rank <= 3
+    n = len(queries) or 1
+    return {"mrr": sum(reciprocal) / n, "hit@1": hit1 / n, "hit@3": hit3 / n}
+
+
+def off_topic_answers(retriever: KnowledgeRetriever) -> list[tuple[str, float]]:
+    """
+    Konu dışı seed sorularından cevap eşiğini geçenler (soru, skor).
+
+    Sohbet akışındaki gibi aranır: eşiğin altında kalırsa yazım düzeltmesi
+    de denenir.
+    """
+    threshold = KNOWLEDGE_SCORE_THRESHOLDS[retriever.scorer]
+    answered = []
+    for category in OFF_TOPIC_CATEGORIES:
+        for question in CATEGORY_EXAMPLES.get(category, ()):
+            results = retriever.retrieve(question, top_k=3, fallback_below=threshold)
+            best = max((r["score"] for r in results), default=0.0)
+            if best >= threshold:
+                answered.append((question, best))
+    return answered
+
+
+def _latency(retriever: KnowledgeRetriever, queries: list[str], repeat: int) -> tuple[float, float]:
+    """Sorgu başına ortalama ve p95 süre (ms); üst seviye top_k=3 ile."""
+    for query in queries:
+        retriever.retrieve(query, top_k=3)  # ısınma (kök önbelleği, sayfa önbelleği)
+    timings = []
+    for _ in range(repeat):
+        for query in queries:
+            started = time.perf_counter()
+            retriever.retrieve(query, top_k=3)
+            timings.append(time.perf_counter() - started)
+    ms = np.array(timings) * 1000
+    return float(ms.mean()), float(np.percentile(ms, 95))
+
+
+def run(
+    scorer: str,
+    dims: int,
+    repeat: int,
+    knowledge_dir: Path | None = None,
+) -> list[dict]:
+    """Her mod için ölçüm satırlarını döndürür (önce kelime dizini, sonra LSA)."""
+    rows = []
+    for label, dense_dims in (("kelime", 0), (f"kelime+lsa{dims}", dims)):
+        cache_dir = Path(tempfile.mkdtemp(prefix="ogrenci-destek-bench-"))
+        try:
+            retriever = KnowledgeRetriever(
+                scorer=scorer,
+                k1=BM25_K1,
+                b=BM25_B,
+                delta=BM25_DELTA,
+                cache_dir=cache_dir,
+                knowledge_dir=knowledge_dir,
+                hashing_features=HASHING_N_FEATURES if VECTORIZER_HASHING else 0,
+                dense_dims=dense_dims,
+            )
+            # Her iki derleme de soğuk kök önbelleğiyle başlasın
+            normalize_word.cache_clear()
+            started = time.perf_counter()
+            retriever.build(force=True)
+            build_seconds = time.perf_counter() - started
+            if not retriever.is_ready:
+                raise RuntimeError("Bilgi tabanı oluşturulamadı – kaynak dosyaları kontrol edin.")
+
+            faq = _faq_questions(retriever)
+            paraphrases = list(PARAPHRASES)
+            mean_ms, p95_ms = _latency(
+                retriever, [q for q, _ in faq + paraphrases], repeat,
+            )
+            rows.append({
+                "mode": label,
+                "build_s": build_seconds,
+                "cache_mb": sum(
+                    p.stat().st_size for p in cache_dir.rglob("*") if p.is_file()
+                ) / 2**20,
+                "sss": _quality(retriever, faq),
+                "yeniden": _quality(retriever, paraphrases),
+                "konu_disi": off_topic_answers(retriever),
+                "mean_ms": mean_ms,
+                "p95_ms": p95_ms,
+            })
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+    return rows
+
+
+def _print(rows: list[dict], scorer: str) -> None:
+    header = (
+        f"{'mod':<14} {'derleme s':>9} {'önbellek MB':>11} "
+        f"{'sss mrr/@1/@3':>17} {'yeniden mrr/@1/@3':>19} {'ort ms':>7} {'p95 ms':>7} "
+        f"{'konu dışı':>9}"
+    )
+    print(f"skorlayıcı: {scorer} (eşik {KNOWLEDGE_SCORE_THRESHOLDS[scorer]})")
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        quality = {
+            name: "{mrr:.3f}/{hit@1:.2f}/{hit@3:.2f}".format(**row[name])
+            for name in ("sss", "yeniden")
+        }
+        print(
+            f"{row['mode']:<14} {row['build_s']:>9.2f} {row['cache_mb']:>11.2f} "
+            f"{quality['sss']:>17} {quality['yeniden']:>19} "
+            f"{row['mean_ms']:>7.3f} {row['p95_ms']:>7.3f} {len(row['konu_disi']):>9}"
+        )
+    for row in rows:
+        for question, score in row["konu_disi"]:
+            print(f"eşiği geçen konu dışı soru ({row['mode']}): {question!r} skor={score:.4f}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.app.knowledge.benchmark",
+        description="Kelime dizini ile kelime dizini + LSA (RRF) aramasını karşılaştırır.",
+    )
+    parser.add_argument("--scorer", choices=SCORERS, default=KNOWLEDGE_SCORER, help="Skorlayıcı")
+    parser.add_argument(
+        "--dims", type=int, default=KNOWLEDGE_DENSE_DIMS or 32, help="LSA boyutu",
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Süre ölçümü tekrar sayısı")
+    parser.add_argument(
+        "--knowledge-dir", type=Path, default=None,
+        help="Belge klasörü (varsayılan: proje kökündeki sunum + SSS)",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+    try:
+        rows = run(args.scorer, args.dims, args.repeat, args.knowledge_dir)
+    except RuntimeError as exc:
+        logger.error("%s", exc)
+        return 1
+    _print(rows, args.scorer)
+    return 1 if any(row["konu_disi"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,199 @@
+"""
+Yoğun (LSA) anlamsal arama: TF-IDF matrisinin TruncatedSVD izdüşümü.
+
+Kelime dizini yalnızca ortak terimleri eşleştirir; "staj boyunca maaş
+verilecek mi?" sorusunda yalnızca "staj" geçen genel slaytlar "ücret"
+geçen chunk'ın önüne geçebilir. LSA birlikte geçen terimleri aynı gizli
+boyutlarda toplar; sorgu ve chunk'lar KNOWLEDGE_DENSE_DIMS boyutlu uzaya
+izdüşürülüp kosinüs benzerliğiyle sıralanır.
+
+Derleme sırasında (çevrimdışı, CPU, scikit-learn) üç bitişik dizi
+üretilir ve önbellekle birlikte bellek eşlemeli açılır:
+  - columns:    derleme matrisinde en az bir chunk'ta geçen sütunlar
+                (artan sıralı). Hiç geçmeyen sütunların izdüşümü zaten
+                sıfırdır; hashing modunda HASHING_N_FEATURES satırlık
+                matris yerine yalnızca bunlar saklanır.
+  - terms:      sütun × boyut izdüşüm matrisi (svd.components_.T). Sorgu
+                izdüşümünde yalnızca sorgu terimlerinin satırları okunur.
+  - embeddings: chunk × boyut, satırları L2-normalleştirilmiş.
+Sorgu skoru tek bir matris-vektör çarpımıdır (embeddings @ q).
+
+Artımlı güncellemede izdüşüm yeniden hesaplanmaz: yeni chunk'lar mevcut
+terms matrisiyle uzaya yerleştirilir (fold-in); IDF gibi bir sonraki tam
+derlemeye kadar sabit kalır. columns dışındaki yeni terimler izdüşüme
+katılmaz.
+
+Sonuçlar kelime dizininin sıralamasıyla reciprocal rank fusion (fuse)
+ile birleştirilir. LSA kosinüsü ilgisiz sorulara da yüksek çıkabildiği
+için LSA yalnızca kelime dizininin bulduğu chunk'ları yeniden sıralar;
+cevap eşiği kelime dizini skoruna bakmaya devam eder.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+from sklearn.decomposition import TruncatedSVD
+
+from backend.app.knowledge.store import load_array, save_array
+
+_PREFIX = "dense_"
+
+# RRF sabiti ve her sıralamadan füzyona giren aday sayısı. Seed
+# belgelerindeki yeniden ifade edilmiş sorularda klasik k=60 ve tüm
+# adaylar, iki listede de ortalarda kalan genel slaytları öne çıkardı;
+# kısa listeler ve küçük k en iyi MRR'ı verdi (benchmark.py).
+RRF_K = 5
+FUSION_DEPTH = 10
+
+
+class DenseIndex:
+    """LSA izdüşüm matrisi + normalleştirilmiş chunk vektörleri (değişmez)."""
+
+    NAMES: tuple[str, ...] = (
+        _PREFIX + "columns", _PREFIX + "terms", _PREFIX + "embeddings",
+    )
+
+    def __init__(
+        self, columns: np.ndarray, terms: np.ndarray, embeddings: np.ndarray,
+    ) -> None:
+        self.columns = columns
+        self.terms = terms
+        self.embeddings = embeddings
+
+    @property
+    def dims(self) -> int:
+        return self.terms.shape[1]
+
+    # ── Derleme ───────────────────────────────────────────────────
+    @classmethod
+    def fit(cls, weights: sparse.csr_matrix, dims: int) -> DenseIndex | None:
+        """
+        L2-normalleştirilmiş TF-IDF matrisinden izdüşümü öğrenir.
+
+        Boyut, matrisin rankını aşmayacak şekilde kırpılır; tek chunk'lık
+        (veya tek terimlik) bilgi tabanında None döner.
+        """
+        weights = sparse.csr_matrix(weights)
+        columns = np.unique(weights.indices[weights.data != 0]).astype(np.int32)
+        compact = _restrict(weights, columns)
+        dims = min(dims, min(compact.shape) - 1)
+        if dims < 1:
+            return None
+        # Sabit tohum: aynı kaynaklar aynı artefaktı üretir
+        svd = TruncatedSVD(n_components=dims, random_state=0)
+        svd.fit(compact)
+        terms = np.ascontiguousarray(svd.components_.T, dtype=np.float32)
+        return cls(columns, terms, _embed(compact, terms))
+
+    def replace_rows(
+        self, blocks: list[tuple[int, int] | sparse.csr_matrix],
+    ) -> DenseIndex:
+        """
+        Değişmeyen satır aralıklarını korur, yeni chunk'ları fold-in eder.
+
+        blocks: KnowledgeRetriever._replace_rows ile aynı sırada eski
+        (başlangıç, bitiş) aralıkları veya yeni chunk'ların TF-IDF matrisi.
+        """
+        parts = [
+            np.asarray(self.embeddings[block[0]:block[1]])
+            if isinstance(block, tuple)
+            else _embed(_restrict(block, self.columns), self.terms)
+            for block in blocks
+        ]
+        embeddings = (
+            np.concatenate(parts) if parts
+            else np.empty((0, self.dims), dtype=np.float32)
+        )
+        return DenseIndex(self.columns, self.terms, np.ascontiguousarray(embeddings))
+
+    # ── Arama ─────────────────────────────────────────────────────
+    def score(self, query_vec: sparse.spmatrix) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Tüm chunk'ların sorguyla kosinüs benzerliği.
+
+        Returns:
+            (chunk id'leri, skorlar) – sorgu terimlerinin hiçbiri izdüşümde
+            yoksa tüm skorlar 0'dır.
+        """
+        query = sparse.csr_matrix(query_vec)
+        positions, found = _positions(self.columns, query.indices)
+        projected = query.data[found].astype(np.float32) @ self.terms[positions[found]]
+        norm = float(np.linalg.norm(projected))
+        n_docs = len(self.embeddings)
+        if norm == 0:
+            return np.arange(n_docs), np.zeros(n_docs, dtype=np.float32)
+        return np.arange(n_docs), self.embeddings @ (projected / norm)
+
+    # ── Önbellek ──────────────────────────────────────────────────
+    def save(self, directory: Path) -> None:
+        save_array(directory, _PREFIX + "columns", self.columns)
+        save_array(directory, _PREFIX + "terms", self.terms)
+        save_array(directory, _PREFIX + "embeddings", self.embeddings)
+
+    @classmethod
+    def load(cls, directory: Path) -> DenseIndex:
+        return cls(
+            load_array(directory, _PREFIX + "columns"),
+            load_array(directory, _PREFIX + "terms"),
+            load_array(directory, _PREFIX + "embeddings"),
+        )
+
+
+def _restrict(weights: sparse.spmatrix, columns: np.ndarray) -> sparse.csr_matrix:
+    """
+    Matrisi izdüşümü olan sütunlara indirger.
+
+    Sütun id'leri columns içindeki sıraya çevrilir; columns dışındaki
+    değerler atılır (izdüşümleri sıfırdır).
+    """
+    weights = sparse.csr_matrix(weights)
+    positions, found = _positions(columns, weights.indices)
+    rows = np.repeat(np.arange(weights.shape[0]), np.diff(weights.indptr))
+    return sparse.csr_matrix(
+        (weights.data[found], (rows[found], positions[found])),
+        shape=(weights.shape[0], len(columns)),
+    )
+
+
+def _positions(columns: np.ndarray, indices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sütun id'lerinin columns içindeki sırası ve bulunup bulunmadığı."""
+    positions = np.searchsorted(columns, indices)
+    found = positions < len(columns)
+    found[found] = columns[positions[found]] == indices[found]
+    return positions, found
+
+
+def _embed(weights: sparse.csr_matrix, terms: np.ndarray) -> np.ndarray:
+    """İndirgenmiş TF-IDF satırlarını izdüşürür ve L2-normalleştirir (float32, bitişik)."""
+    projected = np.asarray(weights @ terms, dtype=np.float32)
+    norms = np.linalg.norm(projected, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(projected / norms)
+
+
+# ── Sıralama füzyonu ──────────────────────────────────────────────────
+def fuse(
+    lexical: list[tuple[int, float]],
+    dense: list[tuple[int, float]],
+    k: int,
+) -> list[tuple[int, float]]:
+    """
+    İki sıralamayı reciprocal rank fusion ile birleştirir.
+
+    RRF(d) = Σ 1 / (RRF_K + sıra). Eşitlikte kelime dizini skoru yüksek
+    olan öne geçer. Yalnızca kelime dizininin bulduğu chunk'lar döner ve
+    kelime dizini skorunu taşır; cevap eşiği bu skora uygulanır. Yalnızca
+    LSA'nın bulduğu chunk alınmaz: LSA kosinüsü konu dışı sorularda da
+    0.9'u aşabildiği için ayrı bir eşikle de ayıklanamıyor ve böyle bir
+    chunk, eşiği başka bir sonuç geçtiğinde ilk sırada gösterilirdi.
+    """
+    fused: dict[int, float] = {}
+    for ranking in (lexical, dense):
+        for rank, (i, _score) in enumerate(ranking, start=1):
+            fused[i] = fused.get(i, 0.0) + 1.0 / (RRF_K + rank)
+    scores = dict(lexical)
+    order = sorted(scores, key=lambda i: (-fused[i], -scores[i], i))
+    return [(i, scores[i]) for i in order[:k]]
@@ -0,0 +1,204 @@
+"""
+Bilgi tabanı için ters dizin (inverted index / postings listesi).
+
+TF-IDF matrisi terim bazlı (CSC) düzene çevrilir: her terim için o terimi
+içeren chunk'lar ve ağırlıkları ardışık dizilerde tutulur. Sorgu
+skorlanırken yalnızca sorgu terimlerinin postings listeleri okunur;
+maliyet chunk sayısıyla değil, eşleşen posting sayısıyla büyür.
+
+score_pruned() yaygın terimlerin uzun postings listelerini taramaz: adaylar
+yalnızca sorgunun en nadir terimlerinden toplanır, diğer terimlerin
+ağırlıkları adaylar için ikili aramayla okunur (karakter 3-gram dizini).
+
+En iyi top_k sonuç tam sıralama yerine np.argpartition ile seçilir.
+
+Diziler .npy olarak saklanır ve bellek eşlemeli açılabilir (store.py).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+
+from backend.app.knowledge.store import Vocabulary, load_array, save_array
+
+
+class InvertedIndex:
+    """Terim → (chunk id'leri, ağırlıklar) postings listeleri."""
+
+    _NAMES = ("postings_indptr", "postings_docs", "postings_weights")
+
+    def __init__(
+        self,
+        indptr: np.ndarray,
+        doc_ids: np.ndarray,
+        weights: np.ndarray,
+        n_docs: int,
+    ) -> None:
+        self.n_docs = n_docs
+        self.n_terms = len(indptr) - 1
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.weights = weights
+
+    @classmethod
+    def from_matrix(cls, matrix: sparse.spmatrix) -> InvertedIndex:
+        """
+        Args:
+            matrix: (chunk sayısı × terim sayısı) ağırlık matrisi.
+        """
+        postings = sparse.csc_matrix(matrix, dtype=np.float32)
+        postings.sort_indices()
+        return cls(postings.indptr, postings.indices, postings.data, postings.shape[0])
+
+    def to_matrix(self) -> sparse.csr_matrix:
+        """Satır bazlı (chunk × terim) matrisi yeniden kurar (yalnızca derlemede)."""
+        return sparse.csc_matrix(
+            (self.weights, self.doc_ids, self.indptr),
+            shape=(self.n_docs, self.n_terms),
+        ).tocsr()
+
+    def save(self, directory: Path, prefix: str = "") -> None:
+        for name, array in zip(self._NAMES, (self.indptr, self.doc_ids, self.weights)):
+            save_array(directory, prefix + name, array)
+
+    @classmethod
+    def load(cls, directory: Path, n_docs: int, prefix: str = "") -> InvertedIndex:
+        return cls(
+            *(load_array(directory, prefix + name) for name in cls._NAMES), n_docs=n_docs,
+        )
+
+    def score(self, query_vec: sparse.spmatrix) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sorgu vektörüyle en az bir terimi paylaşan chunk'ları skorlar.
+
+        Args:
+            query_vec: (1 × terim sayısı) sorgu vektörü.
+
+        Returns:
+            (chunk id'leri, skorlar) – yalnızca aday chunk'lar, sırasız.
+        """
+        query = sparse.csr_matrix(query_vec)
+        terms, query_weights = query.indices, query.data
+        if len(terms) == 0:
+            return _EMPTY_IDS, _EMPTY_SCORES
+
+        starts = self.indptr[terms]
+        ends = self.indptr[terms + 1]
+        lengths = ends - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return _EMPTY_IDS, _EMPTY_SCORES
+
+        # Sorgu terimlerinin postings dilimlerini tek seferde topla
+        positions = np.repeat(ends - lengths.cumsum(), lengths) + np.arange(total)
+        docs = self.doc_ids[positions]
+        contributions = self.weights[positions] * np.repeat(
+            query_weights.astype(np.float32), lengths,
+        )
+
+        candidates, inverse = np.unique(docs, return_inverse=True)
+        scores = np.bincount(inverse, weights=contributions, minlength=len(candidates))
+        return candidates, scores
+
+    def score_pruned(
+        self, query_vec: sparse.spmatrix, required: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sorgu terimlerinden en az `required` tanesini içeren satırları skorlar.
+
+        Bir satır n sorgu teriminden en az m tanesini içeriyorsa, en nadir
+        n - m + 1 terimden birini mutlaka içerir. Adaylar yalnızca bu
+        terimlerin (kısa) postings listelerinden toplanır; yaygın
+        terimlerin ağırlıkları adaylar için postings içinde ikili aramayla
+        bulunur. Maliyet: O(nadir postings + n · aday · log postings).
+
+        Returns:
+            (satır id'leri, skorlar) – yalnızca eşiği geçen adaylar, sırasız.
+        """
+        query = sparse.csr_matrix(query_vec)
+        terms, query_weights = query.indices, query.data.astype(np.float32)
+        required = max(1, required)
+        if len(terms) < required:
+            return _EMPTY_IDS, _EMPTY_SCORES
+
+        lengths = self.indptr[terms + 1] - self.indptr[terms]
+        order = np.argsort(lengths, kind="stable")
+        terms, query_weights = terms[order], query_weights[order]
+        probe = len(terms) - required + 1
+
+        candidates = np.unique(np.concatenate([
+            self.doc_ids[self.indptr[t]:self.indptr[t + 1]] for t in terms[:probe]
+        ]))
+        if len(candidates) == 0:
+            return _EMPTY_IDS, _EMPTY_SCORES
+
+        scores = np.zeros(len(candidates), dtype=np.float64)
+        shared = np.zeros(len(candidates), dtype=np.int32)
+        for term, weight in zip(terms, query_weights):
+            start, end = self.indptr[term], self.indptr[term + 1]
+            docs = self.doc_ids[start:end]
+            if len(docs) == 0:
+                continue
+            # Postings chunk id'sine göre sıralı (from_matrix → sort_indices)
+            pos = np.minimum(np.searchsorted(docs, candidates), len(docs) - 1)
+            hit = docs[pos] == candidates
+            scores[hit] += weight * self.weights[start + pos[hit]]
+            shared += hit
+        keep = shared >= required
+        return candidates[keep], scores[keep]
+
+
+def term_counts(vocabulary: Vocabulary, documents: list[list[str]]) -> sparse.csr_matrix:
+    """Terim listelerinin sözlükteki sayıları (belge × terim); sözlük dışı terimler atlanır."""
+    rows: list[np.ndarray] = []
+    cols: list[np.ndarray] = []
+    for i, terms in enumerate(documents):
+        ids = vocabulary.lookup(terms)
+        rows.append(np.full(len(ids), i, dtype=np.int32))
+        cols.append(ids)
+    row_ids = np.concatenate(rows) if rows else np.empty(0, dtype=np.int32)
+    col_ids = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+    counts = sparse.csr_matrix(
+        (np.ones(len(col_ids), dtype=np.float32), (row_ids, col_ids)),
+        shape=(len(documents), len(vocabulary)),
+    )
+    counts.sum_duplicates()
+    return counts
+
+
+def tfidf_weights(idf: np.ndarray, counts: sparse.csr_matrix) -> sparse.csr_matrix:
+    """TfidfVectorizer(sublinear_tf=True) ile aynı dönüşüm + L2 normu."""
+    weights = counts.copy()
+    weights.data = (1 + np.log(weights.data)) * idf[weights.indices]
+    norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    weights.data /= np.repeat(norms, np.diff(weights.indptr)).astype(np.float32)
+    return weights
+
+
+def top_k(
+    doc_ids: np.ndarray, scores: np.ndarray, k: int
+) -> list[tuple[int, float]]:
+    """
+    Pozitif skorlu en iyi k adayı (skor azalan, eşitlikte id artan) döndürür.
+
+    Tam sıralama yerine argpartition kullanılır: O(n + k log k).
+    """
+    if k <= 0 or len(scores) == 0:
+        return []
+    if k < len(scores):
+        part = np.argpartition(-scores, k - 1)[:k]
+        doc_ids, scores = doc_ids[part], scores[part]
+    order = np.lexsort((doc_ids, -scores))
+    return [
+        (int(doc_ids[i]), float(scores[i]))
+        for i in order
+        if scores[i] > 0
+    ]
+
+
+_EMPTY_IDS = np.empty(0, dtype=np.int32)
+_EMPTY_SCORES = np.empty(0, dtype=np.float64)
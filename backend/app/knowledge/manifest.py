@@ -0,0 +1,122 @@
+"""
+Bilgi tabanı önbellek manifesti.
+
+Manifest, önbelleğin hangi kaynak dosyalardan ve hangi ayarlarla
+(chunker, vektörleştirici, skorlayıcı) üretildiğini kaydeder:
+
+    {
+      "settings": {...},
+      "sources": [
+        {"path": ..., "kind": "pptx", "size": ..., "mtime_ns": ...,
+         "sha256": ..., "rows": [başlangıç, bitiş]},
+        ...
+      ],
+      "stale_rows": 0
+    }
+
+"rows", kaynağın chunk'larının matristeki satır aralığıdır; değişmeyen
+kaynakların chunk'ları ve satırları yeniden çıkarılmadan kullanılır.
+Kaynakların sırası (ve dolayısıyla chunk sıra numaraları) yola göre
+sıralıdır; ayrıştırmanın hangi sırayla bittiğine bağlı değildir.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import TypedDict
+
+logger = logging.getLogger("ogrenci_destek.knowledge.manifest")
+
+_HASH_BLOCK = 1 << 20
+
+SOURCE_KINDS: dict[str, str] = {".pptx": "pptx", ".docx": "docx"}
+
+
+class SourceEntry(TypedDict):
+    path: str
+    kind: str  # "pptx" | "docx"
+    size: int
+    mtime_ns: int
+    sha256: str
+    rows: list[int]
+
+
+def file_sha256(path: Path) -> str:
+    """Dosya içeriğinin SHA-256 özeti (parça parça okunur)."""
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        while block := fh.read(_HASH_BLOCK):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def describe_source(
+    path: Path, kind: str, previous: SourceEntry | None = None,
+) -> SourceEntry:
+    """
+    Kaynak dosyanın kimlik bilgisini çıkarır.
+
+    Boyut ve değişiklik zamanı önceki kayıtla aynıysa içerik yeniden
+    özetlenmez; aksi halde SHA-256 hesaplanır (yalnızca dokunulmuş ama
+    içeriği değişmemiş dosyalar böylece yeniden işlenmez).
+    """
+    stat = path.stat()
+    if (
+        previous is not None
+        and previous["size"] == stat.st_size
+        and previous["mtime_ns"] == stat.st_mtime_ns
+    ):
+        sha256 = previous["sha256"]
+    else:
+        sha256 = file_sha256(path)
+    return SourceEntry(
+        path=str(path),
+        kind=kind,
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        sha256=sha256,
+        rows=[0, 0],
+    )
+
+
+def discover_sources(directory: Path) -> list[tuple[Path, str]]:
+    """
+    Klasördeki (alt klasörler dahil) tüm .pptx / .docx dosyalarını bulur.
+
+    Office'in açık belgeler için bıraktığı "~$" geçici dosyaları atlanır.
+
+    Returns:
+        Yola göre sıralı (dosya yolu, tür) listesi.
+    """
+    if not directory.is_dir():
+        logger.warning("Bilgi tabanı klasörü bulunamadı: %s", directory)
+        return []
+    return [
+        (path, SOURCE_KINDS[path.suffix.lower()])
+        for path in sorted(directory.rglob("*"))
+        if path.suffix.lower() in SOURCE_KINDS
+        and path.is_file()
+        and not path.name.startswith("~$")
+    ]
+
+
+def read_manifest(path: Path) -> dict | None:
+    """Manifesti okur; yoksa veya bozuksa None döndürür."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.warning("Manifest okunamadı: %s", path)
+        return None
+
+
+def write_manifest(path: Path, manifest: dict) -> None:
+    """Manifesti atomik olarak yazar (geçici dosya + os.replace)."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
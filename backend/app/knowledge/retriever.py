@@ -1,9 +1,46 @@
 """
-TF-IDF tabanlı bilgi tabanı arama (retriever).
+TF-IDF / BM25 tabanlı bilgi tabanı arama (retriever).
 
-İlk çalıştırmada PPTX + DOCX dosyalarından chunk'ları çıkarır, TF-IDF
-modeli oluşturur ve sonuçları diske önbellek olarak kaydeder.
-Sonraki çalıştırmalarda önbellekten yükler.
+İlk çalıştırmada PPTX + DOCX dosyalarından chunk'ları çıkarır, seçilen
+skorlayıcının (KNOWLEDGE_SCORER) ağırlık matrisini oluşturur ve sonuçları
+diske önbellek olarak kaydeder. Sonraki çalıştırmalarda önbellekten yükler;
+kaynak dosyalar değiştiyse (manifest.py) yalnızca değişenler yeniden işlenir.
+
+Önbellek düz .npy dizilerinden oluşur (store.py). Her derleme önbellek
+dizini altında yeni bir sürüm dizinine yazılır ve CURRENT dosyası atomik
+olarak ona çevrilir; okuyucu hiçbir zaman eski ve yeni dizilerin
+karışımını görmez. Diziler bellek eşlemeli açılır: postings listeleri,
+sözlük, IDF ve chunk metinleri tüm worker süreçleri arasında sayfa
+önbelleği üzerinden paylaşılır. Sorgular sözlük üzerinden doğrudan
+vektörleştirilir; eğitilmiş scikit-learn nesnesi yalnızca tam derleme
+sırasında kullanılır. Chunk'lar ve sorgular sınıflandırıcıyla aynı
+Türkçe normalleştirmeden geçer (nlp/turkish.py).
+
+VECTORIZER_HASHING=true ise sözlük hiç tutulmaz: terimler HashingVectorizer
+ile sabit boyutlu (HASHING_N_FEATURES) uzaya düşürülür, IDF bu uzayda yoğun
+float32 dizidir. Hiç görülmemiş sütunların IDF'i 0'dır; artımlı
+güncellemede yeni belgelerin yeni terimleri bu sütunlara IDF alarak
+yeniden eğitim olmadan aranabilir olur.
+
+KNOWLEDGE_FUZZY=true ise chunk kelimelerinin karakter 3-gram dizini de
+kurulur (trigram.py). Kelime dizininin en iyi skoru cevap eşiğinin
+altında kalırsa sorgudaki bilinmeyen (hatalı yazılmış) kelimeler en
+yakın bilinen kelimeyle değiştirilip arama tekrarlanır.
+
+KNOWLEDGE_DENSE_DIMS > 0 ise TF-IDF matrisinin LSA izdüşümü de derlenir
+(dense.py); kelime dizininin ve LSA'nın sıralamaları reciprocal rank
+fusion ile birleştirilir. Skorlar kelime dizininden gelir, cevap eşiği
+değişmez; LSA yalnızca kelime dizininin bulduğu chunk'ların sırasını
+etkiler, kendi başına chunk eklemez.
+
+Skorlayıcılar:
+  - tfidf: sublinear TF-IDF + kosinüs benzerliği (varsayılan).
+  - bm25:  Okapi BM25; chunk uzunluğu normalize edilir, kısa DOCX
+           cevapları ile uzun slaytlar daha adil karşılaştırılır.
+  - bm25+: BM25+ (her eşleşen terime alt sınır delta eklenir).
+BM25 skorları, sorgu terimi başına derlemin en yüksek IDF'iyle
+hesaplanan üst sınıra bölünerek [0, 1) aralığına çekilir. Sözlükte
+olmayan sorgu kelimeleri her iki skoru da düşürür (_score_scale).
 
 Kullanım:
     from backend.app.knowledge.retriever import knowledge_retriever
@@ -12,28 +49,117 @@ Kullanım:
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from collections.abc import Iterable
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import TypedDict
+from typing import NamedTuple, TypedDict
 
-import joblib
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from scipy import sparse
+from sklearn.feature_extraction.text import (
+    CountVectorizer,
+    HashingVectorizer,
+    TfidfVectorizer,
+)
 
+from backend.app.artifacts import current_artifact_dir, knowledge_cache_dir, publish
+from backend.app.config import (
+    BM25_B,
+    BM25_DELTA,
+    BM25_K1,
+    HASHING_N_FEATURES,
+    KNOWLEDGE_DENSE_DIMS,
+    KNOWLEDGE_DIR,
+    KNOWLEDGE_FUZZY,
+    KNOWLEDGE_INGEST_WORKERS,
+    KNOWLEDGE_REFIT_RATIO,
+    KNOWLEDGE_SCORER,
+    VECTORIZER_HASHING,
+)
+from backend.app.knowledge.dense import FUSION_DEPTH, DenseIndex, fuse
+from backend.app.knowledge.index import (
+    InvertedIndex,
+    term_counts,
+    tfidf_weights,
+    top_k as select_top_k,
+)
+from backend.app.knowledge.manifest import (
+    SourceEntry,
+    describe_source,
+    discover_sources,
+    read_manifest,
+    write_manifest,
+)
 from backend.app.knowledge.pptx_loader import (
     Chunk,
     load_and_chunk_docx,
     load_and_chunk_pptx,
 )
+from backend.app.knowledge.store import (
+    ChunkTable,
+    Vocabulary,
+    load_array,
+    save_array,
+)
+from backend.app.knowledge.trigram import TrigramIndex, content_words
+from backend.app.locks import FileLock
+from backend.app.nlp.turkish import (
+    NORMALIZER_VERSION,
+    STOP_WORDS,
+    content_ngrams,
+    normalize,
+)
 
 logger = logging.getLogger("ogrenci_destek.knowledge.retriever")
 
 # ── Sabitler ──────────────────────────────────────────────────────────
 _HERE = Path(__file__).resolve().parent
 _CACHE_DIR = _HERE / "cache"
-_CACHE_VECTORIZER = _CACHE_DIR / "tfidf_vectorizer.pkl"
-_CACHE_MATRIX = _CACHE_DIR / "tfidf_matrix.pkl"
-_CACHE_CHUNKS = _CACHE_DIR / "chunks.pkl"
+_MANIFEST_FILE = "manifest.json"
+_CACHE_ARRAYS: tuple[str, ...] = (
+    *InvertedIndex._NAMES,
+    *ChunkTable._NAMES,
+    "idf",
+    "doc_lengths",
+)
+_MANIFEST_VERSION = 2
+# Saklanacak önbellek sürümü sayısı (yayınlanan dahil)
+_CACHE_KEEP = 3
+# Aynı önbellek dizinine yazan süreçler bu kilitle sıraya girer
+_BUILD_LOCK_FILE = ".build.lock"
+
+# Bu boyutun altındaki toplam değişiklik süreç havuzu açmadan ayrıştırılır
+_PARALLEL_MIN_BYTES = 8 << 20
+
+# Chunker ayarları (değişirse önbellek yeniden oluşturulur)
+CHUNK_SIZE = 550
+CHUNK_OVERLAP = 80
+
+SCORERS: tuple[str, ...] = ("tfidf", "bm25", "bm25+")
+
+# Cevap eşiği (en iyi kelime dizini skoru), skorlayıcıya göre. Seed
+# belgelerinde SSS sorularının neredeyse tamamı eşiği geçer; bilgi
+# tabanının konusu dışındaki Teknik / Ödeme seed soruları her skorlayıcıda
+# eşiğin altında kalır (benchmark.py ve build.py bunu denetler).
+KNOWLEDGE_SCORE_THRESHOLDS: dict[str, float] = {
+    "tfidf": 0.22,
+    "bm25": 0.23,
+    "bm25+": 0.27,
+}
+
+# Kelime 1–2-gramları (durak kelimeler hariç) content_ngrams ile üretilir
+_VECTORIZER_PARAMS: dict = {
+    "max_features": 10_000,
+}
 
 # Proje kök dizini (dayı site/)
 _PROJECT_ROOT = _HERE.parents[2]
@@ -49,22 +175,147 @@ class RetrievalResult(TypedDict):
     score: float
     source: str
     slide_number: int | None
+    document: str
+
+
+# ── Sorgu durumu ──────────────────────────────────────────────────────
+class _IndexState(NamedTuple):
+    """
+    Bir sorgunun okuduğu tüm yapılar – birlikte değişir.
+
+    Retriever bu nesneyi tek bir referans olarak tutar; yeniden derleme
+    yeni bir durum üretip referansı değiştirir. Süren sorgular başladıkları
+    durumla (eski indeksle) tamamlanır, hiçbir an yarım güncellenmiş bir
+    indeks görülmez.
+    """
+    # Hashing modunda None (sütun id'si terimin özetinden hesaplanır)
+    vocabulary: Vocabulary | None
+    # Terim IDF'leri (TF-IDF veya BM25) ve BM25 chunk uzunlukları (float32)
+    idf: np.ndarray
+    doc_lengths: np.ndarray | None
+    avgdl: float
+    index: InvertedIndex
+    # Yazım düzeltme dizini (KNOWLEDGE_FUZZY kapalıysa None)
+    trigrams: TrigramIndex | None
+    # LSA izdüşümü (KNOWLEDGE_DENSE_DIMS = 0 ise None)
+    dense: DenseIndex | None
+    chunks: ChunkTable
+    # Kaynak belge adları ve her belgenin ilk satırı (kaynak gösterimi)
+    documents: list[str]
+    document_starts: np.ndarray
+    version: str
+    # Bu durumu üretmek (derlemek veya önbellekten açmak) için geçen süre
+    build_seconds: float
+    # Durumun açıldığı / kaydedildiği önbellek sürüm dizini
+    directory: Path | None = None
+
+    def document_of(self, row: int) -> str:
+        i = int(np.searchsorted(self.document_starts, row, side="right")) - 1
+        return self.documents[i] if 0 <= i < len(self.documents) else ""
 
 
 # ── Retriever sınıfı ─────────────────────────────────────────────────
 class KnowledgeRetriever:
-    """PPTX + DOCX bilgi tabanı üzerinde TF-IDF tabanlı arama."""
+    """
+    PPTX + DOCX bilgi tabanı üzerinde TF-IDF / BM25 tabanlı arama.
+
+    knowledge_dir verilirse altındaki tüm belgeler, verilmezse proje
+    kökündeki varsayılan sunum ve SSS belgesi işlenir.
+    """
 
-    def __init__(self) -> None:
-        self._vectorizer: TfidfVectorizer | None = None
-        self._matrix: np.ndarray | None = None  # sparse olabilir
-        self._chunks: list[Chunk] = []
-        self._ready = False
+    def __init__(
+        self,
+        scorer: str = "tfidf",
+        k1: float = 1.2,
+        b: float = 0.75,
+        delta: float = 1.0,
+        cache_dir: Path | None = None,
+        knowledge_dir: Path | None = None,
+        ingest_workers: int = 0,
+        hashing_features: int = 0,
+        fuzzy: bool = False,
+        dense_dims: int = 0,
+    ) -> None:
+        if scorer not in SCORERS:
+            raise ValueError(
+                f"Geçersiz skorlayıcı: {scorer!r} (beklenen: {', '.join(SCORERS)})"
+            )
+        self.scorer = scorer
+        self._k1 = k1
+        self._b = b
+        self._delta = delta if scorer == "bm25+" else 0.0
+        self._cache_dir = cache_dir or _CACHE_DIR
+        self._knowledge_dir = knowledge_dir
+        self._ingest_workers = ingest_workers
+        self._fuzzy = fuzzy
+        self._dense_dims = max(0, dense_dims)
+        # hashing_features > 0 ise sözlüksüz mod (durumsuz, eğitim gerektirmez)
+        self._hasher = (
+            HashingVectorizer(
+                analyzer=content_ngrams,
+                n_features=hashing_features,
+                alternate_sign=False,
+                norm=None,
+                dtype=np.float32,
+            )
+            if hashing_features > 0 else None
+        )
+        self._state: _IndexState | None = None
+        # Aynı anda tek derleme / yükleme; süreçler arası tek yazar için
+        # derleme ayrıca önbellek dizinindeki dosya kilidini alır
+        self._build_lock = threading.Lock()
 
     # ── Hazır mı? ─────────────────────────────────────────────────
     @property
     def is_ready(self) -> bool:
-        return self._ready
+        return self._state is not None
+
+    @property
+    def version(self) -> str | None:
+        """Yüklü bilgi tabanının içerik özet değeri (hazır değilse None)."""
+        state = self._state
+        return state.version if state else None
+
+    @property
+    def chunk_count(self) -> int:
+        state = self._state
+        return len(state.chunks) if state else 0
+
+    @property
+    def build_seconds(self) -> float | None:
+        """Etkin indeksin derlenme (veya önbellekten açılma) süresi."""
+        state = self._state
+        return state.build_seconds if state else None
+
+    @property
+    def cache_dir(self) -> Path:
+        """Önbellek kök dizini (CURRENT + sürüm dizinleri)."""
+        return self._cache_dir
+
+    def has_newer_cache(self) -> bool:
+        """
+        Önbellekte yüklü olandan farklı bir sürüm yayınlanmış mı?
+
+        Başka bir worker süreci derleyip CURRENT'ı çevirdiğinde True döner;
+        load() ile derleme yapmadan yeni sürüme geçilebilir.
+        """
+        current = current_artifact_dir(self._cache_dir)
+        state = self._state
+        return current is not None and (state is None or state.directory != current)
+
+    @property
+    def _bm25(self) -> bool:
+        return self.scorer != "tfidf"
+
+    def _scoring_params(self) -> dict:
+        return {"scorer": self.scorer, "k1": self._k1, "b": self._b, "delta": self._delta}
+
+    def _content_version(self, texts: Iterable[str]) -> str:
+        digest = hashlib.sha256(repr(sorted(self._scoring_params().items())).encode())
+        for text in texts:
+            digest.update(text.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()[:16]
 
     # ── Oluştur / yükle ───────────────────────────────────────────
     def build(
@@ -74,75 +325,394 @@ class KnowledgeRetriever:
         force: bool = False,
     ) -> None:
         """
-        Bilgi tabanını oluşturur veya önbellekten yükler.
+        Bilgi tabanını oluşturur, günceller veya önbellekten yükler.
 
         PPTX ve DOCX dosyalarından chunk'ları birleştirerek tek bir
-        TF-IDF vektör alanı oluşturur.
+        vektör alanı oluşturur. Değişen belgeler süreç havuzunda paralel
+        ayrıştırılır (KNOWLEDGE_INGEST_WORKERS). Önbellek manifestine göre:
+          - Kaynaklar ve ayarlar değişmediyse önbellek olduğu gibi yüklenir.
+          - Yalnızca bazı kaynaklar değiştiyse sadece onlar yeniden
+            çıkarılır; değişen satır oranı KNOWLEDGE_REFIT_RATIO altındaysa
+            vektörleştirici yeniden eğitilmez, satırlar değiştirilir/eklenir.
+
+        Derleme sürerken sorgular mevcut indeksle cevaplanır; yeni indeks
+        hazır olduğunda tek atamayla devreye girer. Hiçbir kaynaktan metin
+        çıkarılamazsa mevcut indeks korunur. Aynı önbellek dizinini kullanan
+        süreçler sırayla derler; sırası gelen süreç öncekinin yayınladığı
+        sürümü yeniden kullanır.
 
         Args:
-            pptx_path: PPTX dosya yolu. None ise varsayılan kullanılır.
-            docx_path: DOCX dosya yolu. None ise varsayılan kullanılır.
+            pptx_path: PPTX dosya yolu. Verilirse (veya docx_path) klasör
+                       yerine yalnızca bu iki dosya işlenir.
+            docx_path: DOCX dosya yolu.
             force:     True ise önbelleği yok sayar ve yeniden oluşturur.
         """
-        pptx_path = Path(pptx_path) if pptx_path else DEFAULT_PPTX_PATH
-        docx_path = Path(docx_path) if docx_path else DEFAULT_DOCX_PATH
+        with self._build_lock, FileLock(self._cache_dir / _BUILD_LOCK_FILE):
+            started = time.perf_counter()
+            state = self._build(pptx_path, docx_path, force, started)
+            if state is not None:
+                self._state = state
 
-        # Önbellek varsa ve force değilse yükle
-        if not force and self._cache_exists():
-            self._load_cache()
-            return
+    def _build(
+        self,
+        pptx_path: str | Path | None,
+        docx_path: str | Path | None,
+        force: bool,
+        started: float,
+    ) -> _IndexState | None:
+        cache_dir = _current_cache(self._cache_dir)
+        manifest = None if force else self._valid_manifest(cache_dir)
+        previous: dict[str, SourceEntry] = (
+            {e["path"]: e for e in manifest["sources"]} if manifest else {}
+        )
 
-        all_chunks: list[Chunk] = []
+        entries: list[SourceEntry] = []
+        for path, kind in self._sources(pptx_path, docx_path):
+            if path.exists():
+                entries.append(describe_source(path, kind, previous.get(str(path))))
+            else:
+                logger.warning("%s dosyası bulunamadı: %s", kind.upper(), path)
 
-        # ── PPTX'ten chunk'ları çıkar ─────────────────────────────
-        if pptx_path.exists():
-            logger.info("PPTX'ten bilgi tabanı oluşturuluyor: %s", pptx_path.name)
-            pptx_chunks = load_and_chunk_pptx(pptx_path)
-            all_chunks.extend(pptx_chunks)
-        else:
-            logger.warning("PPTX dosyası bulunamadı: %s", pptx_path)
+        reusable = {
+            e["path"] for e in entries
+            if e["path"] in previous and previous[e["path"]]["sha256"] == e["sha256"]
+        }
+
+        # ── Önbellekten yükle (değişmeyen kaynakları yeniden kullanmak için de)
+        cached: _IndexState | None = None
+        if manifest is not None and reusable:
+            cached = self._load_cache(cache_dir, manifest, started)
+            if cached is not None and len(reusable) == len(entries) == len(previous):
+                for e in entries:
+                    e["rows"] = previous[e["path"]]["rows"]
+                if entries != manifest["sources"]:
+                    # Yalnızca mtime değişti – içerik aynı. Diziler değişmediği
+                    # için manifest sürüm dizininde atomik olarak güncellenebilir.
+                    manifest["sources"] = entries
+                    write_manifest(cache_dir / _MANIFEST_FILE, manifest)
+                return cached
+        if cached is None:
+            reusable = set()
 
-        # ── DOCX'ten chunk'ları çıkar ─────────────────────────────
-        if docx_path.exists():
-            logger.info("DOCX'ten bilgi tabanı oluşturuluyor: %s", docx_path.name)
-            docx_chunks = load_and_chunk_docx(
-                docx_path, start_index=len(all_chunks),
+        # ── Değişen belgeleri ayrıştır (sonuçlar kaynak sırasıyla döner)
+        changed = [e for e in entries if e["path"] not in reusable]
+        extracted = dict(zip(
+            (e["path"] for e in changed), self._extract_all(changed),
+        ))
+
+        # ── Chunk'ları birleştir: değişmeyenler önbellekten, diğerleri dosyadan
+        all_chunks: list[Chunk] = []
+        # Değişmeyen kaynak: eski satır aralığı; değişen: normalleştirilmiş metinler
+        blocks: list[tuple[int, int] | list[str]] = []
+        changed_rows = sum(
+            e["rows"][1] - e["rows"][0]
+            for path, e in previous.items()
+            if path not in reusable
+        )
+        for entry in entries:
+            if entry["path"] in reusable:
+                start, end = previous[entry["path"]]["rows"]
+                part = cached.chunks.slice(start, end)  # type: ignore[union-attr]
+                blocks.append((start, end))
+            else:
+                part = extracted[entry["path"]]
+                blocks.append([normalize(c["text"]) for c in part])
+                changed_rows += len(part)
+            entry["rows"] = [len(all_chunks), len(all_chunks) + len(part)]
+            all_chunks.extend(part)
+
+        if not all_chunks:
+            logger.warning(
+                "Hiçbir kaynaktan metin çıkarılamadı – %s",
+                "mevcut bilgi tabanı korunuyor." if self._state else "Retriever devre dışı.",
             )
-            all_chunks.extend(docx_chunks)
+            return None
+
+        # Global sıra numaraları
+        all_chunks = [Chunk(**{**c, "chunk_index": i}) for i, c in enumerate(all_chunks)]
+        texts = [c["text"] for c in all_chunks]
+
+        stale_rows = (manifest or {}).get("stale_rows", 0) + changed_rows
+        incremental = cached is not None and stale_rows <= KNOWLEDGE_REFIT_RATIO * len(all_chunks)
+        if incremental:
+            assert cached is not None
+            matrix, doc_lengths, idf = self._replace_rows(cached, blocks)
+            vocabulary, avgdl = cached.vocabulary, cached.avgdl
+            trigrams = cached.trigrams
+            if trigrams is not None:
+                trigrams = trigrams.extend(
+                    w for block in blocks if isinstance(block, list)
+                    for text in block for w in content_words(text)
+                )
+            dense = cached.dense
+            if dense is not None:
+                dense = dense.replace_rows([
+                    block if isinstance(block, tuple)
+                    else self._dense_weights(vocabulary, idf, block)
+                    for block in blocks
+                    if isinstance(block, tuple) or block
+                ])
         else:
-            logger.warning("DOCX dosyası bulunamadı: %s", docx_path)
+            normalized = [normalize(t) for t in texts]
+            matrix, vocabulary, idf, doc_lengths, avgdl = self._fit(normalized)
+            trigrams = TrigramIndex.fit(
+                w for text in normalized for w in content_words(text)
+            ) if self._fuzzy else None
+            dense = DenseIndex.fit(
+                self._dense_weights(vocabulary, idf, normalized) if self._bm25 else matrix,
+                self._dense_dims,
+            ) if self._dense_dims else None
+            stale_rows = 0
 
-        if not all_chunks:
-            logger.warning("Hiçbir kaynaktan metin çıkarılamadı – Retriever devre dışı.")
-            return
-
-        self._chunks = all_chunks
-
-        # TF-IDF vektörleştirici
-        texts = [c["text"] for c in self._chunks]
-        self._vectorizer = TfidfVectorizer(
-            analyzer="word",
-            ngram_range=(1, 2),
-            max_features=10_000,
-            sublinear_tf=True,
-            stop_words=_TURKISH_STOP_WORDS,
+        documents, document_starts = self._document_names(entries)
+        state = _IndexState(
+            vocabulary=vocabulary,
+            idf=idf,
+            doc_lengths=doc_lengths,
+            avgdl=avgdl,
+            index=InvertedIndex.from_matrix(matrix),
+            trigrams=trigrams,
+            dense=dense,
+            chunks=ChunkTable.from_chunks(all_chunks),
+            documents=documents,
+            document_starts=document_starts,
+            version=self._content_version(texts),
+            build_seconds=0.0,
         )
-        self._matrix = self._vectorizer.fit_transform(texts)
-        self._ready = True
 
         # Önbelleğe kaydet
-        self._save_cache()
+        directory = self._save_cache(self._cache_dir, state, {
+            "settings": self._settings(),
+            "sources": entries,
+            "stale_rows": stale_rows,
+            "version": state.version,
+            "n_docs": len(all_chunks),
+            "avgdl": avgdl,
+        })
+        state = state._replace(
+            build_seconds=time.perf_counter() - started, directory=directory,
+        )
         logger.info(
-            "Bilgi tabanı hazır – %d parça (%d PPTX + %d DOCX), %d özellik.",
-            len(self._chunks),
-            sum(1 for c in self._chunks if c.get("source") == "pptx"),
-            sum(1 for c in self._chunks if c.get("source") == "docx"),
-            self._matrix.shape[1],
+            "Bilgi tabanı hazır (%s, %s) – %d belge, %d parça (%d PPTX + %d DOCX), "
+            "%d özellik, %.2f s.",
+            self.scorer,
+            "artımlı" if incremental else "tam",
+            len(entries),
+            len(state.chunks),
+            state.chunks.count("pptx"),
+            state.chunks.count("docx"),
+            int(np.count_nonzero(idf)),
+            state.build_seconds,
         )
+        return state
+
+    def sources(self) -> list[tuple[Path, str]]:
+        """Varsayılan yapılandırmada işlenen (dosya yolu, tür) listesi."""
+        return self._sources(None, None)
+
+    def _sources(
+        self, pptx_path: str | Path | None, docx_path: str | Path | None,
+    ) -> list[tuple[Path, str]]:
+        """İşlenecek (dosya yolu, tür) listesi – kararlı sırada."""
+        if pptx_path or docx_path or self._knowledge_dir is None:
+            return [
+                (Path(pptx_path) if pptx_path else DEFAULT_PPTX_PATH, "pptx"),
+                (Path(docx_path) if docx_path else DEFAULT_DOCX_PATH, "docx"),
+            ]
+        return discover_sources(self._knowledge_dir)
+
+    def _extract_all(self, entries: list[SourceEntry]) -> list[list[Chunk]]:
+        """
+        Belgeleri ayrıştırır; birden fazla (ve yeterince büyük) belge varsa
+        süreç havuzunda.
+
+        Sonuçlar bitiş sırasına değil girdi sırasına göre döner. Okunamayan
+        belge boş kabul edilir (dosya değişene kadar yeniden denenmez).
+        Worker başlatmak (spawn + import) birkaç saniye sürdüğünden küçük
+        toplamlar sırayla ayrıştırılır.
+        """
+        if not entries:
+            return []
+        logger.info("%d belge ayrıştırılıyor...", len(entries))
+        workers = min(self._ingest_workers, len(entries))
+        total_bytes = sum(e["size"] for e in entries)
+        if workers <= 1 or total_bytes < _PARALLEL_MIN_BYTES:
+            return [_extract_source_safe(e["path"], e["kind"]) for e in entries]
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            futures = [
+                pool.submit(_extract_source_safe, e["path"], e["kind"]) for e in entries
+            ]
+            return [future.result() for future in futures]
+
+    def _document_names(self, entries: list[SourceEntry]) -> tuple[list[str], np.ndarray]:
+        root = self._knowledge_dir
+        names = []
+        for e in entries:
+            path = Path(e["path"])
+            names.append(
+                str(path.relative_to(root)) if root and path.is_relative_to(root)
+                else path.name
+            )
+        return names, np.array([e["rows"][0] for e in entries], dtype=np.int64)
+
+    def _fit(
+        self, texts: list[str],
+    ) -> tuple[sparse.csr_matrix, Vocabulary | None, np.ndarray, np.ndarray | None, float]:
+        """
+        Vektörleştiriciyi tüm chunk'larla (normalleştirilmiş) eğitir.
+
+        Returns:
+            (ağırlık matrisi, sözlük, idf, BM25 chunk uzunlukları, ortalama uzunluk)
+        """
+        if self._hasher is not None:
+            return self._fit_hashed(texts)
+        if self._bm25:
+            # BM25: ham terim sayıları → önceden hesaplanmış posting ağırlıkları
+            vectorizer = CountVectorizer(
+                analyzer=content_ngrams,
+                **_VECTORIZER_PARAMS,
+                dtype=np.float32,
+            )
+            counts = vectorizer.fit_transform(texts)
+            idf, doc_lengths, avgdl = _bm25_stats(counts)
+            matrix = _bm25_weights(counts, idf, avgdl, self._k1, self._b, self._delta)
+        else:
+            vectorizer = TfidfVectorizer(
+                analyzer=content_ngrams,
+                **_VECTORIZER_PARAMS,
+                sublinear_tf=True,
+            )
+            matrix = vectorizer.fit_transform(texts)
+            idf = vectorizer.idf_.astype(np.float32)
+            doc_lengths, avgdl = None, 0.0
+        vocabulary = Vocabulary.from_terms(vectorizer.get_feature_names_out())
+        return matrix, vocabulary, idf, doc_lengths, avgdl
+
+    def _fit_hashed(
+        self, texts: list[str],
+    ) -> tuple[sparse.csr_matrix, None, np.ndarray, np.ndarray | None, float]:
+        """Hashing modu: sözlük yok, IDF sütun bazlı belge frekansından."""
+        counts = self._count(None, texts)
+        df = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = _hashed_idf(df, len(texts), self._bm25)
+        if self._bm25:
+            doc_lengths = np.asarray(counts.sum(axis=1), dtype=np.float32).ravel()
+            avgdl = float(doc_lengths.mean()) or 1.0
+            matrix = _bm25_weights(counts, idf, avgdl, self._k1, self._b, self._delta)
+            return matrix, None, idf, doc_lengths, avgdl
+        return tfidf_weights(idf, counts), None, idf, None, 0.0
+
+    def _replace_rows(
+        self, state: _IndexState, blocks: list[tuple[int, int] | list[str]],
+    ) -> tuple[sparse.csr_matrix, np.ndarray | None, np.ndarray]:
+        """
+        Mevcut sözlükle yalnızca yeni chunk'ları vektörleştirir.
+
+        blocks: değişmeyen kaynak için eski matristeki (başlangıç, bitiş)
+        aralığı, değişen kaynak için normalleştirilmiş yeni chunk metinleri.
+        IDF (ve BM25'te ortalama uzunluk) bir sonraki tam eğitime kadar sabit kalır;
+        hashing modunda yalnızca daha önce hiç görülmemiş sütunlar, yeni
+        chunk'lardaki belge frekansıyla IDF alır (mevcut satırlar etkilenmez).
+
+        Returns:
+            (ağırlık matrisi, BM25 chunk uzunlukları, idf)
+        """
+        old = state.index.to_matrix()
+        new_counts = {
+            i: self._count(state.vocabulary, block)
+            for i, block in enumerate(blocks)
+            if isinstance(block, list) and block
+        }
+        idf = state.idf
+        if self._hasher is not None and new_counts:
+            stacked = sparse.vstack(list(new_counts.values()), format="csr")
+            n_docs = sum(
+                block[1] - block[0] if isinstance(block, tuple) else len(block)
+                for block in blocks
+            )
+            df = np.bincount(stacked.indices, minlength=stacked.shape[1])
+            idf = np.where(idf == 0, _hashed_idf(df, n_docs, self._bm25), idf)
+
+        rows: list[sparse.spmatrix] = []
+        lengths: list[np.ndarray] = []
+        for i, block in enumerate(blocks):
+            if isinstance(block, tuple):
+                start, end = block
+                rows.append(old[start:end])
+                if state.doc_lengths is not None:
+                    lengths.append(np.asarray(state.doc_lengths[start:end]))
+                continue
+            if i not in new_counts:
+                continue
+            counts = new_counts[i]
+            if self._bm25:
+                lengths.append(np.asarray(counts.sum(axis=1), dtype=np.float32).ravel())
+                rows.append(_bm25_weights(
+                    counts, idf, state.avgdl, self._k1, self._b, self._delta,
+                ))
+            else:
+                rows.append(tfidf_weights(idf, counts))
+        doc_lengths = np.concatenate(lengths) if state.doc_lengths is not None else None
+        return sparse.vstack(rows, format="csr"), doc_lengths, idf
+
+    def load(self, cache_dir: Path | None = None) -> None:
+        """
+        Yalnızca önbellekten yükler; kaynak dosyalara bakmaz, derleme yapmaz.
+
+        Args:
+            cache_dir: Başka bir önbellek kök dizini (ör. yeni yayınlanan
+                       artefakt sürümü). Yükleme başarılı olursa sonraki
+                       derlemeler de bu dizini kullanır.
+
+        Raises:
+            RuntimeError: Önbellek yoksa, bozuksa veya ayarlar uyuşmuyorsa.
+                          Bu durumda mevcut indeks değişmez.
+        """
+        with self._build_lock:
+            started = time.perf_counter()
+            root = cache_dir or self._cache_dir
+            directory = _current_cache(root)
+            manifest = self._valid_manifest(directory)
+            state = (
+                self._load_cache(directory, manifest, started)
+                if manifest is not None else None
+            )
+            if state is None:
+                raise RuntimeError(
+                    f"Bilgi tabanı artefaktı yüklenemedi: {directory} "
+                    "(python -m backend.app.build ile derleyin)"
+                )
+            self._cache_dir = root
+            self._state = state
+
+    # ── Vektörleştirme ────────────────────────────────────────────
+    def _count(self, vocabulary: Vocabulary | None, texts: list[str]) -> sparse.csr_matrix:
+        """
+        Normalleştirilmiş metinlerin sözlükteki (hashing modunda özet
+        sütunlarındaki) terim sayıları.
+        """
+        if self._hasher is not None:
+            return sparse.csr_matrix(self._hasher.transform(texts))
+        assert vocabulary is not None
+        return term_counts(vocabulary, [content_ngrams(text) for text in texts])
+
+    def _dense_weights(
+        self, vocabulary: Vocabulary | None, idf: np.ndarray, texts: list[str],
+    ) -> sparse.csr_matrix:
+        """LSA girdisi: skorlayıcıdan bağımsız olarak sublinear TF-IDF + L2."""
+        return tfidf_weights(idf, self._count(vocabulary, texts))
 
     # ── Arama ─────────────────────────────────────────────────────
     def retrieve(
-        self, query: str, top_k: int = 3
+        self,
+        query: str,
+        top_k: int = 3,
+        normalized: bool = False,
+        fallback_below: float | None = None,
     ) -> list[RetrievalResult]:
         """
         Sorguya en yakın chunk'ları döndürür.
@@ -150,102 +720,357 @@ class KnowledgeRetriever:
         Args:
             query: Kullanıcı sorusu.
             top_k: Döndürülecek sonuç sayısı.
+            normalized: True ise sorgu zaten normalize() çıktısıdır.
+            fallback_below: En iyi skor bunun altındaysa (ve 3-gram dizini
+                varsa) hatalı yazılmış kelimeler düzeltilip yeniden aranır.
 
         Returns:
             RetrievalResult listesi (en yüksek skordan düşüğe sıralı).
         """
-        if not self._ready or self._vectorizer is None or self._matrix is None:
+        # Durum bir kez okunur: sorgu boyunca yeniden yükleme görünmez
+        state = self._state
+        if state is None:
             return []
 
-        query = query.strip()
+        if not normalized:
+            query = normalize(query)
         if not query:
             return []
 
-        # Sorguyu vektörleştir
-        query_vec = self._vectorizer.transform([query])
+        results = self._search(state, query, top_k)
+        best = max((r["score"] for r in results), default=0.0)
+        if fallback_below is None or state.trigrams is None or best >= fallback_below:
+            return results
 
-        # Kosinüs benzerliği (TF-IDF matris zaten L2-normalleştirilmiş)
-        scores = (self._matrix @ query_vec.T).toarray().flatten()
+        corrected = state.trigrams.correct(query)
+        if corrected == query:
+            return results
+        fuzzy = self._search(state, corrected, top_k)
+        if max((r["score"] for r in fuzzy), default=0.0) > best:
+            logger.debug("Yazım düzeltmesi: %r → %r", query, corrected)
+            return fuzzy
+        return results
 
-        if len(scores) == 0:
-            return []
+    def _search(self, state: _IndexState, query: str, top_k: int) -> list[RetrievalResult]:
+        """Normalleştirilmiş sorguyu kelime dizininde (ve varsa LSA'da) arar."""
+        # Sorguyu vektörleştir
+        counts = self._count(state.vocabulary, [query])
+        query_vec = counts if self._bm25 else tfidf_weights(state.idf, counts)
 
-        # En yüksek top_k indeks
-        top_indices = np.argsort(scores)[::-1][:top_k]
+        # TF-IDF: kosinüs benzerliği (matris zaten L2-normalleştirilmiş);
+        # BM25: sorgu terim sayıları × posting ağırlıkları.
+        # Yalnızca sorguyla terim paylaşan chunk'lar skorlanır.
+        candidates, scores = state.index.score(query_vec)
+        if len(scores):
+            scores = scores / self._score_scale(state, query, counts)
+
+        if state.dense is None:
+            ranked = select_top_k(candidates, scores, top_k)
+        else:
+            depth = max(top_k, FUSION_DEPTH)
+            dense_ids, dense_scores = state.dense.score(
+                tfidf_weights(state.idf, counts) if self._bm25 else query_vec,
+            )
+            ranked = fuse(
+                select_top_k(candidates, scores, depth),
+                select_top_k(dense_ids, dense_scores, depth),
+                top_k,
+            )
 
         results: list[RetrievalResult] = []
-        for i in top_indices:
-            score = float(scores[i])
-            if score <= 0:
-                continue
-            chunk = self._chunks[i]
+        for i, score in ranked:
+            chunk = state.chunks[i]
             results.append(
                 RetrievalResult(
                     chunk=chunk["text"],
                     score=round(score, 4),
                     source=chunk.get("source", "pptx"),
                     slide_number=chunk.get("slide_number"),
+                    document=state.document_of(i),
                 )
             )
 
         return results
 
+    def _score_scale(
+        self, state: _IndexState, query: str, counts: sparse.csr_matrix,
+    ) -> float:
+        """
+        Kelime dizini skorlarının bölüneceği değer; sözlükte olmayan sorgu
+        kelimeleri de hesaba katılır.
+
+        Bilinmeyen kelimeye derlemde hiç geçmeyen terimin IDF'i verilir.
+        Aksi halde "VPN nasıl kurabilirim?" yalnızca bilinen "kur" kelimesi
+        üzerinden skorlanır ve konu dışı soru eşiği geçer.
+          - tfidf: kosinüsün paydasındaki sorgu normu bilinmeyen kelimelerle
+                   büyütülür (bilinmeyen yoksa 1).
+          - bm25:  sorgunun her terimi için en yüksek IDF × tf → ∞ limiti.
+                   Sorgunun kendi IDF'leri kullanılmaz; tek terimli sorguda
+                   IDF sadeleşir, yaygın terim eşleşmesi de 1'e yaklaşırdı.
+        """
+        n_docs = len(state.chunks)
+        words = [t for t in content_ngrams(query) if " " not in t]
+        # Sözlükte (hashing modunda IDF'i sıfırdan büyük sütunda) olmayanlar
+        known = self._count(state.vocabulary, words) @ state.idf if words else np.empty(0)
+        unknown = int(np.count_nonzero(np.asarray(known) == 0))
+
+        if self._bm25:
+            max_idf = float(np.log1p((n_docs + 0.5) / 0.5))
+            terms = max(float(counts.sum()) + unknown, 1.0)
+            return terms * max_idf * (self._k1 + 1 + self._delta)
+
+        if not unknown:
+            return 1.0
+        # TfidfTransformer(smooth_idf=True): df = 0 için ln(1 + n) + 1
+        unseen_idf = float(np.log1p(n_docs)) + 1
+        weights = (1 + np.log(counts.data)) * state.idf[counts.indices]
+        known_sq = float(weights @ weights)
+        if known_sq == 0:
+            return 1.0
+        return float(np.sqrt((known_sq + unknown * unseen_idf**2) / known_sq))
+
     # ── Önbelleği yenile ──────────────────────────────────────────
     def refresh(
         self,
         pptx_path: str | Path | None = None,
         docx_path: str | Path | None = None,
     ) -> None:
-        """Önbelleği siler ve bilgi tabanını yeniden oluşturur."""
-        self._clear_cache()
-        self._ready = False
+        """
+        Bilgi tabanını önbelleği yok sayarak baştan oluşturur.
+
+        Eski indeks yeni indeks hazır olana kadar sorgulara cevap verir.
+        """
         self.build(pptx_path=pptx_path, docx_path=docx_path, force=True)
 
     # ── Önbellek işlemleri ────────────────────────────────────────
-    def _cache_exists(self) -> bool:
-        return (
-            _CACHE_VECTORIZER.exists()
-            and _CACHE_MATRIX.exists()
-            and _CACHE_CHUNKS.exists()
-        )
+    def _cache_arrays(self) -> tuple[str, ...]:
+        names = _CACHE_ARRAYS if self._hasher else (*_CACHE_ARRAYS, "vocabulary")
+        if self._fuzzy:
+            names = (*names, *TrigramIndex.NAMES)
+        return (*names, *DenseIndex.NAMES) if self._dense_dims else names
+
+    def _settings(self) -> dict:
+        """Önbelleği geçersiz kılan ayarlar (JSON karşılaştırmasına uygun)."""
+        stop_words = hashlib.sha256("\n".join(sorted(STOP_WORDS)).encode()).hexdigest()
+        settings = {
+            "manifest_version": _MANIFEST_VERSION,
+            "chunker": {"chunk_size": CHUNK_SIZE, "overlap": CHUNK_OVERLAP},
+            "vectorizer": {
+                **_VECTORIZER_PARAMS,
+                "stop_words": stop_words[:16],
+                "normalizer": NORMALIZER_VERSION,
+                "hashing": self._hasher.n_features if self._hasher else None,
+            },
+            "scoring": self._scoring_params(),
+            "fuzzy": self._fuzzy,
+            "dense_dims": self._dense_dims,
+        }
+        return json.loads(json.dumps(settings))
+
+    def _valid_manifest(self, cache_dir: Path) -> dict | None:
+        """Ayarları güncel olan manifest (önbellek eksikse None)."""
+        if not _cache_exists(cache_dir, self._cache_arrays()):
+            return None
+        manifest = read_manifest(cache_dir / _MANIFEST_FILE)
+        if manifest is None or manifest.get("settings") != self._settings():
+            logger.info("Önbellek ayarları değişmiş – bilgi tabanı yeniden oluşturulacak.")
+            return None
+        return manifest
 
-    def _save_cache(self) -> None:
-        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        joblib.dump(self._vectorizer, _CACHE_VECTORIZER)
-        joblib.dump(self._matrix, _CACHE_MATRIX)
-        joblib.dump(self._chunks, _CACHE_CHUNKS)
-        logger.info("Bilgi tabanı önbelleğe kaydedildi: %s", _CACHE_DIR)
+    def _save_cache(self, root: Path, state: _IndexState, manifest: dict) -> Path:
+        """
+        Dizileri yeni bir sürüm dizinine yazar ve CURRENT'ı ona çevirir.
+
+        Yayınlanmış sürüm dizinleri yerinde değiştirilmez: okuyucular (diğer
+        worker süreçleri, eski indeksle süren sorgular) CURRENT'ı okuyup tek
+        bir tutarlı dizini bellek eşlemeli açar. Yarım kalan kayıt .staging-*
+        dizininde kalır ve hiçbir zaman yayınlanmaz.
 
-    def _load_cache(self) -> None:
+        Returns:
+            Yayınlanan sürüm dizini.
+        """
+        root.mkdir(parents=True, exist_ok=True)
+        name = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S%fZ}-{state.version[:8]}"
+        staging = root / f".staging-{name}-{os.getpid()}"
+        staging.mkdir()
         try:
-            self._vectorizer = joblib.load(_CACHE_VECTORIZER)
-            self._matrix = joblib.load(_CACHE_MATRIX)
-            self._chunks = joblib.load(_CACHE_CHUNKS)
-            self._ready = True
-            logger.info(
-                "Bilgi tabanı önbellekten yüklendi – %d parça.", len(self._chunks)
+            state.index.save(staging)
+            state.chunks.save(staging)
+            if state.vocabulary is not None:
+                state.vocabulary.save(staging)
+            if state.trigrams is not None:
+                state.trigrams.save(staging)
+            if state.dense is not None:
+                state.dense.save(staging)
+            save_array(staging, "idf", state.idf)
+            save_array(
+                staging,
+                "doc_lengths",
+                state.doc_lengths if state.doc_lengths is not None
+                else np.empty(0, dtype=np.float32),
+            )
+            write_manifest(staging / _MANIFEST_FILE, manifest)
+            target = root / name
+            staging.rename(target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        publish(root, name)
+        logger.info("Bilgi tabanı önbelleğe kaydedildi: %s", target)
+        _prune_cache(root, _CACHE_KEEP)
+        return target
+
+    def _load_cache(
+        self, cache_dir: Path, manifest: dict, started: float,
+    ) -> _IndexState | None:
+        """Dizileri bellek eşlemeli açar (kopyalamadan, worker'lar arası paylaşımlı)."""
+        try:
+            documents, document_starts = self._document_names(manifest["sources"])
+            state = _IndexState(
+                vocabulary=None if self._hasher else Vocabulary.load(cache_dir),
+                idf=load_array(cache_dir, "idf"),
+                doc_lengths=load_array(cache_dir, "doc_lengths") if self._bm25 else None,
+                avgdl=float(manifest["avgdl"]),
+                index=InvertedIndex.load(cache_dir, n_docs=manifest["n_docs"]),
+                trigrams=TrigramIndex.load(cache_dir) if self._fuzzy else None,
+                dense=DenseIndex.load(cache_dir) if self._dense_dims else None,
+                chunks=ChunkTable.load(cache_dir),
+                documents=documents,
+                document_starts=document_starts,
+                version=manifest["version"],
+                build_seconds=time.perf_counter() - started,
+                directory=cache_dir,
             )
         except Exception:
             logger.exception("Önbellek yüklenemedi, yeniden oluşturulacak.")
-            self._ready = False
-
-    def _clear_cache(self) -> None:
-        for p in (_CACHE_VECTORIZER, _CACHE_MATRIX, _CACHE_CHUNKS):
-            if p.exists():
-                p.unlink()
-        logger.info("Önbellek temizlendi.")
-
-
-# ── Türkçe stop-words (temel) ────────────────────────────────────────
-_TURKISH_STOP_WORDS: list[str] = [
-    "bir", "ve", "bu", "da", "de", "ile", "için", "ama", "ancak",
-    "veya", "ya", "hem", "ne", "kadar", "gibi", "daha", "en",
-    "çok", "her", "bazı", "tüm", "bütün", "olan", "olarak",
-    "var", "yok", "ben", "sen", "biz", "siz", "onlar",
-    "mi", "mı", "mu", "mü", "dir", "dır", "dur", "dür",
-    "den", "dan", "ten", "tan", "nin", "nın", "nun", "nün",
-    "ın", "in", "un", "ün", "ler", "lar", "leri", "ları",
-]
+            return None
+        logger.info(
+            "Bilgi tabanı önbellekten yüklendi – %d parça.", len(state.chunks)
+        )
+        return state
+
+
+def _current_cache(root: Path) -> Path:
+    """CURRENT'ın gösterdiği önbellek sürümü (işaretçi yoksa kök dizinin kendisi)."""
+    return current_artifact_dir(root) or root
+
+
+def _prune_cache(root: Path, keep: int) -> None:
+    """
+    En yeni `keep` sürüm dışındakileri ve yarım kalmış kayıtları siler
+    (yayınlanan sürüm korunur). Derleme kilidi tutulurken çağrılır.
+
+    Eski sürümü bellek eşlemeli açmış süreçler etkilenmez: POSIX'te silinen
+    dosyanın eşlemesi kapatılana kadar geçerlidir.
+    """
+    for staging in root.glob(".staging-*"):
+        shutil.rmtree(staging, ignore_errors=True)
+    current = current_artifact_dir(root)
+    versions = sorted(
+        (p for p in root.iterdir()
+         if p.is_dir() and not p.name.startswith(".") and (p / _MANIFEST_FILE).exists()),
+        key=lambda p: p.name,
+        reverse=True,
+    )
+    for old in versions[max(keep, 1):]:
+        if old != current:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def _cache_exists(cache_dir: Path, names: tuple[str, ...]) -> bool:
+    return (cache_dir / _MANIFEST_FILE).exists() and all(
+        (cache_dir / f"{name}.npy").exists() for name in names
+    )
+
+
+# ── Kaynak çıkarma (süreç havuzunda da çalışır) ─────────────────────
+def _extract_source(path: Path, kind: str) -> list[Chunk]:
+    """Tek bir kaynak dosyadan chunk'ları çıkarır."""
+    if kind == "pptx":
+        return load_and_chunk_pptx(path, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP)
+    return load_and_chunk_docx(path)
+
+
+def _extract_source_safe(path: str, kind: str) -> list[Chunk]:
+    try:
+        return _extract_source(Path(path), kind)
+    except Exception:
+        logger.exception("Belge ayrıştırılamadı, atlanıyor: %s", path)
+        return []
+
+
+# ── BM25 ağırlıkları ──────────────────────────────────────────────────
+def _bm25_stats(counts: sparse.spmatrix) -> tuple[np.ndarray, np.ndarray, float]:
+    """
+    Ham terim sayılarından IDF ve chunk uzunluklarını hesaplar.
+
+    Returns:
+        (idf dizisi, chunk uzunlukları, ortalama uzunluk) – diziler float32.
+    """
+    counts = sparse.csr_matrix(counts, dtype=np.float32)
+    n_docs = counts.shape[0]
+    doc_lengths = np.asarray(counts.sum(axis=1), dtype=np.float32).ravel()
+    avgdl = float(doc_lengths.mean()) or 1.0
+
+    df = np.bincount(counts.indices, minlength=counts.shape[1]).astype(np.float32)
+    # Lucene biçimi: her zaman pozitif
+    idf = np.log1p((n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+    return idf, doc_lengths, avgdl
+
+
+def _hashed_idf(df: np.ndarray, n_docs: int, bm25: bool) -> np.ndarray:
+    """
+    Hashing modu IDF'i (yoğun float32). Hiç görülmemiş sütunlar 0 olur;
+    böylece yalnızca sorguda geçen terimler sorgu vektörüne (ve TF-IDF
+    normuna) girmez – sözlüklü moddaki "bilinmeyen terim atlanır" davranışı.
+    """
+    df = df.astype(np.float32)
+    if bm25:
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+    else:
+        # TfidfTransformer(smooth_idf=True) ile aynı formül
+        idf = np.log((1 + n_docs) / (1 + df)) + 1
+    idf[df == 0] = 0
+    return idf.astype(np.float32)
+
+
+def _bm25_weights(
+    counts: sparse.spmatrix,
+    idf: np.ndarray,
+    avgdl: float,
+    k1: float,
+    b: float,
+    delta: float,
+) -> sparse.csr_matrix:
+    """
+    Ham terim sayılarından BM25 / BM25+ posting ağırlıklarını hesaplar.
+
+    w(t, d) = idf(t) · (tf · (k1 + 1) / (tf + k1 · (1 − b + b · |d| / avgdl)) + delta)
+    """
+    counts = sparse.csr_matrix(counts, dtype=np.float32)
+    doc_lengths = np.asarray(counts.sum(axis=1), dtype=np.float32).ravel()
+    rows = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+    tf = counts.data
+    norm = k1 * (1 - b + b * doc_lengths[rows] / avgdl)
+    weights = idf[counts.indices] * (tf * (k1 + 1) / (tf + norm) + delta)
+
+    return sparse.csr_matrix(
+        (weights.astype(np.float32), counts.indices, counts.indptr),
+        shape=counts.shape,
+    )
+
 
 # ── Modül düzeyinde tekil örnek ───────────────────────────────────────
-knowledge_retriever = KnowledgeRetriever()
+knowledge_retriever = KnowledgeRetriever(
+    scorer=KNOWLEDGE_SCORER,
+    k1=BM25_K1,
+    b=BM25_B,
+    delta=BM25_DELTA,
+    cache_dir=knowledge_cache_dir(),
+    knowledge_dir=KNOWLEDGE_DIR,
+    ingest_workers=KNOWLEDGE_INGEST_WORKERS,
+    hashing_features=HASHING_N_FEATURES if VECTORIZER_HASHING else 0,
+    fuzzy=KNOWLEDGE_FUZZY,
+    dense_dims=KNOWLEDGE_DENSE_DIMS,
+)
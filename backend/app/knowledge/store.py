@@ -0,0 +1,154 @@
+"""
+Bilgi tabanı önbelleğinin düz (flat) ikili düzeni.
+
+Tüm yapılar .npy dizileri olarak saklanır ve np.load(mmap_mode="r") ile
+açılır; böylece aynı makinedeki uvicorn / çıkarım worker'ları diziler
+için işletim sisteminin sayfa önbelleğindeki tek kopyayı paylaşır ve
+yükleme süresi dosya boyutundan bağımsızdır.
+
+    ChunkTable  – chunk metinleri (tek UTF-8 blok + ofsetler) ve üst verisi.
+    Vocabulary  – sıralı terim dizisi; terim → sütun id'si ikili aramayla.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import numpy as np
+
+from backend.app.knowledge.pptx_loader import Chunk
+
+_NO_SLIDE = -1
+
+
+# ── Dizi kaydet / yükle ───────────────────────────────────────────────
+def save_array(directory: Path, name: str, array: np.ndarray) -> None:
+    """Diziyi <name>.npy olarak atomik yazar (geçici dosya + os.replace)."""
+    path = directory / f"{name}.npy"
+    tmp = directory / f"{name}.{os.getpid()}.tmp.npy"
+    np.save(tmp, np.ascontiguousarray(array), allow_pickle=False)
+    os.replace(tmp, path)
+
+
+def load_array(directory: Path, name: str, mmap: bool = True) -> np.ndarray:
+    """<name>.npy dosyasını salt okunur bellek eşlemeli olarak açar."""
+    return np.load(
+        directory / f"{name}.npy", mmap_mode="r" if mmap else None, allow_pickle=False,
+    )
+
+
+# ── Chunk tablosu ─────────────────────────────────────────────────────
+class ChunkTable:
+    """
+    Chunk listesinin sütun bazlı, salt okunur gösterimi.
+
+    Metinler tek bir UTF-8 bayt dizisinde birleştirilir; i. chunk
+    text[offsets[i]:offsets[i + 1]] aralığındadır. Chunk sözlükleri
+    yalnızca erişildiğinde oluşturulur.
+    """
+
+    _NAMES = ("chunk_text", "chunk_offsets", "chunk_slides", "chunk_sources")
+
+    def __init__(
+        self,
+        text: np.ndarray,
+        offsets: np.ndarray,
+        slides: np.ndarray,
+        sources: np.ndarray,
+    ) -> None:
+        self._text = text
+        self._offsets = offsets
+        self._slides = slides
+        self._sources = sources
+
+    @classmethod
+    def from_chunks(cls, chunks: list[Chunk]) -> ChunkTable:
+        encoded = [c["text"].encode("utf-8") for c in chunks]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        return cls(
+            text=np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            offsets=offsets,
+            slides=np.array(
+                [_NO_SLIDE if c["slide_number"] is None else c["slide_number"] for c in chunks],
+                dtype=np.int32,
+            ),
+            sources=np.array([c["source"] for c in chunks], dtype=str),
+        )
+
+    @classmethod
+    def empty(cls) -> ChunkTable:
+        return cls.from_chunks([])
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def text(self, i: int) -> str:
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return self._text[start:end].tobytes().decode("utf-8")
+
+    def __getitem__(self, i: int) -> Chunk:
+        slide = int(self._slides[i])
+        return Chunk(
+            text=self.text(i),
+            slide_number=None if slide == _NO_SLIDE else slide,
+            chunk_index=i,
+            source=str(self._sources[i]),
+        )
+
+    def __iter__(self) -> Iterator[Chunk]:
+        return (self[i] for i in range(len(self)))
+
+    def slice(self, start: int, end: int) -> list[Chunk]:
+        return [self[i] for i in range(start, end)]
+
+    def count(self, source: str) -> int:
+        return int(np.count_nonzero(self._sources == source))
+
+    def save(self, directory: Path) -> None:
+        for name, array in zip(
+            self._NAMES, (self._text, self._offsets, self._slides, self._sources),
+        ):
+            save_array(directory, name, array)
+
+    @classmethod
+    def load(cls, directory: Path) -> ChunkTable:
+        return cls(*(load_array(directory, name) for name in cls._NAMES))
+
+
+# ── Sözlük ────────────────────────────────────────────────────────────
+class Vocabulary:
+    """
+    Sıralı terim dizisi.
+
+    scikit-learn vektörleştiricileri özellikleri alfabetik sıralar; bu
+    yüzden bir terimin sıralı dizideki konumu doğrudan sütun id'sidir.
+    """
+
+    def __init__(self, terms: np.ndarray) -> None:
+        self.terms = terms
+
+    @classmethod
+    def from_terms(cls, terms: Iterable[str]) -> Vocabulary:
+        return cls(np.array(sorted(terms), dtype=str))
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def lookup(self, tokens: list[str]) -> np.ndarray:
+        """Terimlerin sütun id'leri; sözlükte olmayanlar atlanır."""
+        if not tokens or len(self.terms) == 0:
+            return np.empty(0, dtype=np.int64)
+        candidates = np.array(tokens, dtype=str)
+        positions = np.searchsorted(self.terms, candidates)
+        positions = np.minimum(positions, len(self.terms) - 1)
+        return positions[self.terms[positions] == candidates]
+
+    def save(self, directory: Path, name: str = "vocabulary") -> None:
+        save_array(directory, name, self.terms)
+
+    @classmethod
+    def load(cls, directory: Path, name: str = "vocabulary") -> Vocabulary:
+        return cls(load_array(directory, name))
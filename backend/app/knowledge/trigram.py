@@ -0,0 +1,162 @@
+"""
+Yazım hatasına dayanıklı arama: bilgi tabanı kelimelerinin karakter 3-gram dizini.
+
+Kelime dizini "puantj" veya "devamsızlk" gibi hatalı yazılmış kelimeleri
+hiç eşleştiremez (sözlükte yoktur). Bu dizin chunk metinlerindeki her
+farklı kelimeyi boşlukla sarıp 3-gramlarına ayırır (" puantaj " → " pu",
+"pua", ..., "aj "); tek harflik bir hata kelimenin 3-gramlarının yalnızca
+bir kısmını bozar. Sorgudaki bilinmeyen kelime, 3-gram kosinüs benzerliği
+en yüksek (ve MIN_SIMILARITY üstü) bilinen kelimeyle değiştirilir ve
+kelime dizini düzeltilmiş sorguyla yeniden aranır; skorlar aynı ölçekte
+kalır, cevap eşiği değişmez.
+
+Dizin yalnızca kelime dizininin en iyi skoru eşiğin altında kaldığında
+okunur (KnowledgeRetriever.retrieve). Adaylar kelimenin en nadir
+3-gramlarından toplanır (InvertedIndex.score_pruned), yaygın 3-gramların
+uzun postings listeleri taranmaz.
+
+Girdi normalleştirilmiş metindir (nlp/turkish.py): aksanlar katlanmış,
+ekler budanmıştır. Kelime listesi hashing modunda da tutulur.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+from backend.app.knowledge.index import InvertedIndex, term_counts, tfidf_weights
+from backend.app.knowledge.store import Vocabulary, load_array, save_array
+from backend.app.nlp.turkish import STOP_WORDS
+
+_PREFIX = "trigram_"
+
+# Bu uzunluktan kısa kelimeler düzeltilmez (3-gramları çok az, belirsiz)
+_MIN_WORD = 4
+# Kelimenin 3-gramlarının en az bu oranını paylaşmayan aday skorlanmaz
+MIN_SHARED = 0.4
+# Düzeltme için gereken en düşük 3-gram kosinüs benzerliği
+MIN_SIMILARITY = 0.5
+
+
+def char_trigrams(word: str) -> list[str]:
+    """Kelimenin boşlukla sarılmış 3-gramları."""
+    padded = f" {word} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def content_words(normalized: str) -> set[str]:
+    """Normalleştirilmiş metindeki düzeltmeye aday kelimeler."""
+    return {
+        token for token in normalized.split()
+        if len(token) >= _MIN_WORD and token not in STOP_WORDS
+    }
+
+
+class TrigramIndex:
+    """Kelime listesi + kelime × 3-gram TF-IDF postings listeleri (değişmez)."""
+
+    NAMES: tuple[str, ...] = (
+        *(_PREFIX + name for name in InvertedIndex._NAMES),
+        _PREFIX + "words",
+        _PREFIX + "vocabulary",
+        _PREFIX + "idf",
+    )
+
+    def __init__(
+        self,
+        words: Vocabulary,
+        vocabulary: Vocabulary,
+        idf: np.ndarray,
+        index: InvertedIndex,
+    ) -> None:
+        # words: sıralı kelimeler (satır id'si = sıra); vocabulary: 3-gramlar
+        self.words = words
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.index = index
+
+    # ── Derleme ───────────────────────────────────────────────────
+    @classmethod
+    def fit(cls, words: Iterable[str]) -> TrigramIndex:
+        """Kelime kümesinden dizini kurar (content_words çıktılarının birleşimi)."""
+        word_list = Vocabulary.from_terms(set(words))
+        grams = [char_trigrams(str(w)) for w in word_list.terms]
+        vocabulary = Vocabulary.from_terms({g for doc in grams for g in doc})
+        counts = term_counts(vocabulary, grams)
+        df = np.bincount(counts.indices, minlength=len(vocabulary))
+        # TfidfVectorizer(smooth_idf=True) ile aynı formül
+        idf = (np.log((1 + len(grams)) / (1 + df)) + 1).astype(np.float32)
+        index = InvertedIndex.from_matrix(tfidf_weights(idf, counts))
+        return cls(word_list, vocabulary, idf, index)
+
+    def extend(self, words: Iterable[str]) -> TrigramIndex:
+        """
+        Yeni kelimelerle genişletilmiş dizin (artımlı bilgi tabanı güncellemesi).
+
+        Kaldırılan belgelerin kelimeleri bir sonraki tam derlemeye kadar
+        listede kalır; eşleşecek chunk'ları olmadığından sonucu değiştirmez.
+        """
+        new = set(words).difference(self.words.terms.tolist())
+        if not new:
+            return self
+        return TrigramIndex.fit([*self.words.terms.tolist(), *new])
+
+    # ── Düzeltme ──────────────────────────────────────────────────
+    def correct(self, query: str) -> str:
+        """
+        Normalleştirilmiş sorgudaki bilinmeyen kelimeleri en yakın bilinen
+        kelimeyle değiştirir; düzeltilecek kelime yoksa sorguyu aynen döndürür.
+        """
+        tokens = query.split()
+        for i, token in enumerate(tokens):
+            if len(token) < _MIN_WORD or token in STOP_WORDS:
+                continue
+            if len(self.words.lookup([token])):
+                continue
+            match = self._nearest(token)
+            if match is not None:
+                tokens[i] = match
+        return " ".join(tokens)
+
+    def _nearest(self, token: str) -> str | None:
+        """MIN_SIMILARITY üstündeki en benzer kelime (yoksa None)."""
+        grams = char_trigrams(token)
+        counts = term_counts(self.vocabulary, [grams])
+        if counts.nnz == 0:
+            return None
+        # Sözlükte olmayan 3-gramlar da normu büyütür (hiç görülmemiş terim
+        # IDF'iyle); yoksa bilinen tek 3-gramı olan kelime yapay yüksek skor alır
+        known = (1 + np.log(counts.data)) * self.idf[counts.indices]
+        unseen = len(grams) - int(counts.data.sum())
+        max_idf = float(np.log(1 + len(self.words)) + 1)
+        norm = math.sqrt(float(known @ known) + unseen * max_idf ** 2)
+        candidates, scores = self.index.score_pruned(
+            tfidf_weights(self.idf, counts), math.ceil(MIN_SHARED * len(grams)),
+        )
+        if not len(scores):
+            return None
+        scores = scores * (float(np.sqrt(known @ known)) / norm)
+        best = int(np.argmax(scores))
+        if scores[best] < MIN_SIMILARITY:
+            return None
+        return str(self.words.terms[candidates[best]])
+
+    # ── Önbellek ──────────────────────────────────────────────────
+    def save(self, directory: Path) -> None:
+        self.index.save(directory, prefix=_PREFIX)
+        self.words.save(directory, name=_PREFIX + "words")
+        self.vocabulary.save(directory, name=_PREFIX + "vocabulary")
+        save_array(directory, _PREFIX + "idf", self.idf)
+
+    @classmethod
+    def load(cls, directory: Path) -> TrigramIndex:
+        words = Vocabulary.load(directory, name=_PREFIX + "words")
+        return cls(
+            words,
+            Vocabulary.load(directory, name=_PREFIX + "vocabulary"),
+            load_array(directory, _PREFIX + "idf"),
+            InvertedIndex.load(directory, n_docs=len(words), prefix=_PREFIX),
+        )
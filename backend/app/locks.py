@@ -0,0 +1,116 @@
+"""
+Süreçler arası dosya kilidi.
+
+uvicorn --workers N ile her worker süreci kendi modül düzeyindeki
+tekillerini (retriever, bilgi tabanı izleyicisi, geri bildirim eğiticisi)
+çalıştırır. Aynı dizine yazan veya aynı işi yapan arka plan görevleri bu
+kilitle aynı makinede tek sürece indirilir: kilidi alan süreç işi yapar,
+diğerleri bekler ya da o turu atlar. Süreç çökerse kilidi işletim sistemi
+bırakır; kilit dosyasının kendisi silinmez.
+
+Kullanım:
+    with FileLock(cache_dir / ".build.lock"):
+        ...                                  # tek yazar
+
+    leader = FileLock(cache_dir / ".watcher.lock")
+    if leader.acquire(blocking=False):
+        ...                                  # bu süreç lider
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# Windows'ta bekleyen kilit için yoklama aralığı (saniye)
+_POLL_SECONDS = 0.1
+
+
+class FileLock:
+    """
+    Özel (exclusive) dosya kilidi.
+
+    Aynı süreçteki iş parçacıkları arasında koruma sağlamaz; paylaşılan bir
+    örnek threading.Lock ile birlikte veya tek bir iş parçacığından
+    kullanılmalıdır.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fd: int | None = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Kilidi alır.
+
+        Returns:
+            False ise kilit başka bir süreçte (yalnızca blocking=False).
+        """
+        if self._fd is not None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            locked = _lock(fd, blocking)
+        except BaseException:
+            os.close(fd)
+            raise
+        if not locked:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
+        try:
+            _unlock(fd)
+        finally:
+            os.close(fd)
+
+    def __enter__(self) -> FileLock:
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.release()
+
+
+if os.name == "nt":
+    def _lock(fd: int, blocking: bool) -> bool:
+        # Dosyanın ilk baytı kilitlenir
+        os.lseek(fd, 0, os.SEEK_SET)
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                return True
+            except OSError:
+                if not blocking:
+                    return False
+                time.sleep(_POLL_SECONDS)
+
+    def _unlock(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    def _lock(fd: int, blocking: bool) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
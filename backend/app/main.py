@@ -16,12 +16,23 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
+from backend.app.artifacts import (
+    CLASSIFIER_SUBDIR,
+    KNOWLEDGE_SUBDIR,
+    require_current_artifact,
+)
+from backend.app.config import ARTIFACTS_LOAD_ONLY
 from backend.app.db import create_db_and_tables
+from backend.app.feedback import feedback_trainer
+from backend.app.inference import inference_executor
 from backend.app.knowledge.retriever import knowledge_retriever
+from backend.app.message_writer import message_writer
 from backend.app.nlp.classifier import classifier
+from backend.app.reloader import knowledge_reloader
 from backend.app.routes.admin import router as admin_router
 from backend.app.routes.chat import router as chat_router
 from backend.app.routes.knowledge import router as knowledge_router
+from backend.app.stats import rebuild_ticket_counters
 
 logger = logging.getLogger("ogrenci_destek")
 
@@ -34,21 +45,39 @@ async def lifespan(app: FastAPI):
     """Uygulama başlatılırken DB, NLP modeli ve bilgi tabanını hazırla."""
     logger.info("Veritabanı tabloları oluşturuluyor...")
     create_db_and_tables()
-
-    logger.info("NLP sınıflandırıcı eğitiliyor...")
-    classifier.train()
-
-    logger.info("Bilgi tabanı (PPTX) yükleniyor...")
-    try:
-        knowledge_retriever.build()
-    except Exception:
-        logger.exception("Bilgi tabanı yüklenemedi – RAG devre dışı.")
+    rebuild_ticket_counters()
+
+    if ARTIFACTS_LOAD_ONLY:
+        # Derleme yok: artefakt eksikse uygulama başlamaz
+        current = require_current_artifact()
+        logger.info("Artefaktlar yükleniyor (yalnızca yükleme): %s", current)
+        classifier.load(current / CLASSIFIER_SUBDIR)
+        knowledge_retriever.load(current / KNOWLEDGE_SUBDIR)
+    else:
+        logger.info("NLP sınıflandırıcı yükleniyor...")
+        classifier.load_or_train()
+
+        logger.info("Bilgi tabanı (PPTX) yükleniyor...")
+        try:
+            knowledge_retriever.build()
+        except Exception:
+            logger.exception("Bilgi tabanı yüklenemedi – RAG devre dışı.")
+
+    # Modeller diske kaydedildikten sonra worker süreçleri başlat
+    inference_executor.start()
+    message_writer.start()
+    knowledge_reloader.start()
+    feedback_trainer.start()
 
     logger.info("Uygulama hazır!")
 
     yield  # Uygulama çalışıyor
 
     logger.info("Uygulama kapatılıyor.")
+    knowledge_reloader.stop()
+    feedback_trainer.stop()
+    message_writer.stop()  # kuyruktaki mesajları yazar
+    inference_executor.shutdown()
 
 
 # ── FastAPI uygulaması ────────────────────────────────────────────────
@@ -0,0 +1,178 @@
+"""
+Sohbet mesajları için isteğe bağlı geciktirmeli (write-behind) yazıcı.
+
+MESSAGE_WRITE_BEHIND=true olduğunda endpoint'ler mesaj satırlarını
+sınırlı bir kuyruğa bırakır; arka plandaki yazıcı iş parçacığı bunları
+boyut (MESSAGE_BATCH_SIZE) veya süre (MESSAGE_FLUSH_INTERVAL_MS)
+dolduğunda tek işlemde (transaction) toplu olarak yazar. Böylece her
+istek için ayrı commit/fsync yapılmaz.
+
+Etiketlenmemiş kullanıcı mesajları yazmadan önce tek bir predict_many
+çağrısıyla etiketlenir; commit sonrası SSE aboneleri bilgilendirilir.
+Kuyruk doluysa submit() False döner ve çağıran senkron yazar.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session
+
+from backend.app.config import (
+    MESSAGE_BATCH_SIZE,
+    MESSAGE_FLUSH_INTERVAL_MS,
+    MESSAGE_QUEUE_SIZE,
+    MESSAGE_WRITE_BEHIND,
+)
+from backend.app.db import engine
+from backend.app.events import chat_events, message_payload
+from backend.app.inference import inference_executor
+from backend.app.models import Message
+
+logger = logging.getLogger("ogrenci_destek.message_writer")
+
+_MAX_ATTEMPTS = 3
+_QUEUE_PUT_TIMEOUT = 0.05
+
+
+class MessageWriter:
+    """Kuyruktaki mesajları toplu işlemlerle yazan arka plan yazıcısı."""
+
+    def __init__(
+        self,
+        enabled: bool,
+        batch_size: int,
+        flush_interval: float,
+        queue_size: int,
+    ) -> None:
+        self._enabled = enabled
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._queue: queue.Queue[list[Message]] = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._written = 0
+        self._batches = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._thread is not None
+
+    # ── Yaşam döngüsü ─────────────────────────────────────────────
+    def start(self) -> None:
+        if not self._enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="message-writer", daemon=True,
+        )
+        self._thread.start()
+        logger.info(
+            "Mesaj yazıcısı başlatıldı (toplu=%d, aralık=%.0f ms).",
+            self._batch_size, self._flush_interval * 1000,
+        )
+
+    def stop(self) -> None:
+        """Yeni kayıt almayı bırakır, kuyruğu boşaltır ve iş parçacığını durdurur."""
+        if self._thread is None:
+            return
+        thread, self._thread = self._thread, None
+        self._stop.set()
+        thread.join()
+        logger.info(
+            "Mesaj yazıcısı durduruldu – %d mesaj, %d toplu işlem.",
+            self._written, self._batches,
+        )
+
+    # ── Kuyruğa ekleme ────────────────────────────────────────────
+    def submit(self, messages: list[Message]) -> bool:
+        """
+        Mesajları yazma kuyruğuna ekler.
+
+        Returns:
+            True ise mesajlar arka planda yazılacak; False ise (mod kapalı
+            veya kuyruk dolu) çağıran taraf senkron yazmalıdır.
+        """
+        if self._thread is None:
+            return False
+        try:
+            self._queue.put(messages, timeout=_QUEUE_PUT_TIMEOUT)
+        except queue.Full:
+            logger.warning("Mesaj kuyruğu dolu – senkron yazılıyor.")
+            return False
+        return True
+
+    # ── Yazıcı döngüsü ────────────────────────────────────────────
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._collect()
+            if batch:
+                self._flush(batch)
+
+    def _collect(self) -> list[Message]:
+        """İlk kayıttan itibaren boyut veya süre dolana kadar biriktirir."""
+        try:
+            batch = list(self._queue.get(timeout=self._flush_interval))
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self._flush_interval
+        while len(batch) < self._batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 and not self._stop.is_set():
+                break
+            try:
+                batch.extend(self._queue.get(timeout=max(remaining, 0)))
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch: list[Message]) -> None:
+        # Etiketlenmemiş kullanıcı mesajlarını tek geçişte sınıflandır
+        untagged = [m for m in batch if m.role == "user" and m.category is None]
+        if untagged:
+            try:
+                predictions = inference_executor.predict_many([m.text for m in untagged])
+                for m, (category, confidence) in zip(untagged, predictions):
+                    m.category = category
+                    m.confidence = confidence
+            except Exception:
+                logger.exception("Mesajlar etiketlenemedi – etiketsiz yazılıyor.")
+
+        for attempt in range(1, _MAX_ATTEMPTS + 1):
+            try:
+                with Session(engine, expire_on_commit=False) as session:
+                    session.add_all(batch)
+                    session.flush()
+                    payloads: dict[str, list[dict]] = defaultdict(list)
+                    for m in batch:
+                        payloads[m.session_id].append(message_payload(m))
+                    session.commit()
+                break
+            except OperationalError:
+                if attempt == _MAX_ATTEMPTS:
+                    logger.exception("%d mesaj yazılamadı.", len(batch))
+                    return
+                # Geri alınan işlemde atanan id'ler başka worker'a geçmiş olabilir
+                for m in batch:
+                    m.id = None
+                time.sleep(0.1 * attempt)
+
+        self._written += len(batch)
+        self._batches += 1
+        for session_id, items in payloads.items():
+            chat_events.publish(session_id, items)
+
+
+# ── Modül düzeyinde tekil örnek ───────────────────────────────────────
+message_writer = MessageWriter(
+    enabled=MESSAGE_WRITE_BEHIND,
+    batch_size=MESSAGE_BATCH_SIZE,
+    flush_interval=MESSAGE_FLUSH_INTERVAL_MS / 1000,
+    queue_size=MESSAGE_QUEUE_SIZE,
+)
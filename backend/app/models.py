@@ -5,6 +5,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -23,9 +24,11 @@ class UserSession(SQLModel, table=True):
 # ── Mesaj ─────────────────────────────────────────────────────────────
 class Message(SQLModel, table=True):
     __tablename__ = "messages"
+    # Geçmiş sorguları session_id ile filtreler ve id ile sıralar
+    __table_args__ = (Index("ix_messages_session_id_id", "session_id", "id"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    session_id: str = Field(max_length=64, index=True)
+    session_id: str = Field(max_length=64)
     role: str = Field(max_length=10)  # "user" | "bot"
     text: str
     category: Optional[str] = Field(default=None, max_length=50)
@@ -36,6 +39,11 @@ class Message(SQLModel, table=True):
 # ── Destek talebi (Ticket) ───────────────────────────────────────────
 class Ticket(SQLModel, table=True):
     __tablename__ = "tickets"
+    # Admin listesi created_at, id ile sıralanır ve durum ile filtrelenir
+    __table_args__ = (
+        Index("ix_tickets_created_at_id", "created_at", "id"),
+        Index("ix_tickets_status_created_at_id", "status", "created_at", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     session_id: str = Field(max_length=64, index=True)
@@ -44,5 +52,16 @@ class Ticket(SQLModel, table=True):
     confidence: Optional[float] = Field(default=None)
     status: str = Field(default="Açık", max_length=20)  # Açık | İşlemde | Çözüldü
     admin_note: Optional[str] = Field(default=None)
+    # Admin'in onayladığı kategori – çözülen ticket'lar sınıflandırıcıya geri beslenir
+    confirmed_category: Optional[str] = Field(default=None, max_length=50)
     created_at: datetime = Field(default_factory=_now)
     updated_at: datetime = Field(default_factory=_now)
+
+
+# ── Ticket sayaçları (isteğe bağlı, STATS_COUNTERS) ──────────────────
+class TicketCounter(SQLModel, table=True):
+    __tablename__ = "ticket_counters"
+
+    kind: str = Field(primary_key=True, max_length=20)  # "status" | "category"
+    name: str = Field(primary_key=True, max_length=50)
+    count: int = Field(default=0)
@@ -2,59 +2,321 @@
 TF-IDF + LinearSVC tabanlı metin sınıflandırıcı.
 
 Başlangıç verisiyle eğitilir; güven skoru döndürür.
+Metinler önce Türkçe normalleştirmeden geçer (nlp/turkish.py); model
+kelime kökleri üzerinde çalışır.
+Eğitilmiş model diske kaydedilir ve seed verisi ile hiperparametrelerin
+özet değeri (hash) değişmediği sürece yeniden eğitilmeden yüklenir.
+
+Geri bildirim (FEEDBACK_TRAINING): admin'in kategorisini onayladığı
+çözülmüş ticket'lar eğitim kümesine eklenir. Bu durumda sınıflandırıcı
+SGDClassifier'a geçer; tam eğitim seyrek yapılır, arada yalnızca yeni
+etiketler partial_fit ile öğrenilir (bkz. backend/app/feedback.py).
+
+VECTORIZER_HASHING=true ise TfidfVectorizer yerine HashingVectorizer +
+TfidfTransformer kullanılır: kaydedilen modelde terim sözlüğü (dict)
+bulunmaz, IDF sabit boyutlu float32 dizidir ve partial_fit sırasında
+yeni kelimeler de özellik uzayına girer.
 """
 
 from __future__ import annotations
 
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+
+import joblib
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import (
+    HashingVectorizer,
+    TfidfTransformer,
+    TfidfVectorizer,
+)
+from sklearn.linear_model import SGDClassifier
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import LabelEncoder
 from sklearn.svm import LinearSVC
+from sklearn.utils.class_weight import compute_sample_weight
 
+from backend.app.artifacts import classifier_cache_dir
+from backend.app.config import HASHING_N_FEATURES, VECTORIZER_HASHING
 from backend.app.nlp.seed_data import CATEGORY_EXAMPLES, FAQ_TEMPLATES
+from backend.app.nlp.turkish import (
+    NORMALIZER_VERSION,
+    normalize,
+    turkish_casefold,
+    word_ngrams,
+)
+
+logger = logging.getLogger("ogrenci_destek.nlp.classifier")
+
+# ── Sabitler ──────────────────────────────────────────────────────────
+_HERE = Path(__file__).resolve().parent
+_CACHE_DIR = _HERE / "cache"
+_MODEL_FILE = "classifier.pkl"
+
+# Model hiperparametreleri – değişirse önbellek geçersiz olur.
+# Kelime 1–2-gramları normalleştirilmiş metinden word_ngrams ile üretilir.
+_TFIDF_PARAMS: dict = {
+    "max_features": 5000,
+    "sublinear_tf": True,
+}
+_SVC_PARAMS: dict = {
+    "C": 1.0,
+    "max_iter": 10000,
+    "class_weight": "balanced",
+}
+# Geri bildirimli model: hinge kaybı (LinearSVC ile aynı karar yüzeyi türü),
+# partial_fit destekli. Sınıf dengesi sample_weight ile verilir. alpha, seed
+# verisinde güven dağılımı LinearSVC'ye (CONFIDENCE_THRESHOLD) yakın olacak
+# şekilde seçildi.
+_SGD_PARAMS: dict = {
+    "loss": "hinge",
+    "alpha": 1e-2,
+    "max_iter": 50,
+    "random_state": 0,
+}
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _exact_key(text: str) -> str:
+    """Birebir eşleşme için metni sadeleştirir (küçük harf, noktalama yok)."""
+    return " ".join(_WORD_RE.findall(turkish_casefold(text)))
+
+
+def _vectorizer_steps() -> list[tuple[str, object]]:
+    """Metin → TF-IDF adımları: sözlüklü (varsayılan) veya sözlüksüz."""
+    if VECTORIZER_HASHING:
+        return [
+            ("hash", HashingVectorizer(
+                analyzer=word_ngrams,
+                n_features=HASHING_N_FEATURES,
+                alternate_sign=False,
+                norm=None,
+                dtype=np.float32,
+            )),
+            ("tfidf", TfidfTransformer(sublinear_tf=_TFIDF_PARAMS["sublinear_tf"])),
+        ]
+    return [("tfidf", TfidfVectorizer(analyzer=word_ngrams, **_TFIDF_PARAMS))]
+
+
+def _seed_examples() -> tuple[list[str], list[str]]:
+    """Normalleştirilmiş seed örnekleri ve kategorileri (aynı sırada)."""
+    texts: list[str] = []
+    labels: list[str] = []
+    for category, examples in CATEGORY_EXAMPLES.items():
+        for example in examples:
+            texts.append(normalize(example))
+            labels.append(category)
+    return texts, labels
 
 
 class QuestionClassifier:
     """Öğrenci sorularını kategorilere ayıran sınıflandırıcı."""
 
-    def __init__(self) -> None:
+    def __init__(self, cache_dir: Path | None = None) -> None:
+        self._cache_dir = cache_dir or _CACHE_DIR
+        # Yüklenen / kaydedilen model dosyası ve değişiklik zamanı (başka
+        # bir sürecin yazdığı daha yeni modeli algılamak için)
+        self._stamp: tuple[Path, int] | None = None
         self._label_encoder = LabelEncoder()
         self._pipeline: Pipeline | None = None
         self._is_trained = False
+        # Seed verisi + hiperparametre özeti (diskteki modelin uyumluluğu)
+        self._fingerprint: str | None = None
+        # Yüklü modelin sürümü: seed modelinde fingerprint, geri bildirimle
+        # eğitildiyse görülen etiketlere göre değişir (cevap önbelleği anahtarı)
+        self._version: str | None = None
+        # Geri bildirim durumu: etiket sayıları ve son görülen ticket
+        self._feedback: dict | None = None
+        # Seed örneklerinin birebir karşılıkları – model çalıştırmadan cevap
+        self._exact_examples: dict[str, str] = {
+            _exact_key(example): category
+            for category, examples in CATEGORY_EXAMPLES.items()
+            for example in examples
+        }
+
+    # ── Sürüm ─────────────────────────────────────────────────────────
+    @staticmethod
+    def compute_fingerprint() -> str:
+        """
+        Seed verisi ve hiperparametrelerden model özet değeri üretir.
+
+        Seed örnekleri veya model ayarları değiştiğinde farklı bir değer
+        döner; böylece diskteki eski model kullanılmaz.
+        """
+        payload = json.dumps(
+            {
+                "examples": CATEGORY_EXAMPLES,
+                "tfidf": _TFIDF_PARAMS,
+                "svc": _SVC_PARAMS,
+                "normalizer": NORMALIZER_VERSION,
+                "hashing": HASHING_N_FEATURES if VECTORIZER_HASHING else None,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @property
+    def version(self) -> str | None:
+        """Yüklü modelin özet değeri (eğitilmemişse None)."""
+        return self._version
+
+    @property
+    def cache_dir(self) -> Path:
+        return self._cache_dir
+
+    @property
+    def _model_path(self) -> Path:
+        return self._cache_dir / _MODEL_FILE
+
+    def has_newer_cache(self, cache_dir: Path | None = None) -> bool:
+        """
+        Diskte yüklü olandan farklı bir model var mı?
+
+        Başka bir süreç modeli yeniden eğitip kaydettiğinde (veya cache_dir
+        yeni yayınlanan bir artefakt sürümünü gösterdiğinde) True döner.
+        """
+        path = (cache_dir or self._cache_dir) / _MODEL_FILE
+        try:
+            return (path, path.stat().st_mtime_ns) != self._stamp
+        except FileNotFoundError:
+            return False
+
+    # ── Yükle / eğit ──────────────────────────────────────────────────
+    def load_or_train(self, force: bool = False) -> None:
+        """
+        Diskteki modeli yükler; yoksa veya güncel değilse eğitip kaydeder.
+
+        Uygulama başlangıcında her worker'ın modeli yeniden eğitmesini önler.
+
+        Args:
+            force: True ise kayıtlı model yok sayılır, yeniden eğitilir.
+        """
+        fingerprint = self.compute_fingerprint()
+        if not force and self._load_cache(fingerprint, self._model_path):
+            return
+
+        logger.info("Kayıtlı model bulunamadı veya güncel değil – eğitiliyor.")
+        self.train()
+        self._save_cache()
+
+    def load(self, cache_dir: Path | None = None) -> None:
+        """
+        Yalnızca diskteki modeli yükler; eğitim yapmaz.
+
+        Args:
+            cache_dir: Başka bir model dizini (ör. yeni yayınlanan artefakt
+                       sürümü). Yükleme başarılı olursa sonraki kayıtlar da
+                       bu dizini kullanır.
+
+        Raises:
+            RuntimeError: Model yoksa veya seed verisiyle uyuşmuyorsa.
+        """
+        directory = cache_dir or self._cache_dir
+        if not self._load_cache(self.compute_fingerprint(), directory / _MODEL_FILE):
+            raise RuntimeError(
+                f"Sınıflandırıcı artefaktı yüklenemedi: {directory / _MODEL_FILE} "
+                "(python -m backend.app.build ile derleyin)"
+            )
+        self._cache_dir = directory
 
     # ── Eğitim ────────────────────────────────────────────────────────
     def train(self) -> None:
         """Seed verisiyle modeli eğitir."""
-        texts: list[str] = []
-        labels: list[str] = []
-
-        for category, examples in CATEGORY_EXAMPLES.items():
-            for example in examples:
-                texts.append(example)
-                labels.append(category)
+        texts, labels = _seed_examples()
 
         encoded_labels = self._label_encoder.fit_transform(labels)
 
         self._pipeline = Pipeline([
-            ("tfidf", TfidfVectorizer(
-                analyzer="word",
-                ngram_range=(1, 2),
-                max_features=5000,
-                sublinear_tf=True,
-            )),
-            ("clf", LinearSVC(
-                C=1.0,
-                max_iter=10000,
-                class_weight="balanced",
-            )),
+            *_vectorizer_steps(),
+            ("clf", LinearSVC(**_SVC_PARAMS)),
         ])
 
         self._pipeline.fit(texts, encoded_labels)
+        self._fingerprint = self.compute_fingerprint()
+        self._version = self._fingerprint
+        self._feedback = None
+        self._is_trained = True
+
+    # ── Geri bildirimle eğitim ────────────────────────────────────────
+    @property
+    def feedback_state(self) -> dict | None:
+        """Modelin gördüğü etiketlerin özeti (yalnızca seed ile eğitildiyse None)."""
+        return self._feedback
+
+    def fit_feedback(self, texts: list[str], labels: list[str], state: dict) -> None:
+        """
+        Seed örnekleri + tüm etiketli ticket'larla baştan eğitir.
+
+        TF-IDF sözlüğü (ve IDF) de yeniden kurulur; sözlüklü modda
+        öğrencilerin gerçek ifadelerindeki yeni kelimeler ancak bu adımda
+        özelliklere girer.
+        """
+        seed_texts, seed_labels = _seed_examples()
+        y = self._label_encoder.transform(seed_labels + labels)
+        pipeline = Pipeline([
+            *_vectorizer_steps(),
+            ("clf", SGDClassifier(**_SGD_PARAMS)),
+        ])
+        pipeline.fit(
+            seed_texts + [normalize(t) for t in texts], y,
+            clf__sample_weight=compute_sample_weight("balanced", y),
+        )
+        self._install(pipeline, state)
+
+    def update_feedback(self, texts: list[str], labels: list[str], state: dict) -> None:
+        """
+        Yalnızca yeni etiketleri öğrenir (partial_fit).
+
+        Maliyet toplam etiket sayısıyla değil, yeni etiket sayısıyla büyür;
+        IDF sabit kalır (sözlüklü modda sözlük de; hashing modunda yeni
+        kelimeler boş sütunlarına düşer ve öğrenilir). Modelin seed
+        kategorilerini unutmaması için seed örnekleri her güncellemede
+        yeniden gösterilir. Güncelleme modelin bir kopyasında yapılır,
+        tahminler bu sırada eski modelle sürer.
+
+        Raises:
+            RuntimeError: Model henüz fit_feedback() ile eğitilmediyse.
+        """
+        if self._feedback is None or self._pipeline is None:
+            raise RuntimeError("Artımlı güncelleme için önce fit_feedback() gerekir.")
+        pipeline = copy.deepcopy(self._pipeline)
+        seed_texts, seed_labels = _seed_examples()
+        features = pipeline[:-1].transform(seed_texts + [normalize(t) for t in texts])
+        y = self._label_encoder.transform(seed_labels + labels)
+        pipeline.named_steps["clf"].partial_fit(
+            features, y,
+            classes=np.arange(len(self._label_encoder.classes_)),
+            sample_weight=compute_sample_weight("balanced", y),
+        )
+        self._install(pipeline, state)
+
+    def _install(self, pipeline: Pipeline, state: dict) -> None:
+        """
+        Yeni modeli tek atamayla devreye alır. Diske yazmaz: nereye
+        kaydedileceğine (önbellek veya yeni artefakt sürümü) çağıran
+        karar verir (save).
+        """
+        version = hashlib.sha256(
+            json.dumps(
+                {"seed": self.compute_fingerprint(), "feedback": state}, sort_keys=True,
+            ).encode("utf-8")
+        ).hexdigest()
+        # Önce model, sonra sürüm: yeni sürümün önbellek anahtarı altına
+        # eski modelin cevabı yazılmaz
+        self._pipeline = pipeline
+        self._feedback = state
+        self._version = version
         self._is_trained = True
 
     # ── Tahmin ────────────────────────────────────────────────────────
-    def predict(self, text: str) -> tuple[str, float]:
+    def predict(self, text: str, normalized: bool = False) -> tuple[str, float]:
         """
         Metin için kategori ve güven skoru döndürür.
 
@@ -65,28 +327,130 @@ class QuestionClassifier:
         Returns:
             (category, confidence) – confidence [0, 1] aralığında.
         """
+        return self.predict_many([text], normalized)[0]
+
+    def predict_many(
+        self, texts: list[str], normalized: bool = False,
+    ) -> list[tuple[str, float]]:
+        """
+        Birden fazla metni tek bir vektörel geçişte sınıflandırır.
+
+        predict() ile aynı güven hesabını kullanır; ancak decision_function,
+        sıralama ve etiket çözümleme tüm metinler için bir kez çalışır.
+
+        Args:
+            normalized: True ise metinler zaten normalize() çıktısıdır.
+
+        Returns:
+            Girdi sırasıyla (category, confidence) listesi.
+        """
+        if not texts:
+            return []
+
         if not self._is_trained or self._pipeline is None:
             self.train()
 
-        # decision_function → her sınıf için skor
-        decision_scores = self._pipeline.decision_function([text])[0]
+        # Model bir kez okunur: geri bildirim eğitimi onu değiştirebilir
+        pipeline = self._pipeline
+        assert pipeline is not None
+
+        if not normalized:
+            texts = [normalize(t) for t in texts]
+
+        # decision_function → (n_texts, n_classes) skor matrisi
+        decision_scores = np.asarray(pipeline.decision_function(texts))
 
-        if decision_scores.ndim == 0:
+        if decision_scores.ndim == 1:
             # İkili sınıf durumu (burada olmaz ama güvenlik için)
-            confidence = float(1 / (1 + np.exp(-abs(decision_scores))))
-            predicted_idx = int(decision_scores > 0)
+            confidences = 1 / (1 + np.exp(-np.abs(decision_scores)))
+            predicted_idx = (decision_scores > 0).astype(int)
         else:
-            predicted_idx = int(np.argmax(decision_scores))
+            predicted_idx = np.argmax(decision_scores, axis=1)
 
-            # Margin-based confidence: en yüksek ile ikinci en yüksek skor farkı
-            sorted_scores = np.sort(decision_scores)[::-1]
-            margin = sorted_scores[0] - sorted_scores[1]
+            # Margin-based confidence: her satırda en yüksek iki skorun farkı
+            top_two = np.partition(decision_scores, -2, axis=1)[:, -2:]
+            margins = top_two[:, 1] - top_two[:, 0]
 
             # Sigmoid ile [0, 1] aralığına ölçekle (k=2 ölçek faktörü)
-            confidence = float(1 / (1 + np.exp(-2.0 * margin)))
+            confidences = 1 / (1 + np.exp(-2.0 * margins))
 
-        category = self._label_encoder.inverse_transform([predicted_idx])[0]
-        return str(category), round(confidence, 4)
+        categories = self._label_encoder.inverse_transform(predicted_idx)
+        return [
+            (str(category), round(float(confidence), 4))
+            for category, confidence in zip(categories, confidences)
+        ]
+
+    # ── Önbellek işlemleri ────────────────────────────────────────────
+    def save(self, cache_dir: Path | None = None) -> Path:
+        """
+        Modeli atomik olarak diske yazar (eşzamanlı worker'lara karşı).
+
+        Args:
+            cache_dir: Verilirse model bu dizine yazılır (ör. yayınlanmadan
+                       önceki yeni artefakt sürümü); yüklü dizin değişmez.
+
+        Returns:
+            Yazılan model dosyası.
+        """
+        directory = cache_dir or self._cache_dir
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / _MODEL_FILE
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        joblib.dump(
+            {
+                "fingerprint": self._fingerprint,
+                "version": self._version,
+                "feedback": self._feedback,
+                "pipeline": self._pipeline,
+                "label_encoder": self._label_encoder,
+            },
+            tmp_path,
+        )
+        os.replace(tmp_path, path)
+        if directory == self._cache_dir:
+            self._stamp = (path, path.stat().st_mtime_ns)
+        logger.info("Sınıflandırıcı diske kaydedildi: %s", path)
+        return path
+
+    def _save_cache(self) -> None:
+        try:
+            self.save()
+        except OSError:
+            logger.exception("Sınıflandırıcı diske kaydedilemedi.")
+
+    def _load_cache(self, fingerprint: str, path: Path) -> bool:
+        """Özet değeri eşleşiyorsa kayıtlı modeli yükler."""
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+            payload = joblib.load(path)
+        except FileNotFoundError:
+            return False
+        except Exception:
+            logger.exception("Kayıtlı model okunamadı, yeniden eğitilecek.")
+            return False
+
+        if payload.get("fingerprint") != fingerprint:
+            return False
+
+        self._pipeline = payload["pipeline"]
+        self._label_encoder = payload["label_encoder"]
+        self._fingerprint = fingerprint
+        self._feedback = payload.get("feedback")
+        self._version = payload.get("version") or fingerprint
+        self._is_trained = True
+        self._stamp = (path, mtime_ns)
+        logger.info("Sınıflandırıcı diskten yüklendi (%s).", self._version[:12])
+        return True
+
+    # ── Birebir eşleşme ───────────────────────────────────────────────
+    def match_example(self, text: str) -> str | None:
+        """
+        Metin bir seed örneğiyle birebir aynıysa kategorisini döndürür.
+
+        Büyük/küçük harf ve noktalama farkları yok sayılır. Model
+        çalıştırılmadığı için tahmin maliyeti yoktur.
+        """
+        return self._exact_examples.get(_exact_key(text))
 
     # ── FAQ cevabı ────────────────────────────────────────────────────
     @staticmethod
@@ -101,4 +465,4 @@ class QuestionClassifier:
 
 
 # Modül düzeyinde tekil (singleton) sınıflandırıcı örneği
-classifier = QuestionClassifier()
+classifier = QuestionClassifier(cache_dir=classifier_cache_dir())
@@ -0,0 +1,97 @@
+"""
+Türkçe uyumlu çoklu anahtar kelime eşleştirici (Aho-Corasick).
+
+Tüm anahtar kelimeler bir kez derlenir; metin tek geçişte taranır.
+Böylece tarama maliyeti anahtar kelime sayısından bağımsızdır.
+
+Kullanım:
+    matcher = KeywordMatcher({"puantaj": ["puantaj", "puantaj formu"]})
+    matcher.find("PUANTAJ ne zaman?")  # → "puantaj"
+"""
+
+from __future__ import annotations
+
+from collections import deque
+
+from backend.app.nlp.turkish import turkish_casefold
+
+
+# ── Aho-Corasick otomatı ──────────────────────────────────────────────
+class KeywordMatcher:
+    """
+    Etiketli anahtar kelimeler için derlenmiş Aho-Corasick otomatı.
+
+    Etiketlerin öncelik sırası sözlükteki ekleme sırasıdır; bir metin
+    birden fazla etiketle eşleşirse ilk tanımlanan döner.
+    """
+
+    def __init__(self, keywords: dict[str, list[str]]) -> None:
+        self._labels: list[str] = list(keywords)
+        # Her durum için: geçişler, hata (fail) bağlantısı, çıktı etiketleri
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[frozenset[int]] = [frozenset()]
+
+        outputs: list[set[int]] = [set()]
+        for priority, label in enumerate(self._labels):
+            for keyword in keywords[label]:
+                state = 0
+                for ch in turkish_casefold(keyword):
+                    nxt = self._goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto[state][ch] = nxt
+                        self._goto.append({})
+                        self._fail.append(0)
+                        outputs.append(set())
+                    state = nxt
+                if state:
+                    outputs[state].add(priority)
+
+        # Hata bağlantılarını genişlik öncelikli (BFS) hesapla
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                outputs[nxt] |= outputs[self._fail[nxt]]
+
+        self._out = [frozenset(o) for o in outputs]
+
+    @property
+    def labels(self) -> list[str]:
+        return list(self._labels)
+
+    def _scan(self, text: str):
+        """Metni tek geçişte tarar, eşleşen etiket önceliklerini üretir."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in turkish_casefold(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                yield out[state]
+
+    def find(self, text: str) -> str | None:
+        """En yüksek öncelikli eşleşen etiketi döndürür (yoksa None)."""
+        best: int | None = None
+        for matched in self._scan(text):
+            candidate = min(matched)
+            if best is None or candidate < best:
+                best = candidate
+                if best == 0:
+                    break
+        return self._labels[best] if best is not None else None
+
+    def find_all(self, text: str) -> list[str]:
+        """Eşleşen tüm etiketleri öncelik sırasıyla döndürür."""
+        found: set[int] = set()
+        for matched in self._scan(text):
+            found |= matched
+        return [self._labels[i] for i in sorted(found)]
@@ -0,0 +1,155 @@
+"""
+Türkçe metin normalleştirme – sınıflandırıcı ve bilgi tabanının ortak katmanı.
+
+normalize() metni modellerin gördüğü kanonik biçime çevirir:
+  1. Türkçe küçük harf (I → ı, İ → i); şapkalı harfler sadeleşir (â → a).
+  2. Kelimelere ayırma (en az iki karakterli \\w dizileri, scikit-learn ile aynı).
+  3. Hafif ek budama: çoğul, iyelik, hâl ve soru/ek-fiil ekleri sondan
+     soyulur; kökte en az _MIN_STEM harf kalır. Sonda kalan yumuşamış
+     ğ, k'ye döner (devamsızlığı → devamsızlık).
+  4. Aksan katlama (ç→c, ğ→g, ı→i, ö→o, ş→s, ü→u): Türkçe klavyesi
+     olmayan öğrencinin "devamsizlik" yazımı da aynı köke düşer.
+
+Kelime → kök dönüşümü LRU önbellekte (STEM_CACHE_SIZE) tutulur; gerçek
+metinlerde farklı kelime sayısı sınırlı olduğundan 3–4. adımlar çoğu
+kelime için tek sözlük araması kadar ucuzdur.
+
+normalize() idempotenttir: sohbet akışı soruyu bir kez normalleştirir ve
+aynı metni iki modele de verir (normalized=True).
+
+Kullanım:
+    from backend.app.nlp.turkish import normalize
+    normalize("Devamsızlık sınırları nelerdir?")  # → "devamsizlik sinir neler"
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+from backend.app.config import STEM_CACHE_SIZE
+
+# Kurallar değişirse artırılır: kayıtlı modeller ve bilgi tabanı önbelleği
+# bu değeri özetlerine katar, eski normalleştirmeyle eğitilmiş olanlar kullanılmaz
+NORMALIZER_VERSION = 1
+
+# ── Türkçe büyük/küçük harf dönüşümü ──────────────────────────────────
+# str.lower() "I" → "i" ve "İ" → "i̇" (birleşik nokta) üretir; Türkçede
+# doğrusu "I" → "ı" ve "İ" → "i" olmalıdır.
+_TURKISH_UPPER_MAP = str.maketrans({"I": "ı", "İ": "i"})
+_CIRCUMFLEX_MAP = str.maketrans({"â": "a", "î": "i", "û": "u"})
+_DIACRITIC_MAP = str.maketrans({
+    "ç": "c", "ğ": "g", "ı": "i", "ö": "o", "ş": "s", "ü": "u",
+})
+
+_TOKEN_RE = re.compile(r"\b\w\w+\b")
+
+
+def turkish_casefold(text: str) -> str:
+    """Metni Türkçe kurallarına göre küçük harfe çevirir."""
+    return text.translate(_TURKISH_UPPER_MAP).lower()
+
+
+def fold_diacritics(text: str) -> str:
+    """Türkçe harfleri ASCII karşılıklarına indirger (küçük harf metinde)."""
+    return text.translate(_DIACRITIC_MAP)
+
+
+# ── Ek budama ─────────────────────────────────────────────────────────
+_MIN_STEM = 3
+_VOWELS = frozenset("aeıioöuü")
+
+# Ünlü uyumu varyantlarıyla çekim ekleri (yapım ekleri budanmaz)
+_TURKISH_SUFFIXES: tuple[str, ...] = (
+    # çoğul
+    "ler", "lar",
+    # iyelik
+    "ım", "im", "um", "üm", "ın", "in", "un", "ün",
+    "ımız", "imiz", "umuz", "ümüz", "ınız", "iniz", "unuz", "ünüz",
+    "ı", "i", "u", "ü", "sı", "si", "su", "sü", "ları", "leri",
+    # ilgi / belirtme / yönelme
+    "nın", "nin", "nun", "nün",
+    "yı", "yi", "yu", "yü", "nı", "ni", "nu", "nü",
+    "a", "e", "ya", "ye", "na", "ne",
+    # bulunma / ayrılma / vasıta / ilgi eki -ki
+    "da", "de", "ta", "te", "nda", "nde",
+    "dan", "den", "tan", "ten", "ndan", "nden",
+    "la", "le", "yla", "yle",
+    "daki", "deki", "taki", "teki", "ndaki", "ndeki",
+    # soru / ek-fiil
+    "mı", "mi", "mu", "mü",
+    "dır", "dir", "dur", "dür", "tır", "tir", "tur", "tür",
+)
+# Katlanmış metin de aynı sonucu versin diye eklerin ASCII biçimleri de
+# eklenir (normalize() idempotent); uzun ek önce denenir
+_SUFFIXES: tuple[str, ...] = tuple(sorted(
+    set(_TURKISH_SUFFIXES) | {fold_diacritics(s) for s in _TURKISH_SUFFIXES},
+    key=len,
+    reverse=True,
+))
+
+
+def stem(word: str) -> str:
+    """
+    Küçük harfli tek kelimenin ekleri soyulmuş kökü (aksanlar korunur).
+
+    Hiçbir ek kök _MIN_STEM harften kısa kalacak şekilde soyulmaz.
+    """
+    stripped = False
+    while True:
+        for suffix in _SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= _MIN_STEM:
+                word = word[: -len(suffix)]
+                stripped = True
+                break
+        else:
+            break
+    if len(word) > _MIN_STEM and (
+        word.endswith("ğ")
+        # ASCII yazımda (devamsizligi) yalnızca ek soyulduysa: ünlü + g
+        or (stripped and word.endswith("g") and word[-2] in _VOWELS)
+    ):
+        word = word[:-1] + "k"
+    return word
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def normalize_word(word: str) -> str:
+    """Küçük harfli kelime → aksanları katlanmış kök (önbellekli)."""
+    return fold_diacritics(stem(word))
+
+
+# ── Metin düzeyi ──────────────────────────────────────────────────────
+def normalize(text: str) -> str:
+    """Metni boşlukla ayrılmış, normalleştirilmiş köklere çevirir."""
+    folded = turkish_casefold(text).translate(_CIRCUMFLEX_MAP)
+    return " ".join(normalize_word(token) for token in _TOKEN_RE.findall(folded))
+
+
+# Anlamı taşımayan bağlaç, edat ve zamirler (normalleştirilmiş biçimde).
+# Bilgi tabanı aramasında kullanılır; sınıflandırıcı soru kelimelerini
+# ("ne", "nasıl") ayırt edici olduğu için korur.
+_STOP_WORDS: tuple[str, ...] = (
+    "bir", "ve", "bu", "şu", "da", "de", "ile", "için", "ama", "ancak",
+    "veya", "ya", "hem", "ne", "kadar", "gibi", "daha", "en",
+    "çok", "her", "bazı", "tüm", "bütün", "olan", "olarak",
+    "var", "yok", "ben", "sen", "biz", "siz", "onlar",
+    "mi", "mı", "mu", "mü", "ki", "ise",
+)
+STOP_WORDS: frozenset[str] = frozenset(normalize(" ".join(_STOP_WORDS)).split())
+
+
+def word_ngrams(normalized: str) -> list[str]:
+    """
+    Normalleştirilmiş metnin kelime 1–2-gramları (scikit-learn analyzer'ı).
+
+    Girdi normalize() çıktısıdır; yeniden normalleştirilmez.
+    """
+    tokens = normalized.split()
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def content_ngrams(normalized: str) -> list[str]:
+    """word_ngrams() ile aynı, ancak STOP_WORDS çıkarıldıktan sonra."""
+    tokens = [t for t in normalized.split() if t not in STOP_WORDS]
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
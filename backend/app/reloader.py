@@ -0,0 +1,217 @@
+"""
+Bilgi tabanının kesintisiz yeniden yüklenmesi (hot reload).
+
+Yeni indeks arka planda oluşturulur (veya yeni yayınlanan artefakttan
+açılır); bu sırada sorgular eski indeksle cevaplanmaya devam eder ve
+is_ready hiçbir an False olmaz. İndeks hazır olunca KnowledgeRetriever
+tek bir referans atamasıyla yeni duruma geçer; çıkarım havuzu varsa yeni
+worker'lar yüklendikten sonra havuzlar yer değiştirir. Cevap önbelleği
+bilgi tabanı sürümüyle anahtarlandığı için ayrıca temizlenmez.
+
+Tetikleyiciler:
+  - POST /api/admin/knowledge/reload
+  - KNOWLEDGE_WATCH_INTERVAL > 0 ise kaynak belgeleri (yalnızca-yükleme
+    modunda artifacts/CURRENT dosyasını) periyodik kontrol eden izleyici.
+
+Birden fazla worker süreciyle kaynakları yalnızca bir süreç (önbellek
+dizinindeki .watcher.lock kilidini alan lider) izler ve derler. Diğer
+süreçlerin izleyicileri önbellekte yeni bir sürüm yayınlandığını görünce
+derleme yapmadan onu açar; lider süreç kapanırsa kilidi bir sonraki turda
+başka bir süreç alır. Yalnızca-yükleme modunda derleme olmadığından her
+süreç CURRENT'ı kendisi izler.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from backend.app.artifacts import current_artifact_dir, knowledge_cache_dir, read_build_info
+from backend.app.config import ARTIFACTS_LOAD_ONLY, KNOWLEDGE_WATCH_INTERVAL
+from backend.app.inference import inference_executor
+from backend.app.knowledge.retriever import knowledge_retriever
+from backend.app.locks import FileLock
+
+logger = logging.getLogger("ogrenci_destek.reloader")
+
+_WATCHER_LOCK_FILE = ".watcher.lock"
+
+
+class KnowledgeReloader:
+    """Bilgi tabanını arka planda yeniden yükler ve kaynakları izler."""
+
+    def __init__(self, watch_interval: float) -> None:
+        self._watch_interval = watch_interval
+        # Aynı anda tek yeniden yükleme
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+        # Makine başına tek kaynak izleyicisi (yalnızca izleyici iş parçacığı kullanır)
+        self._leader = FileLock(knowledge_retriever.cache_dir / _WATCHER_LOCK_FILE)
+        self._last: dict | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    # ── Yaşam döngüsü (izleyici) ──────────────────────────────────
+    def start(self) -> None:
+        if self._watch_interval <= 0 or self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, name="knowledge-watcher", daemon=True,
+        )
+        self._watcher.start()
+        logger.info("Bilgi tabanı izleyicisi başlatıldı (%.1f s).", self._watch_interval)
+
+    def stop(self) -> None:
+        if self._watcher is None:
+            return
+        watcher, self._watcher = self._watcher, None
+        self._stop.set()
+        watcher.join()
+        self._leader.release()
+
+    # ── Yeniden yükleme ───────────────────────────────────────────
+    def trigger(self, force: bool = False, trigger: str = "admin") -> bool:
+        """
+        Yeniden yüklemeyi arka planda başlatır.
+
+        Returns:
+            False ise başka bir yeniden yükleme zaten sürüyor.
+        """
+        if self.running:
+            return False
+        threading.Thread(
+            target=self.reload,
+            kwargs={"force": force, "trigger": trigger},
+            name="knowledge-reload",
+            daemon=True,
+        ).start()
+        return True
+
+    def reload(
+        self, force: bool = False, trigger: str = "admin", build: bool = True,
+    ) -> dict:
+        """
+        Bilgi tabanını yeniden yükler ve sonucu döndürür (senkron).
+
+        ARTIFACTS_LOAD_ONLY modunda CURRENT'ın gösterdiği sürüm açılır;
+        aksi halde kaynaklardan artımlı (force=True ise tam) derlenir.
+        build=False ise derleme yapılmaz, önbellekte başka bir sürecin
+        yayınladığı sürüm açılır. Hata olursa eski indeks ve worker'lar
+        olduğu gibi kalır.
+        """
+        with self._lock:
+            previous = knowledge_retriever.version
+            started_at = datetime.now(timezone.utc)
+            started = time.perf_counter()
+            result: dict = {
+                "trigger": trigger,
+                "started_at": started_at.isoformat(),
+                "previous_version": previous,
+            }
+            try:
+                if ARTIFACTS_LOAD_ONLY:
+                    directory = knowledge_cache_dir()
+                    if directory is None:
+                        raise RuntimeError("Yayınlanmış artefakt yok (artifacts/CURRENT).")
+                    knowledge_retriever.load(directory)
+                elif not build:
+                    knowledge_retriever.load()
+                else:
+                    knowledge_retriever.build(force=force)
+                changed = knowledge_retriever.version != previous
+                if changed:
+                    inference_executor.restart()
+                result.update(changed=changed, error=None)
+            except Exception as exc:
+                logger.exception("Bilgi tabanı yeniden yüklenemedi – eski indeks kullanılıyor.")
+                result.update(changed=False, error=str(exc))
+
+            result.update(
+                version=knowledge_retriever.version,
+                duration_seconds=round(time.perf_counter() - started, 3),
+            )
+            self._last = result
+            logger.info(
+                "Bilgi tabanı yeniden yüklendi (%s): %s → %s, %.2f s.",
+                trigger, previous, result["version"], result["duration_seconds"],
+            )
+            return result
+
+    def status(self) -> dict:
+        """Etkin indeks ve son yeniden yükleme bilgisi."""
+        artifact = current_artifact_dir()
+        build_seconds = knowledge_retriever.build_seconds
+        return {
+            "ready": knowledge_retriever.is_ready,
+            "version": knowledge_retriever.version,
+            "scorer": knowledge_retriever.scorer,
+            "chunks": knowledge_retriever.chunk_count,
+            "build_seconds": round(build_seconds, 3) if build_seconds is not None else None,
+            "reloading": self.running,
+            "watching": self._watcher is not None,
+            "watch_leader": self._leader.held,
+            "last_reload": self._last,
+            "artifact": read_build_info(artifact) if artifact else None,
+        }
+
+    # ── İzleyici ──────────────────────────────────────────────────
+    def _signature(self) -> object:
+        """Değişikliği algılamak için ucuz özet (içerik okunmaz)."""
+        if ARTIFACTS_LOAD_ONLY:
+            return current_artifact_dir()
+        signature = []
+        for path, _kind in knowledge_retriever.sources():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            signature.append((str(path), stat.st_size, stat.st_mtime_ns))
+        return signature
+
+    def _is_leader(self) -> bool:
+        """Kaynakları bu süreç mi izliyor? Kilit boştaysa devralınır."""
+        if ARTIFACTS_LOAD_ONLY or self._leader.held:
+            return True
+        try:
+            acquired = self._leader.acquire(blocking=False)
+        except OSError:
+            logger.exception("İzleyici kilidi alınamadı: %s", self._leader.path)
+            return False
+        if acquired:
+            logger.info("Bilgi tabanı kaynaklarını bu süreç izliyor (pid=%d).", os.getpid())
+        return acquired
+
+    def _watch(self) -> None:
+        seen = self._signature()
+        pending = None
+        while not self._stop.wait(self._watch_interval):
+            if not ARTIFACTS_LOAD_ONLY and knowledge_retriever.has_newer_cache():
+                # Başka bir süreç derleyip yayınladı
+                self.reload(trigger="watcher", build=False)
+            if not self._is_leader():
+                continue
+            try:
+                signature = self._signature()
+            except OSError:
+                logger.exception("Bilgi tabanı kaynakları okunamadı.")
+                continue
+            if signature == seen:
+                pending = None
+                continue
+            if signature != pending:
+                # Dosya kopyalanıyor olabilir: bir tur daha sabit kalmasını bekle
+                pending = signature
+                continue
+            seen, pending = signature, None
+            self.reload(trigger="watcher")
+
+
+# ── Modül düzeyinde tekil örnek ───────────────────────────────────────
+knowledge_reloader = KnowledgeReloader(watch_interval=KNOWLEDGE_WATCH_INTERVAL)
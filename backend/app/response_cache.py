@@ -0,0 +1,110 @@
+"""
+Sohbet cevapları için süreli (TTL) LRU önbellek.
+
+Yalnızca deterministik cevaplar (özel konu, FAQ, bilgi tabanı) saklanır;
+ticket oluşturan cevaplar önbelleğe alınmaz. Önbellek, sınıflandırıcı
+veya bilgi tabanı sürümü değiştiğinde kendiliğinden boşaltılır.
+
+Kullanım:
+    from backend.app.response_cache import response_cache
+    cached = response_cache.get(text, version)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from backend.app.config import RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL
+from backend.app.nlp.turkish import turkish_casefold
+
+
+class CachedReply(NamedTuple):
+    reply_text: str
+    category: str
+    confidence: float
+
+
+def normalize_question(text: str) -> str:
+    """Önbellek anahtarı: Türkçe küçük harf + tek boşluk."""
+    return " ".join(turkish_casefold(text).split())
+
+
+class ResponseCache:
+    """Sürüm etiketli, iş parçacığı güvenli LRU + TTL önbellek."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: OrderedDict[str, tuple[float, CachedReply]] = OrderedDict()
+        self._version: tuple | None = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._maxsize > 0 and self._ttl > 0
+
+    def _sync_version(self, version: tuple) -> None:
+        """Sürüm değiştiyse tüm kayıtları düşürür (kilit altında çağrılır)."""
+        if version != self._version:
+            self._data.clear()
+            self._version = version
+
+    def get(self, text: str, version: tuple) -> CachedReply | None:
+        """Geçerli bir kayıt varsa döndürür, yoksa None."""
+        if not self.enabled:
+            return None
+        key = normalize_question(text)
+        now = time.monotonic()
+        with self._lock:
+            self._sync_version(version)
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, text: str, version: tuple, reply: CachedReply) -> None:
+        """Cevabı kaydeder; kapasite aşılırsa en eski kaydı çıkarır."""
+        if not self.enabled:
+            return
+        key = normalize_question(text)
+        expires_at = time.monotonic() + self._ttl
+        with self._lock:
+            self._sync_version(version)
+            self._data[key] = (expires_at, reply)
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> dict:
+        """İsabet oranı ve doluluk bilgisi."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._data),
+                "max_size": self._maxsize,
+                "ttl_seconds": self._ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# ── Modül düzeyinde tekil örnek ───────────────────────────────────────
+response_cache = ResponseCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
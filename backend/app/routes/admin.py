@@ -6,14 +6,20 @@ import secrets
 from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from pydantic import BaseModel, Field
-from sqlmodel import Session, func, select
+from sqlmodel import Session, and_, func, or_, select
 
 from backend.app.config import ADMIN_PASSWORD
 from backend.app.db import get_session
+from backend.app.events import chat_events, message_payload
+from backend.app.feedback import RESOLVED_STATUS, feedback_trainer
 from backend.app.models import Message, Ticket
+from backend.app.nlp.classifier import classifier
+from backend.app.reloader import knowledge_reloader
+from backend.app.response_cache import response_cache
+from backend.app.stats import bump_ticket_counters, read_ticket_stats
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 security = HTTPBasic()
@@ -43,49 +49,174 @@ def verify_admin(credentials: HTTPBasicCredentials = Depends(security)) -> str:
 class TicketUpdate(BaseModel):
     status: Optional[str] = Field(None, pattern=r"^(Açık|İşlemde|Çözüldü)$")
     admin_note: Optional[str] = Field(None, max_length=2000)
+    confirmed_category: Optional[str] = Field(None, max_length=50)
 
 
-class TicketOut(BaseModel):
+class TicketSummaryOut(BaseModel):
     id: int
     session_id: str
-    original_text: str
     predicted_category: Optional[str]
     confidence: Optional[float]
     status: str
-    admin_note: Optional[str]
     created_at: str
     updated_at: str
 
 
+class TicketListItem(TicketSummaryOut):
+    """Liste görünümü: uzun metin alanları yerine kısa önizleme."""
+    preview: str
+
+
+class TicketOut(TicketSummaryOut):
+    original_text: str
+    admin_note: Optional[str]
+    confirmed_category: Optional[str]
+
+
+def _iso(value: Optional[datetime]) -> str:
+    return value.isoformat() if value else ""
+
+
+def _ticket_out(t: Ticket) -> TicketOut:
+    return TicketOut(
+        id=t.id,  # type: ignore[arg-type]
+        session_id=t.session_id,
+        original_text=t.original_text,
+        predicted_category=t.predicted_category,
+        confidence=t.confidence,
+        status=t.status,
+        admin_note=t.admin_note,
+        confirmed_category=t.confirmed_category,
+        created_at=_iso(t.created_at),
+        updated_at=_iso(t.updated_at),
+    )
+
+
 # ── Ticket listeleme ──────────────────────────────────────────────────
+TICKETS_DEFAULT_LIMIT: int = 50
+TICKETS_MAX_LIMIT: int = 500
+TICKET_PREVIEW_LENGTH: int = 80
+
+
+def _parse_cursor(cursor: str) -> tuple[datetime, int]:
+    """'<created_at ISO>,<id>' biçimindeki sayfa imlecini çözer."""
+    try:
+        created_at, ticket_id = cursor.rsplit(",", 1)
+        return datetime.fromisoformat(created_at), int(ticket_id)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Geçersiz sayfa imleci.")
+
+
+def _ticket_page(
+    session: Session,
+    response: Response,
+    query,
+    status_filter: Optional[str],
+    cursor: Optional[str],
+    limit: int,
+) -> list:
+    """
+    Sorguya durum filtresi ve (created_at, id) keyset sayfalamasını uygular.
+
+    Devamı varsa bir sonraki sayfanın imlecini X-Next-Cursor başlığına yazar.
+    """
+    if status_filter:
+        query = query.where(Ticket.status == status_filter)
+    if cursor:
+        cursor_created_at, cursor_id = _parse_cursor(cursor)
+        query = query.where(
+            or_(
+                Ticket.created_at < cursor_created_at,
+                and_(Ticket.created_at == cursor_created_at, Ticket.id < cursor_id),  # type: ignore[operator]
+            )
+        )
+    query = query.order_by(
+        Ticket.created_at.desc(), Ticket.id.desc(),  # type: ignore[union-attr]
+    ).limit(limit + 1)
+
+    rows = session.exec(query).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = f"{last.created_at.isoformat()},{last.id}"
+    return list(rows)
+
+
 @router.get("/tickets", response_model=list[TicketOut])
 def list_tickets(
+    response: Response,
     status_filter: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(TICKETS_DEFAULT_LIMIT, ge=1, le=TICKETS_MAX_LIMIT),
     _admin: str = Depends(verify_admin),
     session: Session = Depends(get_session),
 ) -> list[TicketOut]:
-    """Tüm destek taleplerini listeler. İsteğe bağlı durum filtresi."""
-    query = select(Ticket).order_by(Ticket.created_at.desc())  # type: ignore[union-attr]
-    if status_filter:
-        query = query.where(Ticket.status == status_filter)
+    """
+    Destek taleplerini en yeniden eskiye, (created_at, id) üzerinden
+    keyset sayfalama ile listeler. İsteğe bağlı durum filtresi.
+
+    - cursor: önceki sayfanın X-Next-Cursor başlığındaki değer.
+
+    Devamı varsa bir sonraki sayfanın imleci X-Next-Cursor başlığında döner.
+    """
+    rows = _ticket_page(session, response, select(Ticket), status_filter, cursor, limit)
+    return [_ticket_out(t) for t in rows]
+
 
-    tickets = session.exec(query).all()
+@router.get("/tickets/summary", response_model=list[TicketListItem])
+def list_ticket_summaries(
+    response: Response,
+    status_filter: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(TICKETS_DEFAULT_LIMIT, ge=1, le=TICKETS_MAX_LIMIT),
+    _admin: str = Depends(verify_admin),
+    session: Session = Depends(get_session),
+) -> list[TicketListItem]:
+    """
+    /tickets ile aynı sıralama ve sayfalama; original_text ve admin_note
+    yerine kısa önizleme (preview) döner. Liste görünümü için veri
+    miktarını azaltır; yalnızca gereken sütunlar okunur.
+    """
+    query = select(
+        Ticket.id,
+        Ticket.session_id,
+        Ticket.predicted_category,
+        Ticket.confidence,
+        Ticket.status,
+        Ticket.created_at,
+        Ticket.updated_at,
+        func.substr(Ticket.original_text, 1, TICKET_PREVIEW_LENGTH).label("preview"),
+    )
+    rows = _ticket_page(session, response, query, status_filter, cursor, limit)
     return [
-        TicketOut(
-            id=t.id,  # type: ignore[arg-type]
-            session_id=t.session_id,
-            original_text=t.original_text,
-            predicted_category=t.predicted_category,
-            confidence=t.confidence,
-            status=t.status,
-            admin_note=t.admin_note,
-            created_at=t.created_at.isoformat() if t.created_at else "",
-            updated_at=t.updated_at.isoformat() if t.updated_at else "",
+        TicketListItem(
+            id=r.id,
+            session_id=r.session_id,
+            predicted_category=r.predicted_category,
+            confidence=r.confidence,
+            status=r.status,
+            created_at=_iso(r.created_at),
+            updated_at=_iso(r.updated_at),
+            preview=r.preview,
         )
-        for t in tickets
+        for r in rows
     ]
 
 
+# ── Ticket detayı ────────────────────────────────────────────────────
+@router.get("/tickets/{ticket_id}", response_model=TicketOut)
+def get_ticket(
+    ticket_id: int,
+    _admin: str = Depends(verify_admin),
+    session: Session = Depends(get_session),
+) -> TicketOut:
+    """Tek bir destek talebini tüm alanlarıyla döndürür."""
+    ticket = session.get(Ticket, ticket_id)
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Talep bulunamadı.")
+    return _ticket_out(ticket)
+
+
 # ── Ticket güncelleme ────────────────────────────────────────────────
 @router.patch("/tickets/{ticket_id}", response_model=TicketOut)
 def update_ticket(
@@ -98,21 +229,38 @@ def update_ticket(
 
     Durum veya not değiştiğinde ilgili oturuma bot mesajı gönderir,
     böylece öğrenci sohbet ekranında güncellemeyi anında görür.
+    Çözülen ve kategorisi onaylanan talep sınıflandırıcıya geri beslenir.
     """
     ticket = session.get(Ticket, ticket_id)
     if not ticket:
         raise HTTPException(status_code=404, detail="Talep bulunamadı.")
+    if body.confirmed_category is not None and body.confirmed_category not in classifier.categories:
+        raise HTTPException(status_code=422, detail="Geçersiz kategori.")
 
     status_changed = body.status is not None and body.status != ticket.status
+    old_status = ticket.status
     note_changed = body.admin_note is not None and body.admin_note != ticket.admin_note
+    category_changed = (
+        body.confirmed_category is not None
+        and body.confirmed_category != ticket.confirmed_category
+    )
 
     if body.status is not None:
         ticket.status = body.status
     if body.admin_note is not None:
         ticket.admin_note = body.admin_note
+    if body.confirmed_category is not None:
+        ticket.confirmed_category = body.confirmed_category
+    labelled = (
+        (status_changed or category_changed)
+        and ticket.status == RESOLVED_STATUS
+        and ticket.confirmed_category is not None
+    )
 
     ticket.updated_at = datetime.now(timezone.utc)
     session.add(ticket)
+    if status_changed:
+        bump_ticket_counters(session, status=(old_status, ticket.status))
 
     # ── Öğrenciye bildirim mesajı oluştur ─────────────────────────
     if status_changed or note_changed:
@@ -130,21 +278,18 @@ def update_ticket(
             category=ticket.predicted_category,
         )
         session.add(bot_msg)
+        session.flush()
+        payloads = [message_payload(bot_msg)]
+    else:
+        payloads = []
 
     session.commit()
     session.refresh(ticket)
+    chat_events.publish(ticket.session_id, payloads)
+    if labelled:
+        feedback_trainer.notify()
 
-    return TicketOut(
-        id=ticket.id,  # type: ignore[arg-type]
-        session_id=ticket.session_id,
-        original_text=ticket.original_text,
-        predicted_category=ticket.predicted_category,
-        confidence=ticket.confidence,
-        status=ticket.status,
-        admin_note=ticket.admin_note,
-        created_at=ticket.created_at.isoformat() if ticket.created_at else "",
-        updated_at=ticket.updated_at.isoformat() if ticket.updated_at else "",
-    )
+    return _ticket_out(ticket)
 
 
 # ── İstatistikler ────────────────────────────────────────────────────
@@ -153,26 +298,73 @@ def get_stats(
     _admin: str = Depends(verify_admin),
     session: Session = Depends(get_session),
 ) -> dict:
-    """Basit istatistikler: toplam talep, durum dağılımı."""
-    total = session.exec(select(func.count(Ticket.id))).one()
-
-    status_counts = {}
-    for s in ("Açık", "İşlemde", "Çözüldü"):
-        count = session.exec(
-            select(func.count(Ticket.id)).where(Ticket.status == s)
-        ).one()
-        status_counts[s] = count
-
-    category_counts = {}
-    rows = session.exec(
-        select(Ticket.predicted_category, func.count(Ticket.id))
-        .group_by(Ticket.predicted_category)
-    ).all()
-    for cat, cnt in rows:
-        category_counts[cat or "Bilinmiyor"] = cnt
-
-    return {
-        "total_tickets": total,
-        "by_status": status_counts,
-        "by_category": category_counts,
-    }
+    """Basit istatistikler: toplam talep, durum ve kategori dağılımı."""
+    return read_ticket_stats(session)
+
+
+# ── Cevap önbelleği ──────────────────────────────────────────────────
+@router.get("/cache")
+def get_cache_stats(_admin: str = Depends(verify_admin)) -> dict:
+    """Cevap önbelleğinin doluluk ve isabet oranı bilgisi."""
+    return response_cache.stats()
+
+
+@router.delete("/cache")
+def clear_cache(_admin: str = Depends(verify_admin)) -> dict:
+    """Cevap önbelleğini boşaltır."""
+    response_cache.clear()
+    return response_cache.stats()
+
+
+# ── Geri bildirimle eğitim ───────────────────────────────────────────
+@router.get("/feedback")
+def get_feedback_status(_admin: str = Depends(verify_admin)) -> dict:
+    """Sınıflandırıcı sürümü, etiket sayıları ve son eğitim bilgisi."""
+    return feedback_trainer.status()
+
+
+@router.post("/feedback/retrain")
+def retrain_classifier(
+    full: bool = False,
+    _admin: str = Depends(verify_admin),
+) -> dict:
+    """Onaylı etiketlerle sınıflandırıcıyı hemen günceller.
+
+    full=true ise oran beklenmeden seed + tüm etiketlerle baştan eğitilir.
+    Eğitim sırasında tahminler mevcut modelle devam eder.
+    FEEDBACK_TRAINING kapalıysa 409 döner.
+    """
+    if not feedback_trainer.enabled:
+        raise HTTPException(
+            status_code=409, detail="Geri bildirimle eğitim kapalı (FEEDBACK_TRAINING)."
+        )
+    feedback_trainer.retrain(full=full, trigger="admin")
+    return feedback_trainer.status()
+
+
+# ── Bilgi tabanı ─────────────────────────────────────────────────────
+@router.get("/knowledge")
+def get_knowledge_status(_admin: str = Depends(verify_admin)) -> dict:
+    """Etkin bilgi tabanı sürümü, derleme süresi ve son yeniden yükleme."""
+    return knowledge_reloader.status()
+
+
+@router.post("/knowledge/reload", status_code=status.HTTP_202_ACCEPTED)
+def reload_knowledge(
+    response: Response,
+    force: bool = False,
+    wait: bool = False,
+    _admin: str = Depends(verify_admin),
+) -> dict:
+    """Bilgi tabanını kesintisiz yeniden yükler.
+
+    Yeni indeks arka planda hazırlanır; o sırada sorgular eski indeksle
+    cevaplanır. wait=true ise yükleme bitene kadar beklenir.
+    force=true önbelleği yok sayarak tam derleme yapar.
+    """
+    if wait:
+        knowledge_reloader.reload(force=force, trigger="admin")
+        response.status_code = status.HTTP_200_OK
+    elif not knowledge_reloader.trigger(force=force, trigger="admin"):
+        raise HTTPException(status_code=409, detail="Yeniden yükleme zaten sürüyor.")
+    return knowledge_reloader.status()
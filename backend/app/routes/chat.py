@@ -2,25 +2,47 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from typing import Optional
+from pathlib import Path
+from typing import NamedTuple, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlmodel import Session, select
 
-from backend.app.config import CONFIDENCE_THRESHOLD
-from backend.app.db import get_session
-from backend.app.knowledge.retriever import knowledge_retriever
-from backend.app.models import Message, Ticket, UserSession
+from backend.app.config import CONFIDENCE_THRESHOLD, SPECIFIC_TOPICS_PATH
+from backend.app.db import engine, get_session
+from backend.app.events import chat_events, message_payload
+from backend.app.inference import inference_executor
+from backend.app.knowledge.retriever import KNOWLEDGE_SCORE_THRESHOLDS, knowledge_retriever
+from backend.app.message_writer import message_writer
+from backend.app.models import Message, Ticket
 from backend.app.nlp.classifier import classifier
+from backend.app.nlp.keyword_matcher import KeywordMatcher
+from backend.app.nlp.turkish import normalize
+from backend.app.response_cache import CachedReply, response_cache
+from backend.app.sessions import mark_sessions_seen, register_sessions
+from backend.app.stats import bump_ticket_counters
 
 logger = logging.getLogger("ogrenci_destek.chat")
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
 # ── Bilgi tabanı eşik değeri ──────────────────────────────────────────
-KNOWLEDGE_SCORE_THRESHOLD: float = 0.22
+KNOWLEDGE_SCORE_THRESHOLD: float = KNOWLEDGE_SCORE_THRESHOLDS[knowledge_retriever.scorer]
+
+# ── Canlı akış (SSE) ayarları ────────────────────────────────────────
+SSE_RESYNC_SECONDS: float = 15.0
+SSE_MAX_STREAM_SECONDS: float = 300.0
+SSE_RETRY_MS: int = 3000
+
+# ── Geçmiş sayfalama ─────────────────────────────────────────────────
+HISTORY_DEFAULT_LIMIT: int = 100
+HISTORY_MAX_LIMIT: int = 500
 
 
 # ── Request / Response şemaları ───────────────────────────────────────
@@ -36,67 +58,38 @@ class ChatResponse(BaseModel):
     ticket_id: Optional[str] = None
 
 
+class BatchChatRequest(BaseModel):
+    messages: list[ChatRequest] = Field(..., min_length=1, max_length=200)
+
+
+class BatchChatResponse(BaseModel):
+    results: list[ChatResponse]
+
+
 # ── Özel konu algılama (keyword-based) ────────────────────────────────
-_SPECIFIC_TOPICS: dict[str, list[str]] = {
-    "staj": ["staj mı", "staj mi", "staj değil", "staj mıdır", "staj midir", "bu staj"],
-    "devamsızlık": ["devamsızlık", "devamsizlik", "devam zorunluluğu", "devam zorunlulugu", "devamsızlık sınırı", "gelmezse", "katılım zorunlu"],
-    "puantaj": ["puantaj", "puantaj formu", "puantaj ne zaman"],
-    "ara_rapor": ["ara rapor", "ara raporu"],
-    "uygulama_raporu": ["uygulama raporu", "uygulama rapor"],
-}
-
-_SPECIFIC_ANSWERS: dict[str, str] = {
-    "staj": (
-        "Bu program bir staj DEĞİLDİR.\n\n"
-        "İşletmede Mesleki Eğitim, son dönemde alınan zorunlu bir derstir. "
-        "Öğrenci haftanın 5 günü işletmede çalışır ve %90 devam zorunluluğu vardır. "
-        "Stajdan farklı olarak; ders notu verilir, devamsızlık takibi yapılır "
-        "ve başarısızlık durumunda ders tekrar alınır.\n\n"
-        "Kaynak: İşletmede Mesleki Eğitim sunumu"
-    ),
-    "devamsızlık": (
-        "Devam Zorunluluğu:\n\n"
-        "• Öğrencinin toplam eğitim süresinin en az %90'ına katılması zorunludur.\n"
-        "• Mazeretsiz ardışık 3 gün devamsızlık yapan öğrenci başarısız sayılır.\n"
-        "• İzin/mazeret süresi toplam eğitim süresinin %10'unu geçemez.\n"
-        "• Devamsızlık durumunda işletme sorumlusu ve koordinatör bilgilendirilmelidir.\n\n"
-        "Kaynak: İşletmede Mesleki Eğitim sunumu"
-    ),
-    "puantaj": (
-        "Puantaj Formu:\n\n"
-        "• Her ayın 1-7'si arasında bir önceki aya ait puantaj formu teslim edilmelidir.\n"
-        "• Form, işletme yetkilisi tarafından onaylanmış olmalıdır.\n"
-        "• Puantaj formunda günlük çalışma saatleri ve devam durumu yer alır.\n"
-        "• Geç teslim edilen formlar değerlendirmeye alınmayabilir.\n\n"
-        "Kaynak: İşletmede Mesleki Eğitim sunumu"
-    ),
-    "ara_rapor": (
-        "Ara Rapor:\n\n"
-        "• Eğitim süresinin ortasında (genellikle 6-8. hafta) ara rapor teslim edilir.\n"
-        "• Raporda yapılan işler, öğrenilen beceriler ve gözlemler yer almalıdır.\n"
-        "• İşletme danışmanı ve akademik danışman tarafından değerlendirilir.\n"
-        "• Zamanında teslim edilmemesi not kırılmasına neden olabilir.\n\n"
-        "Kaynak: İşletmede Mesleki Eğitim sunumu"
-    ),
-    "uygulama_raporu": (
-        "Uygulama Raporu:\n\n"
-        "• Eğitim sonunda hazırlanan kapsamlı bir değerlendirme raporudur.\n"
-        "• İşletmede yapılan tüm faaliyetler, kazanılan yetkinlikler ve "
-        "öz değerlendirme bölümlerini içermelidir.\n"
-        "• Son teslim tarihine uyulmalıdır – geç teslim kabul edilmez.\n"
-        "• Hem işletme danışmanı hem akademik danışman onayı gereklidir.\n\n"
-        "Kaynak: İşletmede Mesleki Eğitim sunumu"
-    ),
-}
+def _load_specific_topics(
+    path: Path,
+) -> tuple[dict[str, list[str]], dict[str, str]]:
+    """
+    Özel konu tablosunu JSON dosyasından okur.
+
+    Biçim: {"konu": {"keywords": [...], "answer": "..."}, ...}
+    Konuların dosyadaki sırası eşleşme önceliğini belirler.
+    """
+    with open(path, encoding="utf-8") as f:
+        table = json.load(f)
+    topics = {topic: list(entry["keywords"]) for topic, entry in table.items()}
+    answers = {topic: entry["answer"] for topic, entry in table.items()}
+    return topics, answers
+
+
+_SPECIFIC_TOPICS, _SPECIFIC_ANSWERS = _load_specific_topics(SPECIFIC_TOPICS_PATH)
+_topic_matcher = KeywordMatcher(_SPECIFIC_TOPICS)
 
 
 def _detect_specific_topic(text: str) -> str | None:
-    """Metinde özel konu anahtar kelimeleri arar."""
-    lower = text.lower()
-    for topic, keywords in _SPECIFIC_TOPICS.items():
-        if any(kw in lower for kw in keywords):
-            return topic
-    return None
+    """Metinde özel konu anahtar kelimelerini tek geçişte arar."""
+    return _topic_matcher.find(text)
 
 
 def _build_grounded_reply(query: str, chunks: list[dict]) -> str:
@@ -157,164 +150,458 @@ def _build_grounded_reply(query: str, chunks: list[dict]) -> str:
     return full_answer
 
 
+# ── Cevap aşamaları (answer stages) ──────────────────────────────────
+class _Answer(NamedTuple):
+    reply_text: str
+    category: str
+    confidence: float
+    ticket_id: str | None = None
+
+
+class _LazyPrediction:
+    """
+    Sınıflandırıcı tahminini ilk ihtiyaç anına kadar erteler.
+
+    Çoğu mesaj ilk aşamalarda cevaplandığı için SVM çalıştırılmaz;
+    toplu isteklerde önceden hesaplanmış tahmin verilebilir. Soru bir kez
+    normalleştirilir (query); bilgi tabanı araması da aynı metni kullanır.
+    """
+
+    def __init__(self, query: str, precomputed: tuple[str, float] | None = None) -> None:
+        self.query = query
+        self._value = precomputed
+
+    @property
+    def computed(self) -> bool:
+        return self._value is not None
+
+    def get(self) -> tuple[str, float]:
+        if self._value is None:
+            self._value = inference_executor.predict(self.query, normalized=True)
+        return self._value
+
+
+def _stage_specific_topic(
+    text: str, prediction: _LazyPrediction, session_id: str, session: Session,
+) -> _Answer | None:
+    """Aşama 1: Özel konu algılama (staj, devamsızlık, puantaj vb.)."""
+    specific_topic = _detect_specific_topic(text)
+    if specific_topic and specific_topic in _SPECIFIC_ANSWERS:
+        logger.info("Özel konu algılandı: %s", specific_topic)
+        return _Answer(_SPECIFIC_ANSWERS[specific_topic], "Belge", 0.95)
+    return None
+
+
+def _stage_exact_faq(
+    text: str, prediction: _LazyPrediction, session_id: str, session: Session,
+) -> _Answer | None:
+    """Aşama 2: Seed örneğiyle birebir eşleşen soru → FAQ cevabı."""
+    category = classifier.match_example(text)
+    if category is None:
+        return None
+    logger.info("Birebir FAQ eşleşmesi: %s", category)
+    return _Answer(classifier.get_faq_answer(category), category, 1.0)
+
+
+def _stage_knowledge(
+    text: str, prediction: _LazyPrediction, session_id: str, session: Session,
+) -> _Answer | None:
+    """Aşama 3: Bilgi tabanından arama (RAG-lite)."""
+    if not knowledge_retriever.is_ready:
+        return None
+
+    # Eşiğin altında kalırsa hatalı yazılmış kelimeler düzeltilip yeniden aranır
+    results = inference_executor.retrieve(
+        prediction.query, top_k=3, normalized=True,
+        fallback_below=KNOWLEDGE_SCORE_THRESHOLD,
+    )
+    # LSA füzyonu sırayı değiştirebilir; eşik en iyi kelime dizini skoruna bakar
+    best_score = max((r["score"] for r in results), default=0.0)
+    if best_score < KNOWLEDGE_SCORE_THRESHOLD:
+        # Bilgi tabanında yeterli eşleşme yok → NLP akışına düş
+        return None
+
+    logger.info(
+        "Bilgi tabanından cevap (skor=%.4f, slayt=%s)",
+        best_score,
+        results[0].get("slide_number"),
+    )
+    return _Answer(_build_grounded_reply(text, results), "Belge", best_score)
+
+
+def _stage_classifier_faq(
+    text: str, prediction: _LazyPrediction, session_id: str, session: Session,
+) -> _Answer | None:
+    """Aşama 4: NLP tahmini yeterince güvenliyse FAQ cevabı."""
+    category, confidence = prediction.get()
+    if confidence < CONFIDENCE_THRESHOLD:
+        return None
+    return _Answer(classifier.get_faq_answer(category), category, confidence)
+
+
+def _stage_ticket(
+    text: str, prediction: _LazyPrediction, session_id: str, session: Session,
+) -> _Answer | None:
+    """Aşama 5: Hiçbir aşama cevaplayamadı → destek talebi oluştur."""
+    category, confidence = prediction.get()
+    ticket = Ticket(
+        session_id=session_id,
+        original_text=text,
+        predicted_category=category,
+        confidence=confidence,
+        status="Açık",
+    )
+    session.add(ticket)
+    bump_ticket_counters(session, status=(None, ticket.status), category=category, created=True)
+    session.flush()  # id ataması için
+    ticket_id = f"TCK-{ticket.id}"
+    reply_text = (
+        f"Talebini aldım ✅\n"
+        f"Takip numaran: {ticket_id}\n"
+        f"En kısa sürede dönüş yapılacak."
+    )
+    return _Answer(reply_text, category, confidence, ticket_id)
+
+
+# Sırayla denenir; ilk cevap veren aşama akışı sonlandırır.
+_ANSWER_STAGES = (
+    _stage_specific_topic,
+    _stage_exact_faq,
+    _stage_knowledge,
+    _stage_classifier_faq,
+    _stage_ticket,
+)
+
+
 # ── Mesaj gönderme endpoint'i ─────────────────────────────────────────
 @router.post("/message", response_model=ChatResponse)
 def send_message(
     body: ChatRequest,
+    background_tasks: BackgroundTasks,
     session: Session = Depends(get_session),
 ) -> ChatResponse:
     """
     Öğrenciden gelen mesajı işler:
-    1. Oturum yoksa oluşturur.
-    2. Mesajı veritabanına kaydeder.
-    3. Özel konu algılama (staj, devamsızlık, puantaj vb.)
-    4. Bilgi tabanından arama (RAG-lite)
-    5. NLP ile kategori tahmini → FAQ veya ticket.
+    1. Cevap aşamalarını sırayla dener (özel konu → birebir FAQ →
+       bilgi tabanı → NLP FAQ → ticket).
+    2. Oturum yoksa mesajlarla aynı işlemde oluşturur (ON CONFLICT DO
+       NOTHING; yakın zamanda görülen oturumlar için sorgu atılmaz).
+       Cevap hesaplandıktan sonra eklenir; SQLite yazma kilidi çıkarım
+       boyunca tutulmaz.
+    3. Kullanıcı ve bot mesajlarını veritabanına kaydeder (write-behind
+       modunda arka plan yazıcısına bırakır; ticket her zaman senkron).
+
+    NLP tahmini yalnızca gerektiğinde çalışır; cevabı başka bir aşama
+    verdiyse kullanıcı mesajı yanıt gönderildikten sonra etiketlenir.
     """
     text = body.text.strip()
     if not text:
         raise HTTPException(status_code=422, detail="Mesaj boş olamaz.")
 
-    # Oturum oluştur / kontrol et
-    existing = session.get(UserSession, body.session_id)
-    if not existing:
-        session.add(UserSession(id=body.session_id))
+    prediction = _LazyPrediction(normalize(text))
+    response, messages = _process_message(text, prediction, body.session_id, session)
+
+    new_sessions = register_sessions(session, [body.session_id])
+
+    if message_writer.enabled:
+        # Oturum/ticket satırları mesajlardan önce kalıcı olmalı
         session.commit()
+        mark_sessions_seen(new_sessions)
+        if message_writer.submit(messages):
+            # Yazıcı etiketler, yazar ve SSE ile yayınlar
+            return response
+
+    session.add_all(messages)
+    session.flush()
+    payloads = [message_payload(m) for m in messages]
+    session.commit()
+    mark_sessions_seen(new_sessions)
+    chat_events.publish(body.session_id, payloads)
+
+    if not prediction.computed:
+        background_tasks.add_task(_tag_user_message, payloads[0]["id"], prediction.query)
+
+    return response
+
+
+# ── Toplu mesaj gönderme endpoint'i ───────────────────────────────────
+@router.post("/messages/batch", response_model=BatchChatResponse)
+def send_messages_batch(
+    body: BatchChatRequest,
+    session: Session = Depends(get_session),
+) -> BatchChatResponse:
+    """
+    Birden fazla öğrenci mesajını tek istekte işler (LMS toplu aktarımı).
+
+    Tüm metinler tek bir vektörel geçişte sınıflandırılır ve tüm kayıtlar
+    tek bir veritabanı işleminde (transaction) yazılır. Sonuçlar istek
+    sırasıyla döndürülür.
+    """
+    texts = [item.text.strip() for item in body.messages]
+    if not all(texts):
+        raise HTTPException(status_code=422, detail="Mesaj boş olamaz.")
+
+    queries = [normalize(text) for text in texts]
+    predictions = inference_executor.predict_many(queries, normalized=True)
+
+    results: list[ChatResponse] = []
+    new_messages: list[Message] = []
+    for item, text, query, pred in zip(body.messages, texts, queries, predictions):
+        response, messages = _process_message(
+            text, _LazyPrediction(query, pred), item.session_id, session,
+        )
+        results.append(response)
+        new_messages.extend(messages)
+
+    # Bilinmeyen oturumları tek ifadeyle ekle (yazma kilidi çıkarımdan sonra alınır)
+    new_sessions = register_sessions(session, [item.session_id for item in body.messages])
+
+    if message_writer.enabled:
+        session.commit()
+        mark_sessions_seen(new_sessions)
+        if message_writer.submit(new_messages):
+            return BatchChatResponse(results=results)
+
+    session.add_all(new_messages)
+    session.flush()
+    payloads = [(m.session_id, message_payload(m)) for m in new_messages]
+    session.commit()
+    mark_sessions_seen(new_sessions)
+    for sid, payload in payloads:
+        chat_events.publish(sid, [payload])
+
+    return BatchChatResponse(results=results)
 
-    # Kullanıcı mesajını kaydet (NLP tahmini de eklenir)
-    category, confidence = classifier.predict(text)
 
+def _process_message(
+    text: str,
+    prediction: _LazyPrediction,
+    session_id: str,
+    session: Session,
+) -> tuple[ChatResponse, list[Message]]:
+    """
+    Tek bir mesajın cevap aşamalarını çalıştırır.
+
+    Mesaj satırlarını oturuma eklemez ve commit yapmaz; çağıran taraf
+    satırları senkron yazar veya yazıcı kuyruğuna bırakır.
+
+    Returns:
+        (response, [user_msg, bot_msg]) – kullanıcı mesajı sonradan
+        etiketlenebilir.
+    """
+    version = _answer_version()
+    cached = response_cache.get(text, version)
+    if cached is not None:
+        answer = _Answer(*cached)
+    else:
+        answer = None
+        for stage in _ANSWER_STAGES:
+            answer = stage(text, prediction, session_id, session)
+            if answer is not None:
+                break
+        assert answer is not None  # ticket aşaması her zaman cevap verir
+
+        # Ticket cevapları oturuma özeldir, önbelleğe alınmaz
+        if answer.ticket_id is None:
+            response_cache.put(
+                text,
+                version,
+                CachedReply(answer.reply_text, answer.category, answer.confidence),
+            )
+
+    # Kullanıcı mesajı (NLP tahmini hesaplandıysa eklenir)
+    category, confidence = prediction.get() if prediction.computed else (None, None)
     user_msg = Message(
-        session_id=body.session_id,
+        session_id=session_id,
         role="user",
         text=text,
         category=category,
         confidence=confidence,
     )
-    session.add(user_msg)
-
-    ticket_id: str | None = None
 
-    # ── Adım 1: Özel konu algılama ───────────────────────────────
-    specific_topic = _detect_specific_topic(text)
-    if specific_topic and specific_topic in _SPECIFIC_ANSWERS:
-        reply_text = _SPECIFIC_ANSWERS[specific_topic]
-        reply_category = "Belge"
-        reply_confidence = 0.95
-        logger.info("Özel konu algılandı: %s", specific_topic)
-
-    # ── Adım 2: Bilgi tabanından arama (RAG-lite) ────────────────
-    elif knowledge_retriever.is_ready:
-        results = knowledge_retriever.retrieve(text, top_k=3)
-        best_score = results[0]["score"] if results else 0.0
-
-        if best_score >= KNOWLEDGE_SCORE_THRESHOLD:
-            reply_text = _build_grounded_reply(text, results)
-            reply_category = "Belge"
-            reply_confidence = best_score
-            logger.info(
-                "Bilgi tabanından cevap (skor=%.4f, slayt=%s)",
-                best_score,
-                results[0].get("slide_number"),
-            )
-        else:
-            # Bilgi tabanında yeterli eşleşme yok → NLP akışına düş
-            reply_text, reply_category, reply_confidence, ticket_id = (
-                _fallback_nlp_flow(text, category, confidence, body.session_id, session)
-            )
-    else:
-        # Retriever hazır değil → NLP akışına düş
-        reply_text, reply_category, reply_confidence, ticket_id = (
-            _fallback_nlp_flow(text, category, confidence, body.session_id, session)
-        )
-
-    # Bot mesajını kaydet
+    # Bot mesajı
     bot_msg = Message(
-        session_id=body.session_id,
+        session_id=session_id,
         role="bot",
-        text=reply_text,
-        category=reply_category,
-        confidence=reply_confidence,
+        text=answer.reply_text,
+        category=answer.category,
+        confidence=answer.confidence,
     )
-    session.add(bot_msg)
-    session.commit()
 
-    return ChatResponse(
-        reply_text=reply_text,
-        category=reply_category,
-        confidence=round(reply_confidence, 4),
-        ticket_id=ticket_id,
+    response = ChatResponse(
+        reply_text=answer.reply_text,
+        category=answer.category,
+        confidence=round(answer.confidence, 4),
+        ticket_id=answer.ticket_id,
     )
+    return response, [user_msg, bot_msg]
 
 
-def _fallback_nlp_flow(
-    text: str,
-    category: str,
-    confidence: float,
-    session_id: str,
+def _answer_version() -> tuple:
+    """Cevapları etkileyen model/bilgi tabanı sürümleri (önbellek anahtarı)."""
+    return (
+        classifier.version,
+        knowledge_retriever.version,
+        CONFIDENCE_THRESHOLD,
+        KNOWLEDGE_SCORE_THRESHOLD,
+    )
+
+
+def _tag_user_message(message_id: int, query: str) -> None:
+    """Yanıttan sonra kullanıcı mesajını NLP kategorisiyle etiketler (query normalleştirilmiş)."""
+    category, confidence = inference_executor.predict(query, normalized=True)
+    with Session(engine) as session:
+        msg = session.get(Message, message_id)
+        if msg is None:
+            return
+        msg.category = category
+        msg.confidence = confidence
+        session.add(msg)
+        session.commit()
+
+
+# ── Sohbet geçmişi ───────────────────────────────────────────────────
+def _query_messages(
     session: Session,
-) -> tuple[str, str, float, str | None]:
+    session_id: str,
+    after_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    compact: bool = False,
+    newest: bool = False,
+) -> list[dict]:
     """
-    Mevcut NLP akışı: FAQ yüksek güvenle cevap, düşükse ticket oluştur.
+    Oturum mesajlarını (session_id, id) indeksi üzerinden sayfalı döndürür.
 
-    Returns:
-        (reply_text, category, confidence, ticket_id)
+    after_id verilirse (ve newest=False ise) o id'den sonraki ilk `limit`
+    mesaj, aksi halde aralıktaki en yeni `limit` mesaj seçilir. Sonuç her
+    durumda id'ye göre artan sıradadır.
     """
-    ticket_id: str | None = None
+    columns = (Message.id, Message.role, Message.text) if compact else (Message,)
+    query = select(*columns).where(Message.session_id == session_id)
+    if after_id is not None:
+        query = query.where(Message.id > after_id)  # type: ignore[operator]
+    if before_id is not None:
+        query = query.where(Message.id < before_id)  # type: ignore[operator]
 
-    if confidence >= CONFIDENCE_THRESHOLD:
-        reply_text = classifier.get_faq_answer(category)
-    else:
-        # Destek talebi oluştur
-        ticket = Ticket(
-            session_id=session_id,
-            original_text=text,
-            predicted_category=category,
-            confidence=confidence,
-            status="Açık",
-        )
-        session.add(ticket)
-        session.flush()  # id ataması için
-        ticket_id = f"TCK-{ticket.id}"
-        reply_text = (
-            f"Talebini aldım ✅\n"
-            f"Takip numaran: {ticket_id}\n"
-            f"En kısa sürede dönüş yapılacak."
-        )
+    newest_first = (after_id is None or newest) and limit is not None
+    order = Message.id.desc() if newest_first else Message.id.asc()  # type: ignore[union-attr]
+    query = query.order_by(order)
+    if limit is not None:
+        query = query.limit(limit)
 
-    return reply_text, category, confidence, ticket_id
+    rows = session.exec(query).all()
+    if newest_first:
+        rows = rows[::-1]
+    if compact:
+        return [{"id": r.id, "role": r.role, "text": r.text} for r in rows]
+    return [message_payload(m) for m in rows]
 
 
-# ── Sohbet geçmişi ───────────────────────────────────────────────────
 @router.get("/history")
 def get_history(
     session_id: str,
     after_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+    limit: int = Query(HISTORY_DEFAULT_LIMIT, ge=1, le=HISTORY_MAX_LIMIT),
+    compact: bool = False,
     session: Session = Depends(get_session),
 ) -> list[dict]:
     """
-    Belirli bir oturumun mesaj geçmişini döndürür.
+    Belirli bir oturumun mesaj geçmişini sayfalı (keyset) döndürür.
 
-    after_id verilirse yalnızca o id'den büyük mesajları döndürür (polling).
-    Sonuçlar id'ye göre artan sırada sıralanır.
+    - after_id: o id'den büyük ilk `limit` mesaj (polling / ileri sayfa).
+    - before_id: o id'den küçük en yeni `limit` mesaj (eski mesajlar).
+    - ikisi de yoksa: en yeni `limit` mesaj.
+    - compact=true: yalnızca id, role ve text alanları.
+
+    Sonuçlar id'ye göre artan sırada sıralanır. Dönen mesaj sayısı
+    `limit`'e eşitse devamı olabilir.
     """
-    query = select(Message).where(Message.session_id == session_id)
-    if after_id is not None:
-        query = query.where(Message.id > after_id)  # type: ignore[operator]
-    query = query.order_by(Message.id.asc())  # type: ignore[union-attr]
-
-    messages = session.exec(query).all()
-    return [
-        {
-            "id": m.id,
-            "role": m.role,
-            "text": m.text,
-            "category": m.category,
-            "confidence": m.confidence,
-            "created_at": m.created_at.isoformat() if m.created_at else None,
-        }
-        for m in messages
-    ]
+    return _query_messages(
+        session, session_id,
+        after_id=after_id, before_id=before_id, limit=limit, compact=compact,
+    )
+
+
+# ── Canlı mesaj akışı (Server-Sent Events) ───────────────────────────
+def _fetch_messages_after(session_id: str, after_id: Optional[int]) -> list[dict]:
+    """
+    Akışa yeniden gönderilecek mesajlar: after_id'den sonraki en yeni
+    HISTORY_MAX_LIMIT mesaj. Daha eskileri istemci /history (before_id)
+    ile sayfalar; eski veya eksik Last-Event-ID tüm geçmişi döndürmez.
+    """
+    with Session(engine) as session:
+        return _query_messages(
+            session, session_id,
+            after_id=after_id, limit=HISTORY_MAX_LIMIT, newest=True,
+        )
+
+
+def _sse_event(payload: dict) -> str:
+    data = json.dumps(payload, ensure_ascii=False)
+    return f"id: {payload['id']}\ndata: {data}\n\n"
+
+
+@router.get("/stream")
+async def stream_messages(
+    request: Request,
+    session_id: str = Query(..., min_length=1, max_length=64),
+    after_id: Optional[int] = None,
+    last_event_id: Optional[str] = Header(None),
+) -> StreamingResponse:
+    """
+    Oturumun yeni mesajlarını Server-Sent Events olarak iter.
+
+    Commit edilen bot cevapları ve ticket bildirimleri anında gönderilir.
+    Tarayıcı yeniden bağlandığında Last-Event-ID başlığından devam edilir.
+    Diğer worker'larda yazılan mesajlar için akış, SSE_RESYNC_SECONDS'ta
+    bir veritabanını kontrol eder; akış SSE_MAX_STREAM_SECONDS sonra
+    kapanır ve istemci otomatik olarak yeniden bağlanır.
+    """
+    if last_event_id and last_event_id.isdigit():
+        after_id = max(after_id or 0, int(last_event_id))
+
+    async def event_source():
+        nonlocal after_id
+        entry = chat_events.subscribe(session_id)
+        _, queue = entry
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + SSE_MAX_STREAM_SECONDS
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+
+            # Bağlantı öncesi kaçırılan mesajlar
+            pending = await run_in_threadpool(_fetch_messages_after, session_id, after_id)
+
+            while loop.time() < deadline:
+                for payload in pending:
+                    if after_id is None or payload["id"] > after_id:
+                        after_id = payload["id"]
+                        yield _sse_event(payload)
+                pending = []
+
+                if await request.is_disconnected():
+                    break
+                try:
+                    pending = [await asyncio.wait_for(queue.get(), SSE_RESYNC_SECONDS)]
+                    while not queue.empty():
+                        pending.append(queue.get_nowait())
+                except asyncio.TimeoutError:
+                    # Başka worker'da yazılmış mesajları yakala
+                    pending = await run_in_threadpool(
+                        _fetch_messages_after, session_id, after_id,
+                    )
+                    if not pending:
+                        yield ": keepalive\n\n"
+        finally:
+            chat_events.unsubscribe(session_id, entry)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ── Kategoriler ───────────────────────────────────────────────────────
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Query
 
+from backend.app.inference import inference_executor
 from backend.app.knowledge.retriever import knowledge_retriever
 
 router = APIRouter(prefix="/api/knowledge", tags=["knowledge"])
@@ -23,7 +24,7 @@ def search_knowledge(
     if not knowledge_retriever.is_ready:
         return {"query": q, "results": [], "message": "Bilgi tabanı henüz hazır değil."}
 
-    results = knowledge_retriever.retrieve(q, top_k=top_k)
+    results = inference_executor.retrieve(q, top_k=top_k)
 
     return {
         "query": q,
@@ -33,6 +34,7 @@ def search_knowledge(
                 "score": r["score"],
                 "source": r["source"],
                 "slide_number": r["slide_number"],
+                "document": r["document"],
             }
             for r in results
         ],
@@ -0,0 +1,70 @@
+"""
+Kullanıcı oturumu kaydı.
+
+Oturum satırı, mesajlarla aynı işlemde (transaction) INSERT ... ON CONFLICT
+DO NOTHING ile eklenir; ayrı bir SELECT ve commit gerekmez. Yakın zamanda
+görülen oturum id'leri bellek içi LRU'da tutulur ve hiç sorgu atılmaz.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from sqlmodel import Session
+
+from backend.app.config import SESSION_CACHE_SIZE
+from backend.app.db import dialect_insert
+from backend.app.models import UserSession
+
+
+class _SeenSessions:
+    """İş parçacığı güvenli, sınırlı boyutlu oturum id kümesi (LRU)."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._ids: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id not in self._ids:
+                return False
+            self._ids.move_to_end(session_id)
+            return True
+
+    def add_many(self, session_ids: Iterable[str]) -> None:
+        if self._maxsize <= 0:
+            return
+        with self._lock:
+            for session_id in session_ids:
+                self._ids[session_id] = None
+                self._ids.move_to_end(session_id)
+            while len(self._ids) > self._maxsize:
+                self._ids.popitem(last=False)
+
+
+_seen_sessions = _SeenSessions(SESSION_CACHE_SIZE)
+
+
+def register_sessions(session: Session, session_ids: Iterable[str]) -> list[str]:
+    """
+    Bilinmeyen oturumları açık işleme ekler (commit yapmaz).
+
+    Returns:
+        LRU'da olmayan oturum id'leri – commit sonrası mark_sessions_seen()
+        ile işaretlenmelidir.
+    """
+    unseen = sorted({sid for sid in session_ids if sid not in _seen_sessions})
+    if unseen:
+        stmt = dialect_insert(session)(UserSession).values(
+            [{"id": sid} for sid in unseen]
+        )
+        session.exec(stmt.on_conflict_do_nothing(index_elements=["id"]))  # type: ignore[call-overload]
+    return unseen
+
+
+def mark_sessions_seen(session_ids: Iterable[str]) -> None:
+    """Commit edilmiş oturumları LRU'ya ekler."""
+    _seen_sessions.add_many(session_ids)
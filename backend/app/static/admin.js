@@ -51,6 +51,7 @@ async function handleLogin() {
 
         // Verileri yükle
         loadStats();
+        loadCategories();
         loadTickets();
     } catch (e) {
         errorEl.textContent = "Bağlantı hatası. Sunucu çalışıyor mu?";
@@ -105,22 +106,87 @@ async function loadStats() {
     }
 }
 
+// ── Kategorileri yükle ───────────────────────────────────────────────
+/** "Doğru Kategori" seçeneklerini sınıflandırıcının kategorilerinden doldurur */
+async function loadCategories() {
+    try {
+        const res = await fetch("/api/chat/categories");
+        if (!res.ok) return;
+
+        const categories = await res.json();
+        const select = document.getElementById("modalCategory");
+        // İlk seçenek (tahmin / boş) korunur
+        while (select.options.length > 1) select.remove(1);
+        for (const category of categories) {
+            select.add(new Option(category, category));
+        }
+    } catch (e) {
+        console.error("Kategori yükleme hatası:", e);
+    }
+}
+
 // ── Ticketları yükle ─────────────────────────────────────────────────
+const TICKETS_PAGE_SIZE = 50;
 let currentFilter = null;
 
-async function loadTickets(statusFilter = null) {
+/** Sonraki sayfanın imleci (X-Next-Cursor) – null ise son sayfa */
+let nextCursor = null;
+
+function renderTicketRow(t) {
+    const date = new Date(t.created_at).toLocaleDateString("tr-TR", {
+        day: "2-digit",
+        month: "2-digit",
+        year: "numeric",
+        hour: "2-digit",
+        minute: "2-digit",
+    });
+
+    const statusClass =
+        t.status === "Açık"
+            ? "open"
+            : t.status === "İşlemde"
+            ? "progress"
+            : "resolved";
+
+    const shortText =
+        t.preview.length > 60
+            ? t.preview.substring(0, 60) + "..."
+            : t.preview;
+
+    return `
+        <tr>
+            <td><strong>TCK-${t.id}</strong></td>
+            <td>${date}</td>
+            <td title="${escapeHtml(t.preview)}">${escapeHtml(shortText)}</td>
+            <td>${t.predicted_category || "-"}</td>
+            <td>%${Math.round((t.confidence || 0) * 100)}</td>
+            <td><span class="status-badge ${statusClass}">${t.status}</span></td>
+            <td><button class="action-btn" onclick="openEditModal(${t.id})">Düzenle</button></td>
+        </tr>
+    `;
+}
+
+/**
+ * Ticket listesini özet görünümde (/tickets/summary) sayfa sayfa yükler.
+ * append=true ise mevcut satırların altına bir sonraki sayfa eklenir.
+ */
+async function loadTickets(statusFilter = null, append = false) {
     const tbody = document.getElementById("ticketsBody");
+    const loadMoreBtn = document.getElementById("loadMoreBtn");
 
     try {
-        let url = "/api/admin/tickets";
-        if (statusFilter) url += `?status_filter=${encodeURIComponent(statusFilter)}`;
+        const params = new URLSearchParams({ limit: TICKETS_PAGE_SIZE });
+        if (statusFilter) params.set("status_filter", statusFilter);
+        if (append && nextCursor) params.set("cursor", nextCursor);
 
-        const res = await apiCall(url);
+        const res = await apiCall(`/api/admin/tickets/summary?${params}`);
         if (!res || !res.ok) return;
 
         const tickets = await res.json();
+        nextCursor = res.headers.get("X-Next-Cursor");
+        loadMoreBtn.style.display = nextCursor ? "inline-block" : "none";
 
-        if (tickets.length === 0) {
+        if (!append && tickets.length === 0) {
             tbody.innerHTML = `
                 <tr>
                     <td colspan="7" class="empty-state">
@@ -132,41 +198,12 @@ async function loadTickets(statusFilter = null) {
             return;
         }
 
-        tbody.innerHTML = tickets
-            .map((t) => {
-                const date = new Date(t.created_at).toLocaleDateString("tr-TR", {
-                    day: "2-digit",
-                    month: "2-digit",
-                    year: "numeric",
-                    hour: "2-digit",
-                    minute: "2-digit",
-                });
-
-                const statusClass =
-                    t.status === "Açık"
-                        ? "open"
-                        : t.status === "İşlemde"
-                        ? "progress"
-                        : "resolved";
-
-                const shortText =
-                    t.original_text.length > 60
-                        ? t.original_text.substring(0, 60) + "..."
-                        : t.original_text;
-
-                return `
-                    <tr>
-                        <td><strong>TCK-${t.id}</strong></td>
-                        <td>${date}</td>
-                        <td title="${escapeHtml(t.original_text)}">${escapeHtml(shortText)}</td>
-                        <td>${t.predicted_category || "-"}</td>
-                        <td>%${Math.round((t.confidence || 0) * 100)}</td>
-                        <td><span class="status-badge ${statusClass}">${t.status}</span></td>
-                        <td><button class="action-btn" onclick="openEditModal(${t.id}, '${escapeAttr(t.status)}', '${escapeAttr(t.admin_note || "")}')">Düzenle</button></td>
-                    </tr>
-                `;
-            })
-            .join("");
+        const rows = tickets.map(renderTicketRow).join("");
+        if (append) {
+            tbody.insertAdjacentHTML("beforeend", rows);
+        } else {
+            tbody.innerHTML = rows;
+        }
     } catch (e) {
         console.error("Ticket yükleme hatası:", e);
         tbody.innerHTML = `
@@ -180,6 +217,10 @@ async function loadTickets(statusFilter = null) {
     }
 }
 
+function loadMoreTickets() {
+    if (nextCursor) loadTickets(currentFilter, true);
+}
+
 // ── Filtre ────────────────────────────────────────────────────────────
 function filterTickets(status, btnEl) {
     currentFilter = status;
@@ -193,12 +234,25 @@ function filterTickets(status, btnEl) {
 // ── Modal ─────────────────────────────────────────────────────────────
 let editingTicketId = null;
 
-function openEditModal(id, status, note) {
-    editingTicketId = id;
-    document.getElementById("modalTicketId").textContent = `TCK-${id}`;
-    document.getElementById("modalStatus").value = status;
-    document.getElementById("modalNote").value = note;
-    document.getElementById("editModal").classList.add("active");
+/** Liste özet görünümde olduğu için tam kaydı (not dahil) ayrıca getirir */
+async function openEditModal(id) {
+    try {
+        const res = await apiCall(`/api/admin/tickets/${id}`);
+        if (!res || !res.ok) return;
+        const ticket = await res.json();
+
+        editingTicketId = id;
+        document.getElementById("modalTicketId").textContent = `TCK-${id}`;
+        document.getElementById("modalStatus").value = ticket.status;
+        document.getElementById("modalNote").value = ticket.admin_note || "";
+        // Onaylanan kategori çözülen talepte sınıflandırıcıya geri beslenir
+        document.getElementById("modalCategoryPredicted").textContent =
+            `— (tahmin: ${ticket.predicted_category || "yok"})`;
+        document.getElementById("modalCategory").value = ticket.confirmed_category || "";
+        document.getElementById("editModal").classList.add("active");
+    } catch (e) {
+        console.error("Talep yükleme hatası:", e);
+    }
 }
 
 function closeModal() {
@@ -211,11 +265,12 @@ async function saveTicket() {
 
     const status = document.getElementById("modalStatus").value;
     const admin_note = document.getElementById("modalNote").value;
+    const confirmed_category = document.getElementById("modalCategory").value || null;
 
     try {
         const res = await apiCall(`/api/admin/tickets/${editingTicketId}`, {
             method: "PATCH",
-            body: JSON.stringify({ status, admin_note }),
+            body: JSON.stringify({ status, admin_note, confirmed_category }),
         });
 
         if (res && res.ok) {
@@ -238,10 +293,6 @@ function escapeHtml(text) {
     return div.innerHTML;
 }
 
-function escapeAttr(text) {
-    return text.replace(/'/g, "\\'").replace(/"/g, '\\"');
-}
-
 // Modal dışına tıklayınca kapat
 document.getElementById("editModal").addEventListener("click", (e) => {
     if (e.target.classList.contains("modal-overlay")) closeModal();
@@ -1,8 +1,9 @@
 /**
  * Öğrenci Destek – Sohbet Arayüzü
  *
- * Polling ile sunucu tarafındaki güncellemeleri (admin ticket değişiklikleri vb.)
- * otomatik olarak sohbet ekranına yansıtır.
+ * Sunucu tarafındaki güncellemeleri (admin ticket değişiklikleri vb.)
+ * Server-Sent Events akışıyla anında sohbet ekranına yansıtır.
+ * Tarayıcı SSE desteklemiyorsa veya akış kurulamıyorsa polling'e düşer.
  */
 
 // ── Oturum yönetimi ──────────────────────────────────────────────────
@@ -36,8 +37,29 @@ let lastMessageId = 0;
 /** Render edilmiş mesaj id'leri – tekrar eklemeyi önler */
 const renderedIds = new Set();
 
+/** Eski mesaj sayfalama – yukarı kaydırınca before_id ile yüklenir */
+const HISTORY_PAGE_SIZE = 50;
+let oldestMessageId = null;
+let hasOlderMessages = false;
+let loadingOlder = false;
+
 const POLL_INTERVAL_MS = 2500;
 
+/** Akış bağlantısı – null ise polling kullanılıyor */
+let eventSource = null;
+let pollTimer = null;
+
+/** Gönderim sırasında akıştan gelen mesajlar – gönderim bitince işlenir */
+const deferredMessages = [];
+
+/**
+ * Anında gösterilen ama sunucu id'si henüz bilinmeyen mesajlar.
+ * Sunucu mesajı geldiğinde (SSE, polling veya geçmiş) role+text ile
+ * eşlenir ve ikinci kez çizilmez. Geciktirmeli (write-behind) yazımda
+ * id'ler yanıttan sonra oluştuğu için gereklidir.
+ */
+const pendingLocal = [];
+
 // ── Karşılama ekranını kaldır ────────────────────────────────────────
 function removeWelcome() {
     if (!welcomeRemoved) {
@@ -51,11 +73,22 @@ function removeWelcome() {
 /**
  * Sunucudan gelen bir mesajı sohbet alanına ekler.
  * Dedup: aynı id iki kez eklenmez.
+ * prepend=true ise mesaj en üste (eski mesaj sayfası) eklenir.
  */
-function renderServerMessage(msg) {
+function renderServerMessage(msg, prepend = false) {
     if (renderedIds.has(msg.id)) return;
     renderedIds.add(msg.id);
     if (msg.id > lastMessageId) lastMessageId = msg.id;
+    if (oldestMessageId === null || msg.id < oldestMessageId) oldestMessageId = msg.id;
+
+    // Yerel olarak zaten gösterilmişse yalnızca id'yi kaydet
+    const pendingIdx = pendingLocal.findIndex(
+        (p) => p.role === msg.role && p.text === msg.text
+    );
+    if (pendingIdx !== -1) {
+        pendingLocal.splice(pendingIdx, 1);
+        return;
+    }
 
     removeWelcome();
 
@@ -106,6 +139,10 @@ function renderServerMessage(msg) {
     bubble.appendChild(timeEl);
 
     wrapper.appendChild(bubble);
+    if (prepend) {
+        chatMessages.insertBefore(wrapper, chatMessages.firstChild);
+        return;
+    }
     chatMessages.appendChild(wrapper);
     scrollToBottom();
 }
@@ -113,9 +150,11 @@ function renderServerMessage(msg) {
 // ── Yerel mesaj ekleme (anında, id'siz – optimistic UI) ──────────────
 /**
  * Kullanıcı mesajını anında göstermek için kullanılır.
- * Sunucu id'si henüz bilinmez, dedup takibi yapılmaz.
+ * Sunucu id'si henüz bilinmez; pending=true ise sunucudan gelen
+ * kopyasıyla eşlenmek üzere kaydedilir.
  */
-function renderLocalMessage(role, text) {
+function renderLocalMessage(role, text, pending = false) {
+    if (pending) pendingLocal.push({ role, text });
     removeWelcome();
 
     const wrapper = document.createElement("div");
@@ -161,10 +200,12 @@ function scrollToBottom() {
 async function loadHistory() {
     try {
         const res = await fetch(
-            `/api/chat/history?session_id=${encodeURIComponent(SESSION_ID)}`
+            `/api/chat/history?session_id=${encodeURIComponent(SESSION_ID)}` +
+            `&limit=${HISTORY_PAGE_SIZE}`
         );
         if (!res.ok) return;
         const messages = await res.json();
+        hasOlderMessages = messages.length === HISTORY_PAGE_SIZE;
         for (const m of messages) {
             renderServerMessage(m);
         }
@@ -173,6 +214,37 @@ async function loadHistory() {
     }
 }
 
+// ── Eski mesajları yükleme (yukarı kaydırınca) ───────────────────────
+async function loadOlderMessages() {
+    if (loadingOlder || !hasOlderMessages || oldestMessageId === null) return;
+    loadingOlder = true;
+
+    try {
+        const res = await fetch(
+            `/api/chat/history?session_id=${encodeURIComponent(SESSION_ID)}` +
+            `&before_id=${oldestMessageId}&limit=${HISTORY_PAGE_SIZE}`
+        );
+        if (!res.ok) return;
+        const messages = await res.json();
+        hasOlderMessages = messages.length === HISTORY_PAGE_SIZE;
+
+        // Kaydırma konumunu koru
+        const previousHeight = chatMessages.scrollHeight;
+        for (let i = messages.length - 1; i >= 0; i--) {
+            renderServerMessage(messages[i], true);
+        }
+        chatMessages.scrollTop += chatMessages.scrollHeight - previousHeight;
+    } catch (e) {
+        console.warn("Eski mesajlar yüklenemedi:", e);
+    } finally {
+        loadingOlder = false;
+    }
+}
+
+chatMessages.addEventListener("scroll", () => {
+    if (chatMessages.scrollTop < 40) loadOlderMessages();
+});
+
 // ── Polling: yeni mesajları getir ────────────────────────────────────
 let pollPaused = false;
 
@@ -195,6 +267,59 @@ async function pollNewMessages() {
     }
 }
 
+// ── Canlı akış (SSE) ─────────────────────────────────────────────────
+function handleStreamMessage(msg) {
+    if (pollPaused) {
+        deferredMessages.push(msg);
+        return;
+    }
+    renderServerMessage(msg);
+}
+
+function flushDeferredMessages() {
+    while (deferredMessages.length) {
+        renderServerMessage(deferredMessages.shift());
+    }
+}
+
+function startPolling() {
+    if (pollTimer === null) {
+        pollTimer = setInterval(pollNewMessages, POLL_INTERVAL_MS);
+    }
+}
+
+function startStream() {
+    if (!window.EventSource) {
+        startPolling();
+        return;
+    }
+
+    let opened = false;
+    const url =
+        `/api/chat/stream?session_id=${encodeURIComponent(SESSION_ID)}` +
+        `&after_id=${lastMessageId}`;
+    eventSource = new EventSource(url);
+
+    eventSource.onopen = () => {
+        opened = true;
+    };
+    eventSource.onmessage = (e) => {
+        try {
+            handleStreamMessage(JSON.parse(e.data));
+        } catch (err) {
+            console.warn("Akış mesajı okunamadı:", err);
+        }
+    };
+    eventSource.onerror = () => {
+        // Hiç açılamadıysa veya tarayıcı yeniden denemeyi bıraktıysa polling'e geç
+        if (!opened || eventSource.readyState === EventSource.CLOSED) {
+            eventSource.close();
+            eventSource = null;
+            startPolling();
+        }
+    };
+}
+
 // ── Mesaj gönderme ───────────────────────────────────────────────────
 async function sendMessage(text) {
     text = text.trim();
@@ -204,7 +329,7 @@ async function sendMessage(text) {
     pollPaused = true;
 
     // Kullanıcı mesajını anında göster (optimistic UI)
-    renderLocalMessage("user", text);
+    renderLocalMessage("user", text, true);
     messageInput.value = "";
     messageInput.disabled = true;
     sendBtn.disabled = true;
@@ -221,6 +346,8 @@ async function sendMessage(text) {
 
         if (!res.ok) {
             const err = await res.json().catch(() => ({}));
+            // Mesaj kaydedilmedi – eşlenmeyi beklemesin
+            pendingLocal.pop();
             renderLocalMessage("bot", `Bir hata oluştu: ${err.detail || res.statusText}`);
             return;
         }
@@ -228,10 +355,10 @@ async function sendMessage(text) {
         const data = await res.json();
 
         // Bot cevabını anında göster (optimistic UI)
-        renderLocalMessage("bot", data.reply_text);
+        renderLocalMessage("bot", data.reply_text, true);
 
-        // Sunucu id'lerini senkronize et – zaten gösterilen mesajları
-        // tekrar eklemez, sadece lastMessageId/renderedIds günceller
+        // Sunucu id'lerini senkronize et – zaten gösterilen mesajlar
+        // pendingLocal üzerinden eşlenir, tekrar eklenmez
         await syncIds();
     } catch (e) {
         hideTyping();
@@ -242,12 +369,15 @@ async function sendMessage(text) {
         sendBtn.disabled = false;
         messageInput.focus();
         pollPaused = false;
+        flushDeferredMessages();
     }
 }
 
 /**
- * POST sonrası sunucudaki en son id'leri al ve takip state'ini güncelle.
- * Mesajlar zaten yerel olarak render edildi, burada sadece id kaydı yapılır.
+ * POST sonrası sunucudaki yeni mesajları al ve takip state'ini güncelle.
+ * Yerel olarak gösterilen mesajlar eşlenir; arada gelen başka mesajlar
+ * (ör. ticket bildirimi) çizilir. Geciktirmeli yazımda mesajlar henüz
+ * yazılmamış olabilir – o durumda akış veya polling ile gelirler.
  */
 async function syncIds() {
     try {
@@ -259,9 +389,7 @@ async function syncIds() {
 
         const messages = await res.json();
         for (const m of messages) {
-            // Id'yi kaydet ama tekrar render etme
-            renderedIds.add(m.id);
-            if (m.id > lastMessageId) lastMessageId = m.id;
+            renderServerMessage(m);
         }
     } catch (e) {
         // Sessizce devam et
@@ -283,6 +411,6 @@ window.addEventListener("DOMContentLoaded", async () => {
     await loadHistory();
     messageInput.focus();
 
-    // Polling başlat
-    setInterval(pollNewMessages, POLL_INTERVAL_MS);
+    // Canlı akışı başlat (desteklenmiyorsa polling)
+    startStream();
 });
@@ -0,0 +1,130 @@
+"""
+Destek talebi istatistikleri.
+
+İki mod desteklenir:
+  - Varsayılan: tickets tablosu üzerinde tek bir GROUP BY sorgusu.
+  - STATS_COUNTERS=true: ticket_counters tablosundaki sayaçlar okunur.
+    Sayaçlar ticket oluşturma ve durum güncellemesiyle aynı işlemde
+    (transaction) güncellenir; böylece /api/admin/stats ticket sayısından
+    bağımsız olarak sabit sürede çalışır.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import delete, literal
+from sqlmodel import Session, func, select
+
+from backend.app.config import STATS_COUNTERS
+from backend.app.db import dialect_insert, engine
+from backend.app.models import Ticket, TicketCounter
+
+TICKET_STATUSES: tuple[str, ...] = ("Açık", "İşlemde", "Çözüldü")
+_UNKNOWN_CATEGORY = "Bilinmiyor"
+
+
+def _empty_stats() -> dict:
+    return {
+        "total_tickets": 0,
+        "by_status": {s: 0 for s in TICKET_STATUSES},
+        "by_category": {},
+    }
+
+
+def _add(stats: dict, kind: str, name: str | None, count: int) -> None:
+    if kind == "status":
+        stats["by_status"][name] = stats["by_status"].get(name, 0) + count
+        stats["total_tickets"] += count
+    else:
+        key = name or _UNKNOWN_CATEGORY
+        stats["by_category"][key] = stats["by_category"].get(key, 0) + count
+
+
+# ── Okuma ─────────────────────────────────────────────────────────────
+def compute_ticket_stats(session: Session) -> dict:
+    """Durum ve kategori dağılımını tek bir gruplu sorguyla hesaplar."""
+    stats = _empty_stats()
+    rows = session.exec(
+        select(Ticket.status, Ticket.predicted_category, func.count())
+        .group_by(Ticket.status, Ticket.predicted_category)
+    ).all()
+    for status, category, count in rows:
+        _add(stats, "status", status, count)
+        _add(stats, "category", category, count)
+    return stats
+
+
+def read_ticket_stats(session: Session) -> dict:
+    """Etkin moda göre istatistikleri döndürür."""
+    if not STATS_COUNTERS:
+        return compute_ticket_stats(session)
+
+    stats = _empty_stats()
+    for counter in session.exec(select(TicketCounter)).all():
+        _add(stats, counter.kind, counter.name, counter.count)
+    return stats
+
+
+# ── Sayaç güncelleme ──────────────────────────────────────────────────
+def bump_ticket_counters(
+    session: Session,
+    status: tuple[str | None, str | None] = (None, None),
+    category: str | None = None,
+    created: bool = False,
+) -> None:
+    """
+    Sayaçları çağıranın açık işlemi (transaction) içinde günceller.
+
+    Args:
+        status:   (eski, yeni) durum; eski None ise yalnızca artırılır.
+        category: Yeni ticket'ın kategorisi (created=True ise kullanılır).
+        created:  Yeni ticket oluşturulduysa True.
+    """
+    if not STATS_COUNTERS:
+        return
+
+    deltas: list[tuple[str, str, int]] = []
+    old_status, new_status = status
+    if old_status is not None and old_status != new_status:
+        deltas.append(("status", old_status, -1))
+    if new_status is not None and old_status != new_status:
+        deltas.append(("status", new_status, 1))
+    if created:
+        deltas.append(("category", category or "", 1))
+
+    insert = dialect_insert(session)
+    for kind, name, delta in deltas:
+        stmt = insert(TicketCounter).values(kind=kind, name=name, count=delta)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["kind", "name"],
+            set_={"count": TicketCounter.count + delta},
+        )
+        session.exec(stmt)  # type: ignore[call-overload]
+
+
+def rebuild_ticket_counters() -> None:
+    """
+    Sayaçları tickets tablosundan yeniden hesaplar (başlangıçta bir kez).
+
+    Önce DELETE çalıştırıldığı için yazma kilidi alınır; INSERT ... SELECT
+    aynı işlemde çalışır ve arada başka bir worker'ın güncellemesi kaybolmaz.
+    """
+    if not STATS_COUNTERS:
+        return
+
+    with Session(engine) as session:
+        session.exec(delete(TicketCounter))  # type: ignore[call-overload]
+        for kind, column in (
+            ("status", Ticket.status),
+            ("category", func.coalesce(Ticket.predicted_category, "")),
+        ):
+            rows = (
+                select(literal(kind), column, func.count())
+                .select_from(Ticket)
+                .group_by(column)
+            )
+            session.exec(
+                TicketCounter.__table__.insert().from_select(  # type: ignore[attr-defined]
+                    ["kind", "name", "count"], rows,
+                )
+            )
+        session.commit()
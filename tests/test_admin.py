@@ -0,0 +1,30 @@
+"""Admin endpoint'lerinin özellik bayraklarına göre davranışı."""
+
+from __future__ import annotations
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.app.config import ADMIN_PASSWORD
+from backend.app.feedback import feedback_trainer
+from backend.app.routes.admin import router
+
+
+def _client() -> TestClient:
+    # Yaşam döngüsü çalıştırılmaz: model eğitilmez, arka plan görevi başlamaz
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    client.auth = ("admin", ADMIN_PASSWORD)
+    return client
+
+
+def test_retrain_rejected_when_feedback_training_disabled(monkeypatch):
+    calls = []
+    monkeypatch.setattr(feedback_trainer, "retrain", lambda **kw: calls.append(kw))
+    assert not feedback_trainer.enabled
+
+    response = _client().post("/api/admin/feedback/retrain")
+
+    assert response.status_code == 409
+    assert calls == []
@@ -0,0 +1,61 @@
+"""
+ARTIFACTS_LOAD_ONLY kipinde başlangıç davranışı.
+
+Ayarlar modül yüklenirken ortam değişkenlerinden okunduğundan her senaryo
+ayrı bir Python sürecinde çalıştırılır.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_LIFESPAN = """
+import asyncio
+from backend.app.main import app, lifespan
+
+async def main():
+    async with lifespan(app):
+        pass
+
+asyncio.run(main())
+"""
+
+_WORKER = """
+from backend.app.inference import _init_worker
+
+_init_worker()
+"""
+
+
+def _run_load_only(code: str, tmp_path: Path) -> subprocess.CompletedProcess:
+    artifacts = tmp_path / "artifacts"
+    artifacts.mkdir()
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT),
+        "ARTIFACTS_DIR": str(artifacts),
+        "ARTIFACTS_LOAD_ONLY": "true",
+        "DATABASE_PATH": str(tmp_path / "test.db"),
+    }
+    env.pop("DATABASE_URL", None)
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+
+
+def test_lifespan_fails_without_published_artifact(tmp_path):
+    result = _run_load_only(_LIFESPAN, tmp_path)
+    assert result.returncode != 0
+    assert "RuntimeError: Yayınlanmış artefakt yok" in result.stderr
+
+
+def test_worker_fails_without_published_artifact(tmp_path):
+    result = _run_load_only(_WORKER, tmp_path)
+    assert result.returncode != 0
+    assert "RuntimeError: Yayınlanmış artefakt yok" in result.stderr